@@ -0,0 +1,108 @@
+import numpy as np
+from scipy import sparse
+from typing import Optional, Tuple
+from ranking import top_k
+from vector_store import normalize_rows
+
+
+class IVFIndex:
+    """
+    Приближённый поиск ближайших соседей по косинусной близости (IVF-Flat).
+
+    Векторы разбиваются на кластеры сферическим k-means (грубый квантизатор), для
+    каждого кластера хранится инвертированный список. Запрос сравнивается только
+    с векторами nprobe ближайших кластеров: больше nprobe — выше полнота и
+    медленнее поиск.
+    """
+
+    def __init__(self, n_lists: Optional[int] = None, n_iter: int = 20, max_train_points: int = 256, seed: int = 0) -> None:
+        """
+        Инициализация параметров индекса.
+
+        :param n_lists: Количество кластеров. По умолчанию ≈ sqrt(количества векторов).
+        :param n_iter: Количество итераций k-means.
+        :param max_train_points: Максимум обучающих векторов на один кластер.
+        :param seed: Зерно генератора случайных чисел.
+        """
+        self.n_lists = n_lists
+        self.n_iter = n_iter
+        self.max_train_points = max_train_points
+        self.seed = seed
+        self.centroids = None
+        self.list_offsets = None
+        self.ids = None
+        self.vectors = None
+
+    def fit(self, vectors: np.ndarray) -> 'IVFIndex':
+        """
+        Обучение квантизатора и раскладка векторов по инвертированным спискам.
+
+        :param vectors: Матрица эмбеддингов (n, dim).
+        :return: Построенный индекс.
+        """
+        data = normalize_rows(vectors)
+        n = data.shape[0]
+        n_lists = min(self.n_lists or max(1, int(round(np.sqrt(n)))), n)
+        rng = np.random.default_rng(self.seed)
+
+        # K-means обучается на подвыборке, затем все векторы распределяются по кластерам
+        sample_size = min(n, n_lists * self.max_train_points)
+        sample = data[rng.choice(n, sample_size, replace=False)] if sample_size < n else data
+        centroids = sample[rng.choice(sample.shape[0], n_lists, replace=False)].copy()
+        for _ in range(self.n_iter):
+            assignment = self._assign(sample, centroids)
+            membership = sparse.csr_matrix((np.ones(assignment.shape[0], dtype=np.float32), (assignment, np.arange(assignment.shape[0]))),
+                                           shape=(n_lists, sample.shape[0]))
+            sums = np.asarray(membership @ sample)
+            empty = np.bincount(assignment, minlength=n_lists) == 0
+            sums[empty] = sample[rng.choice(sample.shape[0], int(empty.sum()))]
+            centroids = normalize_rows(sums)
+
+        assignment = self._assign(data, centroids)
+        order = np.argsort(assignment, kind='stable')
+        self.centroids = centroids
+        self.list_offsets = np.concatenate([[0], np.cumsum(np.bincount(assignment, minlength=n_lists))]).astype(np.int64)
+        self.ids = order.astype(np.int64)
+        self.vectors = data[order]
+        self.n_lists = n_lists
+        return self
+
+    @staticmethod
+    def _assign(data: np.ndarray, centroids: np.ndarray, batch_size: int = 65536) -> np.ndarray:
+        """
+        Номер ближайшего центроида для каждого вектора.
+
+        :param data: Нормализованные векторы.
+        :param centroids: Нормализованные центроиды.
+        :param batch_size: Размер блока для ограничения памяти.
+        :return: Массив номеров кластеров.
+        """
+        return np.concatenate([
+            np.argmax(data[i:i + batch_size] @ centroids.T, axis=1)
+            for i in range(0, data.shape[0], batch_size)
+        ])
+
+    def search(self, query: np.ndarray, top_n: int = 5, nprobe: int = 8) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Поиск top_n ближайших векторов в nprobe ближайших кластерах.
+
+        Если в выбранных кластерах меньше top_n векторов, просматриваются
+        следующие по близости кластеры.
+
+        :param query: Вектор запроса (dim,).
+        :param top_n: Количество результатов для возврата.
+        :param nprobe: Количество просматриваемых кластеров.
+        :return: Кортеж (номера документов, косинусная близость).
+        """
+        query = normalize_rows(np.asarray(query).reshape(1, -1))[0]
+        list_order = top_k(self.centroids @ query, self.n_lists)
+        sizes = np.diff(self.list_offsets)[list_order]
+        enough = int(np.searchsorted(np.cumsum(sizes), min(top_n, self.ids.shape[0]))) + 1
+        probed = list_order[:max(int(nprobe), enough)]
+
+        # Списки лежат в self.vectors непрерывными блоками, поэтому скоринг идёт без копирования
+        bounds = [(self.list_offsets[c], self.list_offsets[c + 1]) for c in probed]
+        rows = np.concatenate([np.arange(start, end) for start, end in bounds])
+        scores = np.concatenate([self.vectors[start:end] @ query for start, end in bounds])
+        best = top_k(scores, top_n)
+        return self.ids[rows[best]], scores[best]
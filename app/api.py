@@ -1,10 +1,27 @@
+import asyncio
 import logging
 from fastapi import APIRouter, HTTPException
-from app.models import SearchRequest, SearchResponse, AvailableMethodsResponse, CorpusInfo
+from app.concurrency import ServiceOverloaded, run_db, run_search
+from app.query_log import query_log
+from app.models import (
+    SearchRequest,
+    SearchResponse,
+    SearchResult,
+    BatchSearchRequest,
+    BatchSearchResponse,
+    AvailableMethodsResponse,
+    CorpusInfo,
+    CacheStats,
+    PersonData,
+    PersonChangeResponse,
+)
+from crud import create_person, update_data, delete_data
 from app.services import (
     search as perform_search,
+    search_many as perform_search_many,
     get_available_methods as fetch_available_methods,
     get_corpus_info as fetch_corpus_info,
+    get_cache_stats as fetch_cache_stats,
 )
 
 logger = logging.getLogger(__name__)
@@ -12,6 +29,29 @@ logger = logging.getLogger(__name__)
 router = APIRouter()
 
 
+def _to_search_results(results: list) -> list:
+    """
+    Преобразует результаты сервиса поиска в модели ответа API.
+
+    Args:
+        results (list): Словари результатов из app.services.
+
+    Returns:
+        list: Список SearchResult.
+    """
+    return [
+        SearchResult(
+            document_id=result['doc_id'],
+            category=result['category'],
+            text=result['text'],
+            link=result['link'],
+            score=result.get('cosine_sim'),
+            person_data=result['person_data'],
+        )
+        for result in results
+    ]
+
+
 @router.get("/")
 def read_root() -> dict:
     """
@@ -47,6 +87,28 @@ async def get_corpus_info() -> CorpusInfo:
     return corpus_info
 
 
+@router.get("/cache", response_model=CacheStats)
+def get_cache_stats() -> CacheStats:
+    """
+    Эндпоинт для получения статистики кэшей поиска.
+
+    Returns:
+        CacheStats: Счётчики попаданий и промахов кэшей эмбеддингов и результатов.
+    """
+    return CacheStats(**fetch_cache_stats())
+
+
+@router.get("/query-log")
+def get_query_log_stats() -> dict:
+    """
+    Эндпоинт для получения счётчиков журнала запросов.
+
+    Returns:
+        dict: Количество принятых, записанных, отброшенных и ожидающих записи запросов.
+    """
+    return query_log.stats()
+
+
 @router.post("/search", response_model=SearchResponse)
 async def search(request: SearchRequest) -> SearchResponse:
     """
@@ -62,14 +124,132 @@ async def search(request: SearchRequest) -> SearchResponse:
         HTTPException: Ошибка при выполнении поиска.
     """
     try:
-        # Выполняем поиск с учетом оценки релевантности
-        results, total_time = await perform_search(
+        # Выполняем поиск с учетом оценки релевантности в пуле поиска, не блокируя цикл событий
+        results, total_time = await run_search(
+            perform_search,
             query=request.query,
             method=request.method,
             limit=request.limit,
             relevance_score=request.relevance_score,
         )
-        return SearchResponse(results=results, total_time=total_time)
+        return SearchResponse(results=_to_search_results(results), total_time=total_time)
+    except ServiceOverloaded as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Превышено время выполнения поиска")
     except Exception as e:
         logger.error(f"Search error: {str(e)}")
-        raise HTTPException(status_code=500, detail=str(e))
\ No newline at end of file
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.post("/search/batch", response_model=BatchSearchResponse)
+async def search_batch(request: BatchSearchRequest) -> BatchSearchResponse:
+    """
+    Эндпоинт для пакетного поиска: все запросы обрабатываются одним вызовом модели
+    и одним матричным произведением.
+
+    Args:
+        request (BatchSearchRequest): Пакетный запрос на поиск.
+
+    Returns:
+        BatchSearchResponse: Результаты поиска по каждому запросу и общее время выполнения.
+
+    Raises:
+        HTTPException: Ошибка при выполнении поиска.
+    """
+    try:
+        results, total_time = await run_search(
+            perform_search_many,
+            queries=request.queries,
+            method=request.method,
+            limit=request.limit,
+            relevance_score=request.relevance_score,
+        )
+        return BatchSearchResponse(results=[_to_search_results(r) for r in results], total_time=total_time)
+    except ServiceOverloaded as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Превышено время выполнения поиска")
+    except Exception as e:
+        logger.error(f"Batch search error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.post("/persons", response_model=PersonChangeResponse, status_code=201)
+async def add_person(person: PersonData) -> PersonChangeResponse:
+    """
+    Эндпоинт для добавления персоны. Биография сразу попадает в поисковый индекс
+    (дельта-сегмент, см. InformationRetrieval.add_documents).
+
+    Args:
+        person (PersonData): Данные персоны.
+
+    Returns:
+        PersonChangeResponse: ID добавленной персоны.
+
+    Raises:
+        HTTPException: Ошибка при изменении данных.
+    """
+    try:
+        person_id = await run_db(create_person, person.name, person.text, person.link, person.category)
+        return PersonChangeResponse(id=person_id)
+    except ServiceOverloaded as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Превышено время выполнения запроса к базе данных")
+    except Exception as e:
+        logger.error(f"Person insert error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.put("/persons/{person_id}", response_model=PersonChangeResponse)
+async def update_person(person_id: int, person: PersonData) -> PersonChangeResponse:
+    """
+    Эндпоинт для изменения данных персоны. Новая версия биографии сразу заменяет
+    прежнюю в поисковом индексе.
+
+    Args:
+        person_id (int): ID персоны.
+        person (PersonData): Новые данные персоны.
+
+    Returns:
+        PersonChangeResponse: ID персоны.
+
+    Raises:
+        HTTPException: Ошибка при изменении данных.
+    """
+    try:
+        await run_db(update_data, person_id, person.name, person.text, person.link, person.category)
+        return PersonChangeResponse(id=person_id)
+    except ServiceOverloaded as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Превышено время выполнения запроса к базе данных")
+    except Exception as e:
+        logger.error(f"Person update error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
+
+
+@router.delete("/persons/{person_id}", response_model=PersonChangeResponse)
+async def delete_person(person_id: int) -> PersonChangeResponse:
+    """
+    Эндпоинт для удаления персоны. Документ сразу исключается из поиска.
+
+    Args:
+        person_id (int): ID персоны.
+
+    Returns:
+        PersonChangeResponse: ID удалённой персоны.
+
+    Raises:
+        HTTPException: Ошибка при изменении данных.
+    """
+    try:
+        await run_db(delete_data, person_id)
+        return PersonChangeResponse(id=person_id)
+    except ServiceOverloaded as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Превышено время выполнения запроса к базе данных")
+    except Exception as e:
+        logger.error(f"Person delete error: {str(e)}")
+        raise HTTPException(status_code=500, detail=str(e))
@@ -0,0 +1,109 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Optional
+from app.config import CONFIG
+
+
+class ServiceOverloaded(Exception):
+    """Очередь исполнителя заполнена: запрос отклоняется, а не ждёт неограниченно."""
+
+
+class BoundedExecutor:
+    """
+    Пул потоков с ограниченной очередью для блокирующих вызовов из асинхронных
+    обработчиков: цикл событий не блокируется, а при переполнении очереди новые
+    задачи сразу отклоняются исключением ServiceOverloaded.
+
+    Потоки, а не процессы: модель BERT, индексы и корпус загружены один раз и
+    разделяются между задачами, а NumPy и PyTorch отпускают GIL на время вычислений.
+    """
+
+    def __init__(self, max_workers: int, max_queue: int, name: str) -> None:
+        """
+        Инициализация исполнителя.
+
+        Args:
+            max_workers (int): Количество потоков.
+            max_queue (int): Количество задач, ожидающих свободного потока.
+            name (str): Префикс имён потоков.
+        """
+        self.name = name
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=name)
+        self._slots = threading.BoundedSemaphore(max_workers + max_queue)
+
+    async def run(self, func: Callable, *args, timeout: Optional[float] = None, **kwargs) -> Any:
+        """
+        Выполняет функцию в пуле и ожидает результат.
+
+        Args:
+            func (Callable): Блокирующая функция.
+            *args: Позиционные аргументы функции.
+            timeout (Optional[float]): Время ожидания результата в секундах. None — без ограничения.
+            **kwargs: Именованные аргументы функции.
+
+        Returns:
+            Any: Результат функции.
+
+        Raises:
+            ServiceOverloaded: Очередь исполнителя заполнена.
+            asyncio.TimeoutError: Результат не получен за timeout секунд. Задача, ещё не
+                начавшая выполняться, отменяется; уже выполняющаяся дорабатывает в фоне
+                и занимает место в очереди до завершения.
+        """
+        if not self._slots.acquire(blocking=False):
+            raise ServiceOverloaded(f"Очередь исполнителя '{self.name}' заполнена")
+        try:
+            future = self._executor.submit(functools.partial(func, *args, **kwargs))
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda _: self._slots.release())
+        return await asyncio.wait_for(asyncio.wrap_future(future), timeout)
+
+    def shutdown(self) -> None:
+        """Останавливает пул, отменяя задачи, которые ещё не начали выполняться."""
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Поиск (предобработка, инференс BERT, ранжирование) и запросы к базе данных
+# выполняются в отдельных пулах, чтобы медленный поиск не задерживал обращения к БД
+search_executor = BoundedExecutor(CONFIG.SEARCH_WORKERS, CONFIG.SEARCH_QUEUE_SIZE, 'search')
+db_executor = BoundedExecutor(CONFIG.DB_WORKERS, CONFIG.DB_QUEUE_SIZE, 'db')
+
+
+async def run_search(func: Callable, *args, **kwargs) -> Any:
+    """
+    Выполняет функцию поиска в пуле поиска с таймаутом CONFIG.SEARCH_TIMEOUT.
+
+    Args:
+        func (Callable): Функция поиска.
+        *args: Позиционные аргументы функции.
+        **kwargs: Именованные аргументы функции.
+
+    Returns:
+        Any: Результат функции.
+    """
+    return await search_executor.run(func, *args, timeout=CONFIG.SEARCH_TIMEOUT or None, **kwargs)
+
+
+async def run_db(func: Callable, *args, **kwargs) -> Any:
+    """
+    Выполняет блокирующий запрос к базе данных в пуле БД с таймаутом CONFIG.DB_TIMEOUT.
+
+    Args:
+        func (Callable): Функция из crud.
+        *args: Позиционные аргументы функции.
+        **kwargs: Именованные аргументы функции.
+
+    Returns:
+        Any: Результат функции.
+    """
+    return await db_executor.run(func, *args, timeout=CONFIG.DB_TIMEOUT or None, **kwargs)
+
+
+def shutdown() -> None:
+    """Останавливает пулы поиска и базы данных."""
+    search_executor.shutdown()
+    db_executor.shutdown()
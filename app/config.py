@@ -3,8 +3,63 @@ import os
 
 class Config:
     TFIDF_INDEX_PATH = os.getenv('TFIDF_INDEX_PATH', 'indexes/tfidf_index.pkl')
-    BERT_INDEX_PATH = os.getenv('BERT_INDEX_PATH', 'indexes/bert_index.pkl')
+    BERT_INDEX_PATH = os.getenv('BERT_INDEX_PATH', 'indexes/bert_index.npy')
+    BM25_INDEX_PATH = os.getenv('BM25_INDEX_PATH', 'indexes/bm25_index.pkl')
+    # Количество кластеров IVF для приближённого поиска BERT; 0 — точный перебор
+    BERT_NPROBE = int(os.getenv('BERT_NPROBE', '0'))
+    # Формат индекса BERT при индексации: float32, int8 или pq
+    BERT_STORAGE = os.getenv('BERT_STORAGE', 'float32')
+    # Переранжирование кандидатов сжатого индекса по точным эмбеддингам
+    BERT_RERANK = os.getenv('BERT_RERANK', '1') == '1'
     DATA_PATH = os.getenv('DATA_PATH', 'new_biographies.csv')
+    # Методы поиска, корпус и модели которых загружаются при старте сервера (остальные — при первом запросе)
+    WARMUP_METHODS = [m for m in os.getenv('WARMUP_METHODS', 'tf-idf,bm25,bert').split(',') if m]
+    # Пул потоков поиска: количество потоков, длина очереди (при переполнении — 503) и таймаут запроса в секундах
+    SEARCH_WORKERS = int(os.getenv('SEARCH_WORKERS', '4'))
+    SEARCH_QUEUE_SIZE = int(os.getenv('SEARCH_QUEUE_SIZE', '32'))
+    SEARCH_TIMEOUT = float(os.getenv('SEARCH_TIMEOUT', '30'))
+    # Пул потоков для блокирующих запросов к базе данных
+    DB_WORKERS = int(os.getenv('DB_WORKERS', '8'))
+    DB_QUEUE_SIZE = int(os.getenv('DB_QUEUE_SIZE', '64'))
+    DB_TIMEOUT = float(os.getenv('DB_TIMEOUT', '10'))
+    # Объединение одновременных запросов BERT в пакеты: максимальный размер пакета (1 — без объединения)
+    # и время ожидания других запросов в миллисекундах
+    BATCH_MAX_SIZE = int(os.getenv('BATCH_MAX_SIZE', '16'))
+    BATCH_WAIT_MS = float(os.getenv('BATCH_WAIT_MS', '5'))
+    # Пул подключений к MySQL: размер, время жизни подключения и ожидания свободного (в секундах),
+    # проверка подключения ping() перед выдачей
+    DB_POOL_SIZE = int(os.getenv('DB_POOL_SIZE', '8'))
+    DB_POOL_RECYCLE = float(os.getenv('DB_POOL_RECYCLE', '3600'))
+    DB_POOL_TIMEOUT = float(os.getenv('DB_POOL_TIMEOUT', '30'))
+    DB_POOL_PRE_PING = os.getenv('DB_POOL_PRE_PING', '1') == '1'
+    # Отложенная запись журнала запросов: интервал сброса в секундах, размер пакета и длина очереди
+    # (при переполнении записи отбрасываются)
+    QUERY_LOG_FLUSH_INTERVAL = float(os.getenv('QUERY_LOG_FLUSH_INTERVAL', '1'))
+    QUERY_LOG_FLUSH_SIZE = int(os.getenv('QUERY_LOG_FLUSH_SIZE', '200'))
+    QUERY_LOG_MAX_QUEUE = int(os.getenv('QUERY_LOG_MAX_QUEUE', '10000'))
+    # Каталог хранилища полей документов (тексты читаются с диска только для найденных документов);
+    # пустое значение — хранилище в памяти
+    DOCUMENT_STORE_DIR = os.getenv('DOCUMENT_STORE_DIR', 'indexes/documents')
+    # Список сохранённых запросов на странице поиска: количество, порядок
+    # ('recent' или 'frequent') и время жизни закэшированного списка в секундах (0 — без кэша)
+    SAVED_QUERIES_LIMIT = int(os.getenv('SAVED_QUERIES_LIMIT', '50'))
+    SAVED_QUERIES_ORDER = os.getenv('SAVED_QUERIES_ORDER', 'recent')
+    SAVED_QUERIES_TTL = float(os.getenv('SAVED_QUERIES_TTL', '10'))
+    # Инкрементальное обновление индексов: интервал фонового слияния изменений с основным индексом
+    # в секундах (0 — без фонового слияния, только при остановке) и количество изменений, после
+    # которого слияние запускается досрочно
+    INDEX_MERGE_INTERVAL = float(os.getenv('INDEX_MERGE_INTERVAL', '300'))
+    INDEX_MERGE_MAX_DELTA = int(os.getenv('INDEX_MERGE_MAX_DELTA', '1000'))
+    # Каталог хранилища эмбеддингов BERT по хэшу текста (переиндексация кодирует только новые
+    # и изменённые тексты); пустое значение — без хранилища
+    EMBEDDING_STORE_DIR = os.getenv('EMBEDDING_STORE_DIR', 'indexes/embeddings')
+    # Количество процессов для предобработки нового корпуса; -1 — по числу ядер
+    PREPROCESS_WORKERS = int(os.getenv('PREPROCESS_WORKERS', '1'))
+    # Ограничения каждого из кэшей поиска (эмбеддинги запросов и результаты):
+    # количество записей, объём в байтах и время жизни записи в секундах (0 — без ограничения)
+    CACHE_MAX_ENTRIES = int(os.getenv('CACHE_MAX_ENTRIES', '10000'))
+    CACHE_MAX_BYTES = int(os.getenv('CACHE_MAX_BYTES', str(64 * 2 ** 20)))
+    CACHE_TTL = float(os.getenv('CACHE_TTL', '3600'))
 
 
 CONFIG = Config()
\ No newline at end of file
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List, Optional, Dict
+from typing import Any, List, Optional, Dict
 from enum import Enum
 
 class SearchMethod(str, Enum):
@@ -7,9 +7,11 @@ class SearchMethod(str, Enum):
 
     Атрибуты:
         tfidf (str): Метод поиска на основе TF-IDF.
+        bm25 (str): Метод поиска на основе BM25.
         bert (str): Метод поиска на основе BERT.
     """
     tfidf = 'tf-idf'
+    bm25 = 'bm25'
     bert = 'bert'
 
 class SearchResult(BaseModel):
@@ -21,14 +23,14 @@ class SearchResult(BaseModel):
         text (str): Текст документа, найденного в результате поиска.
         link (str): Ссылка на документ.
         score (Optional[float]): Оценка релевантности результата. Может быть None, если не указана.
-        person_data (Dict[str, str]): Данные о персоне.
+        person_data (Optional[Dict[str, Any]]): Данные о персоне (имя, биографии, категории). None, если персона не найдена.
     """
     document_id: int
     category: str
     text: str
     link: str
     score: Optional[float] = None
-    person_data: Dict[str, str]
+    person_data: Optional[Dict[str, Any]] = None
 
 class SearchRequest(BaseModel):
     """Модель запроса на поиск.
@@ -44,6 +46,20 @@ class SearchRequest(BaseModel):
     limit: int = 5
     relevance_score: bool = False
 
+class BatchSearchRequest(BaseModel):
+    """Модель пакетного запроса на поиск.
+
+    Атрибуты:
+        queries (List[str]): Список запросов пользователя.
+        method (SearchMethod): Метод поиска, общий для всех запросов.
+        limit (int): Максимальное количество результатов на каждый запрос. По умолчанию 5.
+        relevance_score (bool): Оценка релевантности. По умолчанию False.
+    """
+    queries: List[str]
+    method: SearchMethod
+    limit: int = 5
+    relevance_score: bool = False
+
 class SearchResponse(BaseModel):
     """Модель ответа на запрос поиска.
 
@@ -54,6 +70,16 @@ class SearchResponse(BaseModel):
     results: List[SearchResult]
     total_time: Optional[float] = None
 
+class BatchSearchResponse(BaseModel):
+    """Модель ответа на пакетный запрос поиска.
+
+    Атрибуты:
+        results (List[List[SearchResult]]): Результаты поиска в порядке запросов.
+        total_time (Optional[float]): Время, затраченное на выполнение всего пакета.
+    """
+    results: List[List[SearchResult]]
+    total_time: Optional[float] = None
+
 class CorpusInfo(BaseModel):
     """Модель информации о корпусе документов.
 
@@ -65,6 +91,56 @@ class CorpusInfo(BaseModel):
     num_tokens_tfidf: int
     num_tokens_bert: int
 
+class CacheTierStats(BaseModel):
+    """Модель статистики одного уровня кэша поиска.
+
+    Атрибуты:
+        hits (int): Количество попаданий.
+        misses (int): Количество промахов.
+        evictions (int): Количество записей, вытесненных по LRU.
+        expirations (int): Количество записей, удалённых по истечении TTL.
+        entries (int): Текущее количество записей.
+        bytes (int): Приблизительный занятый объём памяти.
+    """
+    hits: int
+    misses: int
+    evictions: int
+    expirations: int
+    entries: int
+    bytes: int
+
+class CacheStats(BaseModel):
+    """Модель статистики кэшей поиска.
+
+    Атрибуты:
+        embeddings (CacheTierStats): Кэш эмбеддингов запросов.
+        results (CacheTierStats): Кэш ранжированных документов.
+    """
+    embeddings: CacheTierStats
+    results: CacheTierStats
+
+class PersonData(BaseModel):
+    """Модель данных персоны для добавления и изменения.
+
+    Атрибуты:
+        name (str): Имя персоны.
+        text (str): Текст биографии.
+        link (str): Ссылка на биографию.
+        category (str): Категория персоны.
+    """
+    name: str
+    text: str
+    link: str
+    category: str
+
+class PersonChangeResponse(BaseModel):
+    """Модель ответа на изменение данных персоны.
+
+    Атрибуты:
+        id (int): ID персоны (id документа в поисковом индексе).
+    """
+    id: int
+
 class AvailableMethodsResponse(BaseModel):
     """Модель ответа с доступными методами поиска.
 
@@ -0,0 +1,161 @@
+import asyncio
+import logging
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple
+from app.config import CONFIG
+from crud import save_queries
+
+logger = logging.getLogger(__name__)
+
+QueryRecord = Tuple[str, str, str, Optional[float], datetime]
+
+
+class QueryLog:
+    """
+    Журнал запросов с отложенной записью: обработчики только кладут запись в
+    ограниченную очередь в памяти, а фоновая задача пишет накопленные записи в
+    таблицу Query пакетами — раз в flush_interval секунд или по набору flush_size
+    записей. При переполнении очереди записи отбрасываются и учитываются в счётчике.
+    """
+
+    def __init__(self, flush_interval: float = 1.0, flush_size: int = 200, max_queue: int = 10000,
+                 writer: Callable[[List[QueryRecord]], None] = save_queries) -> None:
+        """
+        Инициализация журнала.
+
+        Args:
+            flush_interval (float): Максимальное время между сбросами в секундах.
+            flush_size (int): Максимальное количество записей в одном пакете.
+            max_queue (int): Максимальное количество записей, ожидающих записи.
+            writer (Callable[[List[QueryRecord]], None]): Блокирующая функция записи пакета.
+        """
+        self.flush_interval = flush_interval
+        self.flush_size = flush_size
+        self.max_queue = max_queue
+        self.writer = writer
+        self.enqueued = 0
+        self.written = 0
+        self.dropped = 0
+        self.failed = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._task: Optional[asyncio.Task] = None
+
+    def record(self, query_text: str, method: str, query_link: str, latency: Optional[float] = None) -> bool:
+        """
+        Постановка запроса в очередь записи. Вызывается из цикла событий.
+
+        Args:
+            query_text (str): Текст запроса.
+            method (str): Метод поиска.
+            query_link (str): Ссылка на страницу результатов.
+            latency (Optional[float]): Время поиска в секундах.
+
+        Returns:
+            bool: True, если запись принята; False, если очередь заполнена или журнал не запущен.
+        """
+        if self._queue is None:
+            self.dropped += 1
+            return False
+        try:
+            self._queue.put_nowait((query_text, method, query_link, latency, datetime.now()))
+        except asyncio.QueueFull:
+            self.dropped += 1
+            return False
+        self.enqueued += 1
+        return True
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Счётчики журнала.
+
+        Returns:
+            Dict[str, int]: Принятые, записанные, отброшенные при переполнении,
+                потерянные из-за ошибок записи и ожидающие записи записи.
+        """
+        return {
+            'enqueued': self.enqueued,
+            'written': self.written,
+            'dropped': self.dropped,
+            'failed': self.failed,
+            'pending': self._queue.qsize() if self._queue is not None else 0,
+        }
+
+    async def start(self) -> None:
+        """Запуск фоновой задачи записи."""
+        self._queue = asyncio.Queue(maxsize=self.max_queue)
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> None:
+        """Остановка фоновой задачи с записью всех оставшихся в очереди записей."""
+        if self._task is None:
+            return
+        # Сигнал остановки встаёт в очередь после уже принятых записей
+        await self._queue.put(None)
+        await self._task
+        self._task = None
+        self._queue = None
+        logger.info(f"Query log stopped: {self.stats()}")
+
+    def _drain(self) -> List[QueryRecord]:
+        """
+        Забирает из очереди до flush_size записей без ожидания.
+
+        Returns:
+            List[QueryRecord]: Записи.
+        """
+        batch = []
+        while len(batch) < self.flush_size and not self._queue.empty():
+            batch.append(self._queue.get_nowait())
+        return batch
+
+    async def _flush(self, batch: List[QueryRecord]) -> None:
+        """
+        Запись пакета в базу данных в отдельном потоке.
+
+        Args:
+            batch (List[QueryRecord]): Записи.
+        """
+        if not batch:
+            return
+        try:
+            await asyncio.to_thread(self.writer, batch)
+            self.written += len(batch)
+        except Exception as e:
+            self.failed += len(batch)
+            logger.error(f"Query log flush error: {str(e)}")
+
+    async def _run(self) -> None:
+        """
+        Цикл фоновой задачи: ожидание первой записи, добор пакета в пределах
+        интервала, запись; после сигнала остановки — запись остатка очереди.
+        """
+        loop = asyncio.get_running_loop()
+        stopping = False
+        while not stopping:
+            batch = []
+            item = await self._queue.get()
+            deadline = loop.time() + self.flush_interval
+            while True:
+                if item is None:
+                    stopping = True
+                    break
+                batch.append(item)
+                remaining = deadline - loop.time()
+                if len(batch) >= self.flush_size or remaining <= 0:
+                    break
+                try:
+                    item = await asyncio.wait_for(self._queue.get(), remaining)
+                except asyncio.TimeoutError:
+                    break
+            await self._flush(batch)
+
+        # Записи, принятые одновременно с сигналом остановки
+        while not self._queue.empty():
+            await self._flush(self._drain())
+
+
+query_log = QueryLog(
+    flush_interval=CONFIG.QUERY_LOG_FLUSH_INTERVAL,
+    flush_size=CONFIG.QUERY_LOG_FLUSH_SIZE,
+    max_queue=CONFIG.QUERY_LOG_MAX_QUEUE
+)
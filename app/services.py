@@ -1,26 +1,92 @@
 from typing import List, Dict, Tuple
 from information_retrieval import InformationRetrieval
+from cache import LRUCache
 from app.config import CONFIG
 import time
 import logging
-from crud import read_data
+from crud import add_change_listener, read_data_many
 
 logging.basicConfig(level=logging.DEBUG, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
+def _make_cache() -> LRUCache:
+    """
+    Создаёт кэш поиска с ограничениями из конфигурации.
+
+    :return: Экземпляр LRUCache.
+    """
+    return LRUCache(
+        max_entries=CONFIG.CACHE_MAX_ENTRIES,
+        max_bytes=CONFIG.CACHE_MAX_BYTES or None,
+        ttl=CONFIG.CACHE_TTL or None
+    )
+
 # Инициализация класса поисковика InformationRetrieval
 ir = InformationRetrieval(
     csv_file=CONFIG.DATA_PATH,
     tfidf_pkl_file=CONFIG.TFIDF_INDEX_PATH,
-    bert_pkl_file=CONFIG.BERT_INDEX_PATH
+    bert_pkl_file=CONFIG.BERT_INDEX_PATH,
+    bm25_pkl_file=CONFIG.BM25_INDEX_PATH,
+    bert_nprobe=CONFIG.BERT_NPROBE or None,
+    bert_rerank=CONFIG.BERT_RERANK,
+    result_cache=_make_cache(),
+    embedding_cache=_make_cache(),
+    n_jobs=CONFIG.PREPROCESS_WORKERS,
+    batch_max_size=CONFIG.BATCH_MAX_SIZE,
+    batch_wait_ms=CONFIG.BATCH_WAIT_MS,
+    document_store_dir=CONFIG.DOCUMENT_STORE_DIR or None,
+    embedding_store_dir=CONFIG.EMBEDDING_STORE_DIR or None
 )
 
+def _on_data_change(action: str, person_id: int, fields: Dict[str, str]) -> None:
+    """
+    Обновляет поисковый индекс после изменения данных через crud.create_person,
+    crud.update_data и crud.delete_data.
+
+    :param action: 'insert', 'update' или 'delete'.
+    :param person_id: ID персоны (id документа в индексе).
+    :param fields: Новые значения полей для 'insert' и 'update'.
+    """
+    try:
+        if action == 'insert':
+            try:
+                ir.add_documents([{'id': person_id, 'Text': fields['text'], 'Category': fields['category'],
+                                   'Link': fields['link']}])
+            except ValueError:
+                # Новая биография существующей персоны заменяет её документ
+                ir.update_document(person_id, text=fields['text'], category=fields['category'], link=fields['link'])
+        elif action == 'update':
+            ir.update_document(person_id, text=fields['text'], category=fields['category'], link=fields['link'])
+        elif action == 'delete':
+            ir.delete_document(person_id)
+    except KeyError:
+        logger.warning(f"Document {person_id} is not in the search index")
+
+add_change_listener(_on_data_change)
+
+def warmup() -> None:
+    """
+    Загружает корпус, индексы и модели методов из CONFIG.WARMUP_METHODS до приёма запросов
+    и запускает фоновое слияние изменений индекса.
+    """
+    start_time = time.time()
+    ir.warmup(CONFIG.WARMUP_METHODS)
+    logger.info(f"Warmup of {CONFIG.WARMUP_METHODS} finished in {time.time() - start_time:.2f} s")
+    if CONFIG.INDEX_MERGE_INTERVAL > 0:
+        ir.start_merger(CONFIG.INDEX_MERGE_INTERVAL, CONFIG.INDEX_MERGE_MAX_DELTA)
+
+def stop_index_merger() -> None:
+    """
+    Останавливает фоновое слияние и сохраняет накопленные изменения индекса.
+    """
+    ir.stop_merger()
+
 def search(query: str, method: str, limit: int, relevance_score: bool) -> Tuple[List[Dict[str, float]], float]:
     """
     Выполняет поиск по заданному запросу с использованием указанного метода.
 
     :param query: Запрос для поиска.
-    :param method: Метод поиска ('tf-idf' или 'bert').
+    :param method: Метод поиска ('tf-idf', 'bm25' или 'bert').
     :param limit: Максимальное количество результатов для возврата.
     :param relevance_score: Нужно ли возвращать оценку релевантности.
     :return: Список результатов и общее время выполнения поиска.
@@ -29,15 +95,57 @@ def search(query: str, method: str, limit: int, relevance_score: bool) -> Tuple[
 
     if method == 'tf-idf':
         docs = ir.search_tfidf(query, top_n=limit)
+    elif method == 'bm25':
+        docs = ir.search_bm25(query, top_n=limit)
     elif method == 'bert':
         docs = ir.search_bert(query, top_n=limit)
     else:
         raise ValueError(f"Неподдерживаемый метод поиска: {method}")
 
+    results = _build_results(query, docs, relevance_score, read_data_many(doc[0] for doc in docs))
+
+    total_time = time.time() - start_time
+
+    return results, total_time
+
+def search_many(queries: List[str], method: str, limit: int, relevance_score: bool) -> Tuple[List[List[Dict[str, float]]], float]:
+    """
+    Выполняет пакетный поиск по списку запросов с использованием указанного метода.
+
+    :param queries: Список запросов для поиска.
+    :param method: Метод поиска ('tf-idf', 'bm25' или 'bert').
+    :param limit: Максимальное количество результатов для каждого запроса.
+    :param relevance_score: Нужно ли возвращать оценку релевантности.
+    :return: Списки результатов в порядке запросов и общее время выполнения поиска.
+    """
+    start_time = time.time()
+
+    docs_per_query = ir.search_many(queries, method=method, top_n=limit)
+    # Данные о персонах для всех запросов пакета читаются одним запросом к базе
+    person_data = read_data_many(doc[0] for docs in docs_per_query for doc in docs)
+    results = []
+    offset = 0
+    for query, docs in zip(queries, docs_per_query):
+        results.append(_build_results(query, docs, relevance_score, person_data[offset:offset + len(docs)]))
+        offset += len(docs)
+
+    total_time = time.time() - start_time
+
+    return results, total_time
+
+def _build_results(query: str, docs: List[Tuple], relevance_score: bool, persons: List[Dict]) -> List[Dict[str, float]]:
+    """
+    Формирует результаты поиска с данными о персонах из базы данных.
+
+    :param query: Запрос для поиска.
+    :param docs: Найденные документы (id, категория, текст, ссылка).
+    :param relevance_score: Нужно ли добавлять оценку релевантности.
+    :param persons: Данные о персонах из crud.read_data_many в порядке документов.
+    :return: Список результатов.
+    """
     results = []
-    for doc in docs:
+    for doc, person_data in zip(docs, persons):
         person_id, category, text, link = doc[0], doc[1], doc[2], doc[3]
-        person_data = read_data(person_id)
         if relevance_score:
             score = ir.evaluate_relevance(query, text)
             results.append({
@@ -57,9 +165,7 @@ def search(query: str, method: str, limit: int, relevance_score: bool) -> Tuple[
                 'person_data': person_data
             })
 
-    total_time = time.time() - start_time
-
-    return results, total_time
+    return results
 
 async def get_available_methods() -> List[str]:
     """
@@ -67,7 +173,15 @@ async def get_available_methods() -> List[str]:
 
     :return: Список доступных методов поиска.
     """
-    return ['tf-idf', 'bert']
+    return ['tf-idf', 'bm25', 'bert']
+
+def get_cache_stats() -> Dict[str, Dict[str, int]]:
+    """
+    Возвращает статистику кэшей поиска: попадания, промахи, вытеснения и занятый объём.
+
+    :return: Словарь со статистикой кэшей эмбеддингов и результатов.
+    """
+    return ir.cache_stats()
 
 def get_corpus_info() -> Dict[str, int]:
     """
@@ -0,0 +1,40 @@
+import os
+import threading
+from contextlib import contextmanager
+from typing import IO, Iterator
+import numpy as np
+
+
+@contextmanager
+def replacing(path: str, mode: str = 'wb', **kwargs) -> Iterator[IO]:
+    """
+    Запись файла через временный файл рядом с ним и атомарную замену после
+    успешной записи. Прежний файл не обрезается на месте, поэтому объекты, которые
+    отобразили его в память (np.load(mmap_mode='r'), mmap), продолжают читать
+    старое содержимое, а прерванная запись не оставляет испорченный файл.
+
+    :param path: Путь к файлу.
+    :param mode: Режим открытия на запись ('wb' или 'w').
+    :param kwargs: Дополнительные аргументы open() (например, encoding).
+    :return: Открытый временный файл.
+    """
+    temp_path = f'{path}.tmp-{os.getpid()}-{threading.get_ident()}'
+    try:
+        with open(temp_path, mode, **kwargs) as f:
+            yield f
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def save_npy(path: str, array: np.ndarray) -> None:
+    """
+    np.save с атомарной заменой файла.
+
+    :param path: Путь к файлу .npy.
+    :param array: Массив.
+    """
+    with replacing(path) as f:
+        np.save(f, array)
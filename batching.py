@@ -0,0 +1,98 @@
+import time
+import queue
+import threading
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Sequence
+
+
+class MicroBatcher:
+    """
+    Объединение одновременных запросов в пакеты: вызовы из разных потоков
+    попадают в очередь, фоновый поток собирает их, пока не наберётся
+    max_batch_size элементов или не истечёт окно max_wait_ms с прихода первого,
+    вызывает функцию один раз для всего пакета и раздаёт результаты ожидающим.
+
+    Используется для эмбеддингов запросов BERT: один проход модели по пакету
+    из нескольких запросов дешевле, чем столько же проходов по одному.
+    """
+
+    def __init__(self, func: Callable[[List[Any]], Sequence[Any]], max_batch_size: int = 16,
+                 max_wait_ms: float = 5.0) -> None:
+        """
+        Инициализация планировщика.
+
+        :param func: Функция, принимающая список элементов и возвращающая результаты в том же порядке.
+        :param max_batch_size: Максимальный размер пакета.
+        :param max_wait_ms: Сколько миллисекунд ждать дополнительных элементов после первого.
+        """
+        self.func = func
+        self.max_batch_size = max_batch_size
+        self.max_wait = max_wait_ms / 1000
+        self.batches = 0
+        self.items = 0
+        self._queue: 'queue.Queue' = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='micro-batcher', daemon=True)
+        self._thread.start()
+
+    def submit(self, item: Any) -> Future:
+        """
+        Постановка элемента в очередь.
+
+        :param item: Элемент.
+        :return: Future с результатом для этого элемента.
+        """
+        future: Future = Future()
+        self._queue.put((item, future))
+        return future
+
+    def __call__(self, item: Any) -> Any:
+        """
+        Обработка элемента в составе пакета с ожиданием результата.
+
+        :param item: Элемент.
+        :return: Результат функции для этого элемента.
+        """
+        return self.submit(item).result()
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Статистика планировщика.
+
+        :return: Количество пакетов, элементов и средний размер пакета.
+        """
+        return {'batches': self.batches, 'items': self.items,
+                'mean_batch_size': self.items / self.batches if self.batches else 0.0}
+
+    def _collect(self) -> List[tuple]:
+        """
+        Сбор пакета: ожидание первого элемента, затем добор до max_batch_size в пределах окна.
+
+        :return: Список пар (элемент, Future).
+        """
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_size:
+            remaining = deadline - time.monotonic()
+            try:
+                # Уже поставленные в очередь элементы забираются и после окончания окна
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self) -> None:
+        """Цикл фонового потока."""
+        while True:
+            batch = [(item, future) for item, future in self._collect() if future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            try:
+                results = self.func([item for item, _ in batch])
+            except BaseException as e:
+                for _, future in batch:
+                    future.set_exception(e)
+                continue
+            self.batches += 1
+            self.items += len(batch)
+            for (_, future), result in zip(batch, results):
+                future.set_result(result)
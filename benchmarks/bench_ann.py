@@ -0,0 +1,70 @@
+"""
+Бенчмарк приближённого поиска BERT: recall@k и задержка IVF при разных nprobe
+в сравнении с точным перебором.
+
+Эмбеддинги синтетические: 768-мерная смесь гауссовых кластеров, как у
+эмбеддингов CLS-токена для тематически близких биографий.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_ann --docs 100000 --queries 200 --nprobe 1 2 4 8 16 32 64
+"""
+import argparse
+import time
+import numpy as np
+from ann_index import IVFIndex
+from vector_store import normalize_rows
+from ranking import top_k
+
+
+def make_embeddings(rng: np.random.Generator, n: int, dim: int, n_topics: int) -> np.ndarray:
+    """
+    Генерация кластеризованных эмбеддингов.
+
+    :param rng: Генератор случайных чисел.
+    :param n: Количество векторов.
+    :param dim: Размерность.
+    :param n_topics: Количество тематических кластеров.
+    :return: Матрица float32 (n, dim).
+    """
+    topics = rng.normal(size=(n_topics, dim)).astype(np.float32)
+    noise = rng.normal(scale=3.0, size=(n, dim)).astype(np.float32)
+    return topics[rng.integers(0, n_topics, n)] + noise
+
+
+def main() -> None:
+    """Точка входа бенчмарка."""
+    parser = argparse.ArgumentParser(description="Benchmark the IVF index against the exact scan.")
+    parser.add_argument('--docs', type=int, default=100_000)
+    parser.add_argument('--dim', type=int, default=768)
+    parser.add_argument('--topics', type=int, default=500)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--top-n', type=int, default=10)
+    parser.add_argument('--nprobe', type=int, nargs='+', default=[1, 2, 4, 8, 16, 32, 64])
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    embeddings = make_embeddings(rng, args.docs, args.dim, args.topics)
+    queries = normalize_rows(embeddings[rng.integers(0, args.docs, args.queries)]
+                             + rng.normal(size=(args.queries, args.dim)).astype(np.float32))
+    matrix = normalize_rows(embeddings)
+
+    start = time.perf_counter()
+    index = IVFIndex().fit(embeddings)
+    print(f"docs={args.docs} dim={args.dim} lists={index.n_lists} build={time.perf_counter() - start:.1f} s")
+
+    start = time.perf_counter()
+    exact = [top_k(matrix @ q, args.top_n) for q in queries]
+    exact_ms = (time.perf_counter() - start) / args.queries * 1000
+    print(f"{'exact scan':>12}: recall@{args.top_n} 1.000, {exact_ms:8.3f} ms/query")
+
+    for nprobe in args.nprobe:
+        start = time.perf_counter()
+        found = [index.search(q, args.top_n, nprobe=nprobe)[0] for q in queries]
+        elapsed = (time.perf_counter() - start) / args.queries * 1000
+        recall = np.mean([len(set(a) & set(b)) / args.top_n for a, b in zip(found, exact)])
+        print(f"{f'nprobe={nprobe}':>12}: recall@{args.top_n} {recall:.3f}, {elapsed:8.3f} ms/query")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,75 @@
+"""
+Бенчмарк пакетного поиска: запросы в секунду для цикла одиночных запросов
+против одного матричного произведения на весь пакет.
+
+TF-IDF: цикл InvertedIndex.search против InvertedIndex.search_many (разреженное × разреженное).
+BERT: цикл «матрица × вектор» против произведения плотных матриц на уже посчитанных
+эмбеддингах запросов. Прямой проход BERT в замер не входит: в пакетном режиме он
+дополнительно выполняется одним вызовом get_embeddings вместо одного на запрос.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_batch_search --docs 100000 --queries 1000
+"""
+import argparse
+import time
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from inverted_index import InvertedIndex
+from ranking import top_k
+from vector_store import normalize_rows
+from benchmarks.bench_inverted_index import make_corpus
+from benchmarks.bench_ann import make_embeddings
+
+
+def report(name: str, n_queries: int, single: float, batch: float) -> None:
+    """Вывод строки с пропускной способностью обоих режимов."""
+    print(f"{name:>7}: loop {n_queries / single:10.1f} q/s, batch {n_queries / batch:10.1f} q/s, "
+          f"speedup {single / batch:5.1f}x")
+
+
+def main() -> None:
+    """Точка входа бенчмарка."""
+    parser = argparse.ArgumentParser(description="Benchmark batched multi-query search.")
+    parser.add_argument('--docs', type=int, default=100_000)
+    parser.add_argument('--vocab', type=int, default=50_000)
+    parser.add_argument('--dim', type=int, default=768)
+    parser.add_argument('--queries', type=int, default=1000)
+    parser.add_argument('--top-n', type=int, default=5)
+    parser.add_argument('--block', type=int, default=256)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    print(f"docs={args.docs} queries={args.queries} top_n={args.top_n}")
+
+    docs, vocab, _ = make_corpus(rng, args.docs, args.vocab)
+    vectorizer = TfidfVectorizer()
+    index = InvertedIndex.from_matrix(vectorizer.fit_transform(docs))
+    queries = [' '.join(rng.choice(vocab, rng.integers(2, 4))) for _ in range(args.queries)]
+
+    start = time.perf_counter()
+    single = [index.search(vectorizer.transform([q]), args.top_n)[0] for q in queries]
+    single_time = time.perf_counter() - start
+    start = time.perf_counter()
+    batch = [ids for ids, _ in index.search_many(vectorizer.transform(queries), args.top_n)]
+    batch_time = time.perf_counter() - start
+    assert all(np.array_equal(a, b) for a, b in zip(single, batch))
+    report('tf-idf', args.queries, single_time, batch_time)
+
+    matrix = normalize_rows(make_embeddings(rng, args.docs, args.dim, 500))
+    embeddings = normalize_rows(rng.normal(size=(args.queries, args.dim)))
+
+    start = time.perf_counter()
+    single = [top_k(matrix @ q, args.top_n) for q in embeddings]
+    single_time = time.perf_counter() - start
+    start = time.perf_counter()
+    batch = []
+    for i in range(0, args.queries, args.block):
+        batch.extend(top_k(row, args.top_n) for row in embeddings[i:i + args.block] @ matrix.T)
+    batch_time = time.perf_counter() - start
+    assert all(set(a) == set(b) for a, b in zip(single, batch))
+    report('bert', args.queries, single_time, batch_time)
+
+
+if __name__ == '__main__':
+    main()
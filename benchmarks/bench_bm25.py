@@ -0,0 +1,63 @@
+"""
+Бенчмарк пропускной способности BM25 в сравнении с TF-IDF.
+
+Оба движка строятся по одному синтетическому корпусу уже лемматизированных
+текстов (как колонка 'Processed_TFIDF') и отвечают на одни и те же запросы.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_bm25 --docs 100000 --queries 1000
+"""
+import argparse
+import time
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from bm25 import BM25Index
+from inverted_index import InvertedIndex
+from benchmarks.bench_inverted_index import make_corpus
+
+
+def index_size_mb(index: InvertedIndex) -> float:
+    """Размер массивов постингов в мегабайтах."""
+    return (index.indptr.nbytes + index.doc_ids.nbytes + index.weights.nbytes) / 2 ** 20
+
+
+def main() -> None:
+    """Точка входа бенчмарка."""
+    parser = argparse.ArgumentParser(description="Benchmark BM25 against TF-IDF.")
+    parser.add_argument('--docs', type=int, default=100_000)
+    parser.add_argument('--vocab', type=int, default=50_000)
+    parser.add_argument('--queries', type=int, default=1000)
+    parser.add_argument('--top-n', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    docs, vocab, _ = make_corpus(rng, args.docs, args.vocab)
+    queries = [' '.join(rng.choice(vocab, rng.integers(2, 4))) for _ in range(args.queries)]
+
+    start = time.perf_counter()
+    vectorizer = TfidfVectorizer()
+    tfidf_index = InvertedIndex.from_matrix(vectorizer.fit_transform(docs))
+    tfidf_build = time.perf_counter() - start
+
+    start = time.perf_counter()
+    bm25 = BM25Index().fit(docs)
+    bm25_build = time.perf_counter() - start
+
+    runs = {
+        'tf-idf': (tfidf_build, tfidf_index, lambda q: tfidf_index.search(vectorizer.transform([q]), args.top_n)),
+        'bm25': (bm25_build, bm25.index, lambda q: bm25.search(q.split(), args.top_n)),
+    }
+
+    print(f"docs={args.docs} vocab={args.vocab} queries={args.queries} top_n={args.top_n}")
+    for name, (build_time, index, run) in runs.items():
+        start = time.perf_counter()
+        for query in queries:
+            run(query)
+        elapsed = time.perf_counter() - start
+        print(f"{name:>7}: build {build_time:6.2f} s, index {index_size_mb(index):7.1f} MB, "
+              f"{len(queries) / elapsed:8.1f} queries/s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,156 @@
+"""
+Бенчмарк краулера на локальном тестовом HTTP-сервере, имитирующем разметку
+obrazovaka.ru с задержкой ответа и долей ответов 503: скорость в страницах в
+секунду последовательного обхода (BiographiesCrawler.scrape) против
+параллельного (BiographiesCrawler.crawl) с разным числом потоков, а также
+возобновление обхода по контрольной точке.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_crawler --people 200 --latency-ms 20 --workers 4 16
+"""
+import argparse
+import os
+import random
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional, Tuple
+from crawler import BiographiesCrawler
+
+CATEGORIES = ['iskusstvo', 'obshhestvo-kultura-obrazovanie', 'nauka']
+
+
+def biography_page(i: int, version: int = 0) -> str:
+    """HTML страницы биографии с блоком summury_text и абзацами после него."""
+    paragraphs = ''.join(f"<p>Абзац {j} биографии человека {i} (редакция {version}).</p>" for j in range(5))
+    return (f"<html><body><h1>Человек {i}</h1><div id='summury_text'>Краткая биография {i}.</div>"
+            f"{paragraphs}<h4>Оценка по биографии</h4><p>Оценка</p></body></html>")
+
+
+def make_handler(state: Dict, latency: float, fail_rate: float, seed: int = 0):
+    """
+    Обработчик запросов тестового сервера. Страницы биографий отдаются с ETag
+    и отвечают 304 на If-None-Match с тем же значением.
+
+    :param state: Изменяемое состояние сайта: 'people' — количество людей в каждой
+        категории (часть людей входит в две категории), 'versions' — номера редакций
+        страниц, 'hidden' — номера людей, убранных из списков.
+    :param latency: Задержка каждого ответа в секундах.
+    :param fail_rate: Доля ответов 503.
+    :param seed: Зерно генератора ошибок.
+    :return: Класс обработчика.
+    """
+    rng = random.Random(seed)
+    lock = threading.Lock()
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:
+            time.sleep(latency)
+            with lock:
+                failed = rng.random() < fail_rate
+            if failed:
+                self.send_response(503)
+                self.end_headers()
+                return
+
+            people = state['people']
+            parts = [part for part in self.path.split('/') if part]
+            if len(parts) == 2 and parts[0] == 'bio':
+                i = int(parts[1])
+                version = state['versions'].get(i, 0)
+                etag = f'"{i}-{version}"'
+                if self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+                self.send_page(biography_page(i, version), {'ETag': etag})
+                return
+
+            if parts == ['biografii']:
+                body = ''.join(f"<div class='item__body'><a href='/biografii/{c}'>{c}</a></div>" for c in CATEGORIES)
+            elif len(parts) == 2 and parts[0] == 'biografii':
+                offset = CATEGORIES.index(parts[1]) * (people // 2)
+                body = ''.join(f"<div class='biographis__item'><a class='item__name' href='/bio/{offset + i}'>"
+                               f"Человек {offset + i}</a></div>" for i in range(people)
+                               if offset + i not in state['hidden'])
+            else:
+                self.send_response(404)
+                self.end_headers()
+                return
+            self.send_page(f"<html><body>{body}</body></html>")
+
+        def send_page(self, page: str, headers: Optional[Dict[str, str]] = None) -> None:
+            data = page.encode('utf-8')
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(data)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def log_message(self, format: str, *args) -> None:
+            pass
+
+    return Handler
+
+
+def start_server(people: int, latency: float, fail_rate: float) -> Tuple[ThreadingHTTPServer, str]:
+    """
+    Запуск тестового сервера в фоновом потоке на свободном порту. Состояние сайта
+    (см. make_handler) доступно как server.state и может меняться во время работы.
+
+    :return: Кортеж (сервер, базовый URL).
+    """
+    state = {'people': people, 'versions': {}, 'hidden': set()}
+    server = ThreadingHTTPServer(('127.0.0.1', 0), make_handler(state, latency, fail_rate))
+    server.state = state
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}"
+
+
+def main() -> None:
+    """Точка входа бенчмарка."""
+    parser = argparse.ArgumentParser(description="Benchmark sequential vs concurrent crawling against a local server.")
+    parser.add_argument('--people', type=int, default=200, help="People per category.")
+    parser.add_argument('--latency-ms', type=float, default=20)
+    parser.add_argument('--fail-rate', type=float, default=0.05, help="Share of 503 responses.")
+    parser.add_argument('--workers', type=int, nargs='+', default=[4, 16])
+    args = parser.parse_args()
+
+    server, base_url = start_server(args.people, args.latency_ms / 1000, args.fail_rate)
+    categories_url = base_url + '/biografii'
+    try:
+        crawler = BiographiesCrawler(base_url=base_url, backoff=0.01)
+        start = time.perf_counter()
+        df = crawler.scrape(categories_url)
+        elapsed = time.perf_counter() - start
+        pages = 1 + len(crawler.categories_links) + len(df)
+        print(f"{'sequential':>12}: {pages / elapsed:7.1f} pages/s, {len(df)} rows")
+
+        with tempfile.TemporaryDirectory() as directory:
+            for workers in args.workers:
+                output = os.path.join(directory, f'out_{workers}.jsonl')
+                stats = BiographiesCrawler(base_url=base_url, backoff=0.01).crawl(categories_url, output, workers=workers)
+                with open(output, encoding='utf-8') as f:
+                    rows = sum(1 for _ in f)
+                print(f"{f'{workers} workers':>12}: {stats['pages_per_second']:7.1f} pages/s, {rows} rows, "
+                      f"failed {stats['failed']}")
+
+            # Возобновление: первый запуск обрывается на первой категории, второй догружает остальное
+            output = os.path.join(directory, 'resume.csv')
+            checkpoint = os.path.join(directory, 'checkpoint.txt')
+            BiographiesCrawler(base_url=base_url, backoff=0.01).crawl(
+                categories_url, output, checkpoint_path=checkpoint, categories=CATEGORIES[:1])
+            stats = BiographiesCrawler(base_url=base_url, backoff=0.01).crawl(
+                categories_url, output, checkpoint_path=checkpoint)
+            print(f"{'resume':>12}: skipped {stats['skipped']} checkpointed pages, fetched {stats['pages']}")
+    finally:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
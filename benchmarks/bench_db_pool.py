@@ -0,0 +1,67 @@
+"""
+Микробенчмарк задержки одного обращения к MySQL: новое подключение на каждый
+вызов (как раньше в crud.py) против подключения из пула db_pool.ConnectionPool.
+
+Запуск из корня проекта (нужна база из connect.py):
+    python -m benchmarks.bench_db_pool --calls 500
+"""
+import argparse
+import time
+from typing import Callable
+import numpy as np
+from crud import create_connection
+from db_pool import ConnectionPool
+
+QUERY = "SELECT id, name FROM Person WHERE id = %s"
+
+
+def measure(call: Callable[[int], None], calls: int) -> np.ndarray:
+    """
+    Задержки последовательных вызовов.
+
+    :param call: Функция одного обращения, принимающая номер вызова.
+    :param calls: Количество вызовов.
+    :return: Задержки в миллисекундах.
+    """
+    latencies = np.empty(calls)
+    for i in range(calls):
+        start = time.perf_counter()
+        call(i)
+        latencies[i] = (time.perf_counter() - start) * 1000
+    return latencies
+
+
+def main() -> None:
+    """Точка входа бенчмарка."""
+    parser = argparse.ArgumentParser(description="Benchmark per-call DB latency with and without a connection pool.")
+    parser.add_argument('--calls', type=int, default=500)
+    parser.add_argument('--pool-size', type=int, default=4)
+    args = parser.parse_args()
+
+    def without_pool(i: int) -> None:
+        connection = create_connection()
+        cursor = connection.cursor()
+        cursor.execute(QUERY, (i + 1,))
+        cursor.fetchall()
+        cursor.close()
+        connection.close()
+
+    pool = ConnectionPool(create_connection, size=args.pool_size)
+
+    def with_pool(i: int) -> None:
+        with pool.connection() as connection:
+            cursor = connection.cursor()
+            cursor.execute(QUERY, (i + 1,))
+            cursor.fetchall()
+            cursor.close()
+
+    print(f"calls={args.calls}")
+    for name, call in (('no pool', without_pool), ('pool', with_pool)):
+        latencies = measure(call, args.calls)
+        print(f"{name:>8}: mean {latencies.mean():7.3f} ms, p50 {np.percentile(latencies, 50):7.3f} ms, "
+              f"p99 {np.percentile(latencies, 99):7.3f} ms")
+    pool.close_all()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,79 @@
+"""
+Бенчмарк хранилища эмбеддингов (embedding_store.EmbeddingStore): запись,
+открытие (чтение ключей), поиск всех эмбеддингов корпуса и сжатие на
+синтетических векторах, а также объём файла. С --bert дополнительно замеряется
+InformationRetrieval.get_embeddings на корпусе: первый проход через модель,
+повторный при полностью заполненном хранилище и после изменения части текстов
+(нужна модель BERT).
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_embedding_store --docs 100000
+"""
+import argparse
+import os
+import tempfile
+import time
+from typing import Callable
+import numpy as np
+from embedding_store import EmbeddingStore
+from information_retrieval import InformationRetrieval
+from benchmarks.bench_incremental import make_texts
+
+
+def timed(call: Callable[[], object]) -> float:
+    """Время одного вызова в секундах."""
+    start = time.perf_counter()
+    call()
+    return time.perf_counter() - start
+
+
+def main() -> None:
+    """Точка входа бенчмарка."""
+    parser = argparse.ArgumentParser(description="Benchmark the content-addressed embedding store.")
+    parser.add_argument('--docs', type=int, default=100000)
+    parser.add_argument('--dim', type=int, default=768)
+    parser.add_argument('--batch', type=int, default=1000, help="Embeddings appended per put_many call.")
+    parser.add_argument('--bert', action='store_true', help="Also time get_embeddings with the BERT model.")
+    parser.add_argument('--bert-docs', type=int, default=500)
+    parser.add_argument('--changed', type=float, default=0.01, help="Share of texts changed before re-embedding.")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    texts = [f'document {i}' for i in range(args.docs)]
+    keys = [EmbeddingStore.key(text, 'bert-base-uncased', 512) for text in texts]
+    vectors = rng.standard_normal((args.docs, args.dim)).astype(np.float32)
+
+    with tempfile.TemporaryDirectory() as directory:
+        store = EmbeddingStore(os.path.join(directory, 'store'))
+        put = timed(lambda: [store.put_many(keys[i:i + args.batch], vectors[i:i + args.batch])
+                             for i in range(0, args.docs, args.batch)])
+        size = os.path.getsize(store.path)
+        print(f"docs={args.docs} dim={args.dim} file={size / 2 ** 20:.1f} MiB")
+        print(f"{'put':>10}: {put:8.3f} s ({args.docs / put:,.0f} vectors/s)")
+        opened = timed(lambda: EmbeddingStore(store.directory))
+        print(f"{'open':>10}: {opened:8.3f} s")
+        reopened = EmbeddingStore(store.directory)
+        result = {}
+        get = timed(lambda: result.update(found=reopened.get_many(keys)))
+        assert np.array_equal(result['found'][0], vectors)
+        print(f"{'get all':>10}: {get:8.3f} s ({args.docs / get:,.0f} vectors/s)")
+        # Повторная запись тех же ключей и сжатие без половины корпуса
+        store.put_many(keys[:args.batch], vectors[:args.batch])
+        compact = timed(lambda: result.update(counts=store.compact(keys[::2])))
+        print(f"{'compact':>10}: {compact:8.3f} s (records {result['counts'][0]} -> {result['counts'][1]})")
+
+        if args.bert:
+            bert_texts = make_texts(args.bert_docs, 100)
+            ir = InformationRetrieval('corpus.csv', embedding_store_dir=os.path.join(directory, 'bert'))
+            cold = timed(lambda: ir.get_embeddings(bert_texts))
+            warm = timed(lambda: ir.get_embeddings(bert_texts))
+            n_changed = max(1, int(args.bert_docs * args.changed))
+            bert_texts[:n_changed] = make_texts(n_changed, 100, seed=1)
+            changed = timed(lambda: ir.get_embeddings(bert_texts))
+            print(f"{'bert cold':>10}: {cold:8.2f} s")
+            print(f"{'bert warm':>10}: {warm:8.2f} s")
+            print(f"{'bert ' + str(n_changed):>10}: {changed:8.2f} s ({n_changed} changed texts)")
+
+
+if __name__ == '__main__':
+    main()
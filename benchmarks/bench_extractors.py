@@ -0,0 +1,138 @@
+"""
+Бенчмарк извлечения текста биографии из сохранённых HTML-страниц: скорость
+в страницах и мегабайтах в секунду для каждой функции из extractors.EXTRACTORS
+и проверка, что результат побайтно совпадает с эталонной реализацией на BeautifulSoup.
+
+Страницы читаются из каталога с файлами .html (--pages-dir). Без него
+генерируется набор страниц с разметкой как на obrazovaka.ru (меню, блок
+summury_text, абзацы, заголовок «Оценка по биографии», комментарии и подвал);
+его можно сохранить для повторных запусков через --save.
+
+В репозитории лежит набор страниц benchmarks/extractor_pages (--fixtures) с
+разметкой страниц биографий сайта и пограничными случаями: незакрытые и лишние
+закрывающие теги, ссылки на символы, скрипты и комментарии, варианты заголовка
+оценки, вложенный блок summury_text, страница без него. Если в каталоге есть
+expected.json (имя файла → текст), результаты сверяются и с ним; при любом
+расхождении бенчмарк завершается с кодом 1. Файл пересоздаётся по эталонной
+реализации опцией --write-expected.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_extractors --pages 300
+    python -m benchmarks.bench_extractors --fixtures
+    python -m benchmarks.bench_extractors --pages-dir pages/
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from typing import Dict
+from extractors import EXTRACTORS, extract_bs4
+
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), 'extractor_pages')
+EXPECTED_FILE = 'expected.json'
+
+
+def make_page(i: int, rng: random.Random) -> str:
+    """
+    Синтетическая страница биографии с обвязкой сайта.
+
+    :param i: Номер страницы.
+    :param rng: Генератор случайных чисел.
+    :return: HTML страницы.
+    """
+    words = ['родился', 'в', 'семье', 'учёного', 'писатель', 'Москве', 'году', 'работал', 'театре', 'премию']
+    sentence = lambda: ' '.join(rng.choice(words) for _ in range(rng.randint(8, 20))) + '.'
+    menu = ''.join(f"<li><a href='/biografii/{j}'>Раздел {j}</a></li>" for j in range(60))
+    paragraphs = ''.join(f"<p>{sentence()} <b>{sentence()}</b> &laquo;{sentence()}&raquo;</p>\n"
+                         for _ in range(rng.randint(5, 30)))
+    footer = ''.join(f"<div class='footer__item'><a href='/f/{j}'>Ссылка {j}</a></div>" for j in range(200))
+    return (
+        "<!DOCTYPE html><html><head><title>Биография</title>"
+        "<script>var data = {\"a\": \"<p>не текст</p>\"};</script><style>p { margin: 0 }</style></head>"
+        f"<body><ul class='menu'>{menu}</ul><article><h1>Человек {i}</h1>"
+        f"<div id='summury_text'><p>Кратко: {sentence()}</p><!-- реклама --></div>\n{paragraphs}"
+        f"<h4>Оценка по биографии</h4><p>Средняя оценка: 4.{i % 10}</p></article>{footer}</body></html>"
+    )
+
+
+def load_pages(directory: str) -> Dict[str, str]:
+    """
+    Чтение сохранённых страниц.
+
+    :param directory: Каталог с файлами .html.
+    :return: Словарь {имя файла: HTML страницы} в порядке имён.
+    """
+    pages = {}
+    for name in sorted(os.listdir(directory)):
+        if name.endswith('.html'):
+            with open(os.path.join(directory, name), encoding='utf-8') as f:
+                pages[name] = f.read()
+    return pages
+
+
+def load_expected(directory: str) -> Dict[str, str]:
+    """
+    Ожидаемые тексты страниц каталога.
+
+    :param directory: Каталог со страницами.
+    :return: Словарь {имя файла: текст}; пустой, если expected.json нет.
+    """
+    path = os.path.join(directory, EXPECTED_FILE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, encoding='utf-8') as f:
+        return json.load(f)
+
+
+def main() -> None:
+    """Точка входа бенчмарка."""
+    parser = argparse.ArgumentParser(description="Benchmark biography text extractors over stored HTML pages.")
+    parser.add_argument('--pages-dir', help="Directory with stored .html pages.")
+    parser.add_argument('--fixtures', action='store_true', help=f"Use the stored fixture pages ({FIXTURES_DIR}).")
+    parser.add_argument('--pages', type=int, default=300, help="Number of generated pages without --pages-dir.")
+    parser.add_argument('--save', help="Directory to store the generated pages in.")
+    parser.add_argument('--write-expected', action='store_true',
+                        help=f"Write {EXPECTED_FILE} for the pages directory from the bs4 extractor.")
+    args = parser.parse_args()
+
+    pages_dir = FIXTURES_DIR if args.fixtures else args.pages_dir
+    if pages_dir:
+        pages = load_pages(pages_dir)
+    else:
+        rng = random.Random(0)
+        pages = {f'{i:05d}.html': make_page(i, rng) for i in range(args.pages)}
+        if args.save:
+            os.makedirs(args.save, exist_ok=True)
+            for name, page in pages.items():
+                with open(os.path.join(args.save, name), 'w', encoding='utf-8') as f:
+                    f.write(page)
+
+    megabytes = sum(len(page.encode('utf-8')) for page in pages.values()) / 2 ** 20
+    reference = {name: extract_bs4(page) for name, page in pages.items()}
+    if pages_dir and args.write_expected:
+        with open(os.path.join(pages_dir, EXPECTED_FILE), 'w', encoding='utf-8') as f:
+            json.dump(reference, f, ensure_ascii=False, indent=2)
+    expected = load_expected(pages_dir) if pages_dir else {}
+    print(f"pages={len(pages)} size={megabytes:.1f} MB")
+
+    mismatches = 0
+    for name, extract in EXTRACTORS.items():
+        start = time.perf_counter()
+        results = {page_name: extract(page) for page_name, page in pages.items()}
+        elapsed = time.perf_counter() - start
+        differ = [page_name for page_name, result in results.items()
+                  if result.encode('utf-8') != reference[page_name].encode('utf-8')
+                  or (page_name in expected and result.encode('utf-8') != expected[page_name].encode('utf-8'))]
+        mismatches += len(differ)
+        print(f"{name:>7}: {len(pages) / elapsed:8.1f} pages/s, {megabytes / elapsed:6.2f} MB/s, "
+              f"identical to bs4{' and ' + EXPECTED_FILE if expected else ''} {len(pages) - len(differ)}/{len(pages)}")
+        for page_name in differ:
+            print(f"         differs: {page_name}")
+    if mismatches:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()
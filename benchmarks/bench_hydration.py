@@ -0,0 +1,91 @@
+"""
+Бенчмарк сборки результатов поиска по номерам документов: прежние обращения
+df.iloc[i][...] к строкам DataFrame против одной выборки по столбцам
+document_store.DocumentStore в памяти и с текстами на диске (mmap), а также
+объём памяти, занимаемой столбцами в каждом варианте.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_hydration --docs 100000 --top-n 10
+"""
+import argparse
+import tempfile
+import time
+from typing import Callable, List
+import numpy as np
+import pandas as pd
+from document_store import DocumentStore
+
+
+def make_corpus(n_docs: int, text_words: int, seed: int = 0) -> pd.DataFrame:
+    """
+    Синтетический корпус с колонками как в CSV с биографиями.
+
+    :param n_docs: Количество документов.
+    :param text_words: Количество слов в тексте документа.
+    :param seed: Зерно генератора.
+    :return: Корпус.
+    """
+    rng = np.random.default_rng(seed)
+    vocabulary = np.array([f"слово{i}" for i in range(5000)])
+    texts = [' '.join(rng.choice(vocabulary, text_words)) for _ in range(n_docs)]
+    return pd.DataFrame({
+        'id': np.arange(1, n_docs + 1),
+        'Category': [f"категория {i % 40}" for i in range(n_docs)],
+        'Text': texts,
+        'Link': [f"https://example.org/wiki/{i}" for i in range(n_docs)],
+    })
+
+
+def measure(hydrate: Callable[[np.ndarray], List], queries: List[np.ndarray]) -> np.ndarray:
+    """
+    Задержки сборки результатов.
+
+    :param hydrate: Функция сборки результатов по номерам документов.
+    :param queries: Номера документов для каждого запроса.
+    :return: Задержки в микросекундах.
+    """
+    latencies = np.empty(len(queries))
+    for i, indices in enumerate(queries):
+        start = time.perf_counter()
+        hydrate(indices)
+        latencies[i] = (time.perf_counter() - start) * 1e6
+    return latencies
+
+
+def main() -> None:
+    """Точка входа бенчмарка."""
+    parser = argparse.ArgumentParser(description="Benchmark result hydration: DataFrame.iloc vs column gather.")
+    parser.add_argument('--docs', type=int, default=100_000)
+    parser.add_argument('--words', type=int, default=200, help="Words per document text.")
+    parser.add_argument('--top-n', type=int, default=10)
+    parser.add_argument('--queries', type=int, default=2000)
+    args = parser.parse_args()
+
+    df = make_corpus(args.docs, args.words)
+    rng = np.random.default_rng(1)
+    queries = [rng.choice(args.docs, args.top_n, replace=False) for _ in range(args.queries)]
+
+    def iloc(indices: np.ndarray) -> List:
+        return [(df.iloc[i]['id'], df.iloc[i]['Category'], df.iloc[i]['Text'], df.iloc[i]['Link']) for i in indices]
+
+    in_memory = DocumentStore.from_frame(df)
+    with tempfile.TemporaryDirectory() as directory:
+        in_memory.save(directory)
+        lazy = DocumentStore.load(directory)
+        assert iloc(queries[0]) == lazy.gather(queries[0])
+
+        frame_mb = df[['id', 'Category', 'Text', 'Link']].memory_usage(deep=True).sum() / 2 ** 20
+        store_mb = (in_memory.ids.nbytes + sum(len(c.blob) + c.offsets.nbytes for c in
+                                               (in_memory.categories, in_memory.texts, in_memory.links))) / 2 ** 20
+        lazy_mb = store_mb - len(in_memory.texts.blob) / 2 ** 20
+        print(f"docs={args.docs} top_n={args.top_n} queries={args.queries}")
+        for name, hydrate, size_mb in (('iloc', iloc, frame_mb), ('gather', in_memory.gather, store_mb),
+                                       ('gather mmap', lazy.gather, lazy_mb)):
+            latencies = measure(hydrate, queries)
+            print(f"{name:>12}: mean {latencies.mean():8.1f} us, p99 {np.percentile(latencies, 99):8.1f} us, "
+                  f"resident columns {size_mb:7.1f} MB")
+        lazy.texts.blob.close()
+
+
+if __name__ == '__main__':
+    main()
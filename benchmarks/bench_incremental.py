@@ -0,0 +1,117 @@
+"""
+Бенчмарк инкрементального обновления индексов: полное перестроение TF-IDF и
+BM25 против добавления, изменения и удаления документов через дельта-сегмент
+(InformationRetrieval.add_documents / update_document / delete_document),
+задержка поиска с накопленным сегментом и после слияния (merge_segments), а
+также время самого слияния.
+
+Бенчмарк работает во временном каталоге (индексы сохраняются в indexes/
+относительно текущего каталога). С --bert в замер входят индекс BERT и
+кодирование только новых текстов (нужна модель BERT).
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_incremental --docs 20000 --changes 300
+"""
+import argparse
+import os
+import tempfile
+import time
+from typing import Callable, List
+import numpy as np
+from information_retrieval import InformationRetrieval
+from benchmarks.bench_hydration import make_corpus
+
+
+def make_texts(n_texts: int, text_words: int, seed: int = 0) -> List[str]:
+    """
+    Тексты из слов без цифр: предобработка удаляет цифры, поэтому слова make_corpus
+    («слово123») после неё совпали бы.
+
+    :param n_texts: Количество текстов.
+    :param text_words: Количество слов в тексте.
+    :param seed: Зерно генератора.
+    :return: Тексты.
+    """
+    rng = np.random.default_rng(seed)
+    syllables = ['ба', 'ве', 'ги', 'до', 'жу', 'за', 'ки', 'ло', 'ми', 'но', 'пу', 'ра', 'си', 'то', 'фа']
+    vocabulary = np.array([a + b + c for a in syllables for b in syllables for c in syllables])
+    return [' '.join(rng.choice(vocabulary, text_words)) for _ in range(n_texts)]
+
+
+def timed(call: Callable[[], object]) -> float:
+    """Время одного вызова в секундах."""
+    start = time.perf_counter()
+    call()
+    return time.perf_counter() - start
+
+
+def search_latency(search: Callable[[str], object], queries: List[str]) -> float:
+    """
+    Средняя задержка поиска в миллисекундах.
+
+    :param search: Функция поиска по запросу.
+    :param queries: Запросы.
+    :return: Средняя задержка.
+    """
+    return np.mean([timed(lambda: search(query)) for query in queries]) * 1000
+
+
+def main() -> None:
+    """Точка входа бенчмарка."""
+    parser = argparse.ArgumentParser(description="Benchmark incremental index updates against full rebuilds.")
+    parser.add_argument('--docs', type=int, default=20000)
+    parser.add_argument('--words', type=int, default=100, help="Words per document text.")
+    parser.add_argument('--changes', type=int, default=300, help="Added, updated and deleted documents each.")
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--bert', action='store_true', help="Also index and update BERT embeddings.")
+    args = parser.parse_args()
+
+    df = make_corpus(args.docs, 0)
+    df['Text'] = make_texts(args.docs, args.words)
+    extra = make_texts(args.changes * 2, args.words, seed=1)
+    methods = ['tf-idf', 'bm25'] + (['bert'] if args.bert else [])
+    rng = np.random.default_rng(2)
+    queries = [' '.join(rng.choice(df['Text'].iloc[i].split(), 3)) for i in rng.choice(args.docs, args.queries)]
+
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        os.chdir(directory)
+        try:
+            os.makedirs('indexes')
+            df.to_csv('corpus.csv', index=False)
+            ir = InformationRetrieval('corpus.csv', processed_data_file='processed', lemma_cache_file=None)
+            ir.df
+            rebuild = timed(lambda: [ir.index_tfidf(), ir.index_bm25()] + ([ir.index_bert()] if args.bert else []))
+            print(f"docs={args.docs} changes={args.changes} methods={methods}")
+            print(f"{'full rebuild':>16}: {rebuild:8.2f} s")
+
+            added = [{'id': args.docs + 1 + i, 'Text': text, 'Category': 'new', 'Link': f'new/{i}'}
+                     for i, text in enumerate(extra[:args.changes])]
+            updated = rng.choice(np.arange(1, args.docs + 1), args.changes, replace=False)
+            deleted = np.setdiff1d(np.arange(1, args.docs + 1), updated)[:args.changes]
+            operations = [
+                ('add', [lambda doc=doc: ir.add_documents([doc]) for doc in added]),
+                ('update', [lambda i=i, text=text: ir.update_document(int(i), text=text)
+                            for i, text in zip(updated, extra[args.changes:])]),
+                ('delete', [lambda i=i: ir.delete_document(int(i)) for i in deleted]),
+            ]
+            for name, calls in operations:
+                latencies = np.array([timed(call) for call in calls]) * 1000
+                print(f"{name:>16}: mean {latencies.mean():7.2f} ms, p99 {np.percentile(latencies, 99):7.2f} ms")
+
+            searches = {'tf-idf': ir.search_tfidf, 'bm25': ir.search_bm25, 'bert': ir.search_bert}
+            for method in methods:
+                ir.result_cache.clear()
+                with_delta = search_latency(lambda q: searches[method](q, top_n=10), queries)
+                print(f"{method:>16}: search with {ir.pending_changes} pending changes {with_delta:7.2f} ms")
+            print(f"{'merge':>16}: {timed(ir.merge_segments):8.2f} s")
+            for method in methods:
+                ir.result_cache.clear()
+                merged = search_latency(lambda q: searches[method](q, top_n=10), queries)
+                print(f"{method:>16}: search after merge {merged:7.2f} ms")
+        finally:
+            os.chdir(cwd)
+
+
+if __name__ == '__main__':
+    main()
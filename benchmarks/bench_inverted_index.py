@@ -0,0 +1,81 @@
+"""
+Бенчмарк поиска TF-IDF: плотное произведение query · matrix.T против инвертированного индекса.
+
+Корпус синтетический: длины документов и частоты терминов распределены по Ципфу,
+веса получены тем же TfidfVectorizer, что и в InformationRetrieval.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_inverted_index --docs 100000 --queries 200
+"""
+import argparse
+import time
+import numpy as np
+from sklearn.feature_extraction.text import TfidfVectorizer
+from inverted_index import InvertedIndex
+from ranking import top_k
+
+
+def make_corpus(rng: np.random.Generator, n_docs: int, vocab_size: int) -> tuple:
+    """
+    Генерация синтетического корпуса и словаря.
+
+    :param rng: Генератор случайных чисел.
+    :param n_docs: Количество документов.
+    :param vocab_size: Размер словаря.
+    :return: Кортеж (список документов, словарь, вероятности терминов).
+    """
+    vocab = np.array([f"t{i}" for i in range(vocab_size)])
+    probs = 1.0 / np.arange(1, vocab_size + 1)
+    probs /= probs.sum()
+    lengths = rng.integers(20, 200, n_docs)
+    docs = [' '.join(rng.choice(vocab, length, p=probs)) for length in lengths]
+    return docs, vocab, probs
+
+
+def sparse_matrix_search(query_vector, matrix, top_n: int) -> np.ndarray:
+    """Прежний путь search_tfidf: оценка для каждого документа корпуса."""
+    scores = np.array(query_vector.dot(matrix.T).toarray()).flatten()
+    return top_k(scores, top_n)
+
+
+def main() -> None:
+    """Точка входа бенчмарка."""
+    parser = argparse.ArgumentParser(description="Benchmark the inverted TF-IDF index.")
+    parser.add_argument('--docs', type=int, default=100_000)
+    parser.add_argument('--vocab', type=int, default=50_000)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--top-n', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    docs, vocab, probs = make_corpus(rng, args.docs, args.vocab)
+    vectorizer = TfidfVectorizer()
+    matrix = vectorizer.fit_transform(docs)
+    index = InvertedIndex.from_matrix(matrix)
+
+    runs = {
+        'sparse matrix': lambda qv: sparse_matrix_search(qv, matrix, args.top_n),
+        'inverted, exhaustive': lambda qv: index.search(qv, args.top_n, strategy='exhaustive')[0],
+        'inverted, maxscore': lambda qv: index.search(qv, args.top_n, strategy='maxscore')[0],
+    }
+
+    # Запросы из 2-3 слов: редкие термины (как имена и фамилии) и частые термины
+    mixes = {'rare terms': vocab[100:], 'frequent terms': vocab[:100]}
+    print(f"docs={args.docs} vocab={args.vocab} queries={args.queries} top_n={args.top_n}")
+    for mix, pool in mixes.items():
+        queries = [' '.join(rng.choice(pool, rng.integers(2, 4))) for _ in range(args.queries)]
+        query_vectors = [vectorizer.transform([q]) for q in queries]
+        reference = [runs['sparse matrix'](qv) for qv in query_vectors]
+
+        print(f"-- {mix}")
+        for name, run in runs.items():
+            start = time.perf_counter()
+            results = [run(qv) for qv in query_vectors]
+            elapsed = (time.perf_counter() - start) / len(query_vectors) * 1000
+            same = all(np.array_equal(a, b) for a, b in zip(results, reference))
+            print(f"{name:>22}: {elapsed:8.3f} ms/query, same results: {same}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,80 @@
+"""
+Бенчмарк объединения одновременных запросов BERT в пакеты (batching.MicroBatcher):
+пропускная способность и задержки p50/p99 при заданном числе одновременных
+клиентов для разных окон ожидания, в сравнении с кодированием каждого запроса
+отдельно.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_micro_batching --clients 16 --requests 20 --wait-ms 1 2 5 10
+"""
+import argparse
+import threading
+import time
+from typing import Callable, List
+import numpy as np
+from batching import MicroBatcher
+from information_retrieval import InformationRetrieval
+
+
+def run_clients(encode: Callable[[str], np.ndarray], clients: int, requests: int) -> tuple:
+    """
+    Одновременные клиенты, каждый из которых кодирует свои запросы последовательно.
+
+    :param encode: Функция кодирования одного запроса.
+    :param clients: Количество клиентов (потоков).
+    :param requests: Количество запросов на клиента.
+    :return: Кортеж (общее время в секундах, задержки в миллисекундах).
+    """
+    latencies: List[float] = []
+    lock = threading.Lock()
+
+    def client(client_id: int) -> None:
+        for i in range(requests):
+            # Уникальные тексты: кэш эмбеддингов не должен влиять на замер
+            text = f"запрос номер {client_id * requests + i} о биографии писателя"
+            start = time.perf_counter()
+            encode(text)
+            with lock:
+                latencies.append((time.perf_counter() - start) * 1000)
+
+    threads = [threading.Thread(target=client, args=(c,)) for c in range(clients)]
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return time.perf_counter() - start, np.array(latencies)
+
+
+def main() -> None:
+    """Точка входа бенчмарка."""
+    parser = argparse.ArgumentParser(description="Benchmark micro-batching of concurrent BERT query encodes.")
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=20, help="Requests per client.")
+    parser.add_argument('--max-batch', type=int, default=16)
+    parser.add_argument('--wait-ms', type=float, nargs='+', default=[1.0, 2.0, 5.0, 10.0])
+    args = parser.parse_args()
+
+    ir = InformationRetrieval('new_biographies.csv')
+    ir.get_embeddings(["прогрев модели"])
+    print(f"clients={args.clients} requests={args.clients * args.requests} max_batch={args.max_batch}")
+
+    def encode_single(text: str) -> np.ndarray:
+        # Без объединения каждый поток делает свой проход модели, как потоки пула поиска сервиса
+        return ir.get_embeddings([text])[0]
+
+    cases = [('no batching', encode_single, None)]
+    for wait_ms in args.wait_ms:
+        batcher = MicroBatcher(lambda texts: ir.get_embeddings(texts, batch_size=len(texts)),
+                               max_batch_size=args.max_batch, max_wait_ms=wait_ms)
+        cases.append((f'wait {wait_ms:g} ms', batcher, batcher))
+
+    for name, encode, batcher in cases:
+        elapsed, latencies = run_clients(encode, args.clients, args.requests)
+        mean_batch = batcher.stats()['mean_batch_size'] if batcher else 1.0
+        print(f"{name:>14}: {latencies.size / elapsed:7.1f} q/s, p50 {np.percentile(latencies, 50):7.1f} ms, "
+              f"p99 {np.percentile(latencies, 99):7.1f} ms, mean batch {mean_batch:5.1f}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""
+Бенчмарк предобработки корпуса: пропускная способность прежней реализации
+(разбор pymorphy2 каждого токена, str.maketrans на каждый вызов) против
+TextPreprocessor с кэшем лемм и параллельной предобработкой в пуле процессов.
+Проверяет, что результаты совпадают.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_preprocessing --csv new_biographies.csv --docs 2000 --jobs 4
+"""
+import re
+import string
+import argparse
+import time
+import pandas as pd
+import pymorphy2
+from nltk.corpus import stopwords
+from preprocessing import TextPreprocessor, preprocess_corpus
+
+
+def preprocess_uncached(text: str, morph: pymorphy2.MorphAnalyzer, stop_words: set) -> str:
+    """
+    Прежняя реализация InformationRetrieval.preprocess_text_tf_idf.
+
+    :param text: Исходный текст.
+    :param morph: Морфологический анализатор.
+    :param stop_words: Стоп-слова.
+    :return: Обработанный текст.
+    """
+    text = text.lower()
+    text = text.translate(str.maketrans("", "", string.punctuation))
+    text = re.sub(r'\d+', '', text)
+    return ' '.join(morph.parse(token)[0].normal_form for token in text.split() if token not in stop_words)
+
+
+def main() -> None:
+    """Точка входа бенчмарка."""
+    parser = argparse.ArgumentParser(description="Benchmark corpus preprocessing with and without the lemma cache.")
+    parser.add_argument('--csv', default='new_biographies.csv')
+    parser.add_argument('--docs', type=int, default=None, help="Use only the first N documents.")
+    parser.add_argument('--jobs', type=int, default=4, help="Worker processes for the parallel run.")
+    args = parser.parse_args()
+
+    texts = pd.read_csv(args.csv, nrows=args.docs)['Text'].fillna('').tolist()
+    n_tokens = sum(len(text.split()) for text in texts)
+    stop_words = set(stopwords.words('russian'))
+    morph = pymorphy2.MorphAnalyzer()
+
+    start = time.perf_counter()
+    expected = [preprocess_uncached(text, morph, stop_words) for text in texts]
+    uncached = time.perf_counter() - start
+
+    preprocessor = TextPreprocessor(stop_words)
+    preprocessor._morph = morph
+    start = time.perf_counter()
+    processed = [preprocessor.preprocess_tf_idf(text) for text in texts]
+    cached = time.perf_counter() - start
+
+    start = time.perf_counter()
+    parallel_processed, _ = preprocess_corpus(texts, TextPreprocessor(stop_words), n_jobs=args.jobs)
+    parallel = time.perf_counter() - start
+
+    if processed != expected or parallel_processed != expected:
+        raise SystemExit("TextPreprocessor output differs from the uncached implementation")
+
+    print(f"docs={len(texts)} tokens={n_tokens} distinct forms={len(preprocessor.lemmas)}")
+    for name, elapsed in (('uncached', uncached), ('lemma cache', cached), (f'{args.jobs} processes', parallel)):
+        print(f"{name:>12}: {elapsed:7.2f} s, {len(texts) / elapsed:9.1f} docs/s, {n_tokens / elapsed:11.0f} tokens/s")
+    print(f"speedup: {uncached / cached:.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+Бенчмарк кэша предобработанного корпуса: время сохранения и загрузки прежнего
+pickle всего DataFrame против столбцового кэша column_store (все столбцы,
+только нужные для выдачи и отображение в память без чтения), а также размер
+на диске.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_processed_cache --docs 100000
+"""
+import argparse
+import os
+import pickle
+import tempfile
+import time
+from typing import Callable
+from column_store import load_columns, load_frame, save_frame
+from benchmarks.bench_hydration import make_corpus
+
+
+def timed(call: Callable[[], object], repeats: int) -> float:
+    """
+    Лучшее время из нескольких повторов.
+
+    :param call: Замеряемая функция.
+    :param repeats: Количество повторов.
+    :return: Время в секундах.
+    """
+    best = float('inf')
+    for _ in range(repeats):
+        start = time.perf_counter()
+        call()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def directory_size(path: str) -> int:
+    """Суммарный размер файлов каталога в байтах."""
+    return sum(os.path.getsize(os.path.join(path, name)) for name in os.listdir(path))
+
+
+def main() -> None:
+    """Точка входа бенчмарка."""
+    parser = argparse.ArgumentParser(description="Benchmark the pickled DataFrame cache against the columnar cache.")
+    parser.add_argument('--docs', type=int, default=100_000)
+    parser.add_argument('--words', type=int, default=200, help="Words per document text.")
+    parser.add_argument('--repeats', type=int, default=3)
+    args = parser.parse_args()
+
+    df = make_corpus(args.docs, args.words)
+    # Как в настоящем кэше: исходный текст и две предобработанные копии
+    df['Processed_TFIDF'] = df['Text'].str.replace('слово', 'лемма')
+    df['Processed_BERT'] = df['Text'].str.upper()
+
+    with tempfile.TemporaryDirectory() as directory:
+        pickle_file = os.path.join(directory, 'processed_data.pkl')
+        columns_dir = os.path.join(directory, 'processed_data')
+
+        def save_pickle() -> None:
+            with open(pickle_file, 'wb') as f:
+                pickle.dump(df, f)
+
+        def load_pickle() -> None:
+            with open(pickle_file, 'rb') as f:
+                pickle.load(f)
+
+        save_pickle_s = timed(save_pickle, args.repeats)
+        save_columns_s = timed(lambda: save_frame(columns_dir, df), args.repeats)
+        print(f"docs={args.docs}")
+        print(f"save: pickle {save_pickle_s:.3f} s, columnar {save_columns_s:.3f} s")
+        print(f"size: pickle {os.path.getsize(pickle_file) / 2 ** 20:.1f} MB, "
+              f"columnar {directory_size(columns_dir) / 2 ** 20:.1f} MB")
+
+        cases = (
+            ('pickle', load_pickle),
+            ('columnar, all', lambda: load_frame(columns_dir)),
+            ('columnar, Processed_TFIDF', lambda: load_frame(columns_dir, ['Processed_TFIDF'])),
+            ('columnar, mmap', lambda: load_columns(columns_dir, ['id', 'Category', 'Text', 'Link'])),
+        )
+        for name, call in cases:
+            print(f"load {name:>26}: {timed(call, args.repeats):.3f} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,54 @@
+"""
+Бенчмарк сжатых форматов индекса BERT: объём памяти, recall@10 и задержка для
+float32, int8 и PQ, с точным переранжированием и без него.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_quantization --docs 100000 --queries 200
+"""
+import argparse
+import time
+import numpy as np
+from quantization import QuantizedIndex
+from ranking import top_k
+from vector_store import normalize_rows
+from benchmarks.bench_ann import make_embeddings
+
+
+def main() -> None:
+    """Точка входа бенчмарка."""
+    parser = argparse.ArgumentParser(description="Benchmark int8 and PQ compressed BERT indexes.")
+    parser.add_argument('--docs', type=int, default=100_000)
+    parser.add_argument('--dim', type=int, default=768)
+    parser.add_argument('--topics', type=int, default=500)
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--top-n', type=int, default=10)
+    parser.add_argument('--subspaces', type=int, default=96)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    matrix = normalize_rows(make_embeddings(rng, args.docs, args.dim, args.topics))
+    queries = normalize_rows(matrix[rng.integers(0, args.docs, args.queries)]
+                             + rng.normal(scale=0.05, size=(args.queries, args.dim)).astype(np.float32))
+
+    start = time.perf_counter()
+    exact = [top_k(matrix @ q, args.top_n) for q in queries]
+    exact_ms = (time.perf_counter() - start) / args.queries * 1000
+
+    print(f"docs={args.docs} dim={args.dim} queries={args.queries}")
+    print(f"{'mode':>14} {'memory, MB':>11} {'bytes/doc':>10} {f'recall@{args.top_n}':>10} {'ms/query':>9}")
+    print(f"{'float32':>14} {matrix.nbytes / 2 ** 20:>11.1f} {matrix.nbytes // args.docs:>10} {1.0:>10.3f} {exact_ms:>9.3f}")
+
+    for storage in QuantizedIndex.STORAGES:
+        index = QuantizedIndex(storage, n_subspaces=args.subspaces).fit(matrix)
+        for rerank in (False, True):
+            start = time.perf_counter()
+            found = [index.search(q, args.top_n, rerank_vectors=matrix if rerank else None)[0] for q in queries]
+            elapsed = (time.perf_counter() - start) / args.queries * 1000
+            recall = np.mean([len(set(a) & set(b)) / args.top_n for a, b in zip(found, exact)])
+            name = storage + (' + rerank' if rerank else '')
+            print(f"{name:>14} {index.nbytes / 2 ** 20:>11.1f} {index.nbytes // args.docs:>10} {recall:>10.3f} {elapsed:>9.3f}")
+
+
+if __name__ == '__main__':
+    main()
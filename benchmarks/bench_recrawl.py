@@ -0,0 +1,67 @@
+"""
+Бенчмарк инкрементального обхода (BiographiesCrawler.recrawl) на локальном
+тестовом сервере: первый обход всех страниц, повторный без изменений (ответы
+304) и повторный после изменения части страниц, удаления части людей из
+списков и добавления новых — время, скорость и содержимое дельты в сравнении
+с полным параллельным обходом.
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_recrawl --people 200 --latency-ms 20 --change 0.1
+"""
+import argparse
+import collections
+import json
+import os
+import random
+import tempfile
+import time
+from crawler import BiographiesCrawler
+from benchmarks.bench_crawler import start_server
+
+
+def main() -> None:
+    """Точка входа бенчмарка."""
+    parser = argparse.ArgumentParser(description="Benchmark incremental recrawl against a full crawl.")
+    parser.add_argument('--people', type=int, default=200, help="People per category.")
+    parser.add_argument('--latency-ms', type=float, default=20)
+    parser.add_argument('--change', type=float, default=0.1, help="Share of pages changed between runs.")
+    parser.add_argument('--workers', type=int, default=8)
+    args = parser.parse_args()
+
+    server, base_url = start_server(args.people, args.latency_ms / 1000, fail_rate=0.0)
+    categories_url = base_url + '/biografii'
+    try:
+        with tempfile.TemporaryDirectory() as directory:
+            store = os.path.join(directory, 'state.sqlite')
+            delta = os.path.join(directory, 'delta.jsonl')
+
+            def run(name: str) -> None:
+                stats = BiographiesCrawler(base_url=base_url).recrawl(categories_url, store, delta,
+                                                                      workers=args.workers)
+                with open(delta, encoding='utf-8') as f:
+                    ops = collections.Counter(json.loads(line)['op'] for line in f)
+                print(f"{name:>18}: {stats['elapsed']:6.2f} s, {stats['pages_per_second']:7.1f} pages/s, "
+                      f"pages added {stats['added']} changed {stats['changed']} removed {stats['removed']} "
+                      f"unchanged {stats['unchanged']}, delta rows {dict(ops)}")
+
+            start = time.perf_counter()
+            BiographiesCrawler(base_url=base_url).crawl(categories_url, os.path.join(directory, 'full.jsonl'),
+                                                        workers=args.workers)
+            print(f"{'full crawl':>18}: {time.perf_counter() - start:6.2f} s")
+
+            run('first recrawl')
+            run('no changes')
+
+            total = args.people * 2
+            rng = random.Random(0)
+            for i in rng.sample(range(total), int(total * args.change)):
+                server.state['versions'][i] = 1
+            server.state['hidden'].update(range(5))
+            server.state['people'] += 5
+            run('after changes')
+    finally:
+        server.shutdown()
+
+
+if __name__ == '__main__':
+    main()
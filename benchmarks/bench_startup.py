@@ -0,0 +1,64 @@
+"""
+Бенчмарк времени запуска: CLI (поиск TF-IDF без оценки релевантности и полный
+режим с BERT) и приложение FastAPI (импорт main.py и прогрев в режиме только
+TF-IDF и со всеми методами). Каждый вариант запускается в отдельном процессе,
+чтобы учитывать импорт библиотек и загрузку моделей с нуля.
+
+Запуск из корня проекта (нужны построенные индексы):
+    python -m benchmarks.bench_startup --repeat 3
+"""
+import os
+import sys
+import argparse
+import statistics
+import subprocess
+import time
+from typing import Dict, List
+
+# Импорт приложения и прогрев через lifespan, как при запуске uvicorn
+APP_STARTUP = """
+from fastapi.testclient import TestClient
+import main
+with TestClient(main.app):
+    pass
+"""
+
+
+def measure(command: List[str], env: Dict[str, str], repeat: int) -> List[float]:
+    """
+    Время выполнения команды в новом процессе.
+
+    :param command: Команда.
+    :param env: Переменные окружения.
+    :param repeat: Количество запусков.
+    :return: Время каждого запуска в секундах.
+    """
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(command, env=env, check=True, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def main() -> None:
+    """Точка входа бенчмарка."""
+    parser = argparse.ArgumentParser(description="Benchmark CLI and FastAPI startup time.")
+    parser.add_argument('--query', default='писатель')
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    cli_search = [sys.executable, 'cli.py', 'search', args.query]
+    cases = [
+        ('cli tf-idf', cli_search + ['--index', 'tf-idf', '--no-relevance'], {}),
+        ('cli full', cli_search + ['--index', 'bert', '--relevance'], {}),
+        ('app tf-idf', [sys.executable, '-c', APP_STARTUP], {'WARMUP_METHODS': 'tf-idf'}),
+        ('app full', [sys.executable, '-c', APP_STARTUP], {'WARMUP_METHODS': 'tf-idf,bm25,bert'}),
+    ]
+    for name, command, extra_env in cases:
+        timings = measure(command, {**os.environ, **extra_env}, args.repeat)
+        print(f"{name:>10}: median {statistics.median(timings):6.2f} s, min {min(timings):6.2f} s")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,55 @@
+"""
+Бенчмарк выбора top-k: полная сортировка (np.argsort) против частичного отбора (ranking.top_k).
+
+Запуск из корня проекта:
+    python -m benchmarks.bench_topk --sizes 10000 100000 1000000 --top-n 5
+"""
+import argparse
+import time
+import numpy as np
+from ranking import top_k
+
+
+def time_per_query(func, scores: np.ndarray, top_n: int, repeats: int) -> float:
+    """
+    Среднее время одного вызова в миллисекундах.
+
+    :param func: Функция ранжирования (scores, top_n) -> индексы.
+    :param scores: Оценки документов.
+    :param top_n: Количество результатов.
+    :param repeats: Количество повторов.
+    :return: Время одного запроса в мс.
+    """
+    func(scores, top_n)
+    start = time.perf_counter()
+    for _ in range(repeats):
+        func(scores, top_n)
+    return (time.perf_counter() - start) / repeats * 1000
+
+
+def full_argsort(scores: np.ndarray, top_n: int) -> np.ndarray:
+    """Прежний способ ранжирования: сортировка всего корпуса."""
+    return np.argsort(scores)[::-1][:top_n]
+
+
+def main() -> None:
+    """Точка входа бенчмарка."""
+    parser = argparse.ArgumentParser(description="Benchmark top-k selection.")
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000, 1_000_000])
+    parser.add_argument('--top-n', type=int, default=5)
+    parser.add_argument('--repeats', type=int, default=20)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    print(f"{'docs':>10} {'argsort, ms':>12} {'top_k, ms':>10} {'speedup':>8}")
+    for size in args.sizes:
+        scores = rng.random(size, dtype=np.float32)
+        baseline = time_per_query(full_argsort, scores, args.top_n, args.repeats)
+        partial = time_per_query(top_k, scores, args.top_n, args.repeats)
+        assert set(full_argsort(scores, args.top_n)) == set(top_k(scores, args.top_n))
+        print(f"{size:>10} {baseline:>12.3f} {partial:>10.3f} {baseline / partial:>7.1f}x")
+
+
+if __name__ == '__main__':
+    main()
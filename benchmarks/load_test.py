@@ -0,0 +1,81 @@
+"""
+Нагрузочный тест API поиска: N одновременных клиентов отправляют запросы
+POST /api/search, по завершении выводятся пропускная способность, задержки
+p50/p99 и распределение кодов ответа (503 — отказ по переполнению очереди,
+504 — таймаут).
+
+Запуск (сервер должен быть запущен: uvicorn main:app):
+    python -m benchmarks.load_test --url http://127.0.0.1:8000 --clients 32 --requests 500 --method bert
+"""
+import argparse
+import asyncio
+import time
+from collections import Counter
+from typing import List, Tuple
+import httpx
+import numpy as np
+
+DEFAULT_QUERIES = ['Мария', 'писатель', 'художник эпохи возрождения', 'футболист', 'композитор', 'физик', 'актриса театра']
+
+
+async def client(http: httpx.AsyncClient, url: str, payloads: List[dict], results: List[Tuple[int, float]]) -> None:
+    """
+    Клиент, последовательно отправляющий свою часть запросов.
+
+    :param http: HTTP-клиент.
+    :param url: Адрес эндпоинта поиска.
+    :param payloads: Тела запросов.
+    :param results: Список для пар (код ответа, задержка в секундах).
+    """
+    for payload in payloads:
+        start = time.perf_counter()
+        try:
+            status = (await http.post(url, json=payload)).status_code
+        except httpx.HTTPError:
+            status = 0
+        results.append((status, time.perf_counter() - start))
+
+
+async def run(args: argparse.Namespace) -> None:
+    """
+    Запуск клиентов и вывод статистики.
+
+    :param args: Аргументы командной строки.
+    """
+    queries = args.queries or DEFAULT_QUERIES
+    payloads = [{'query': queries[i % len(queries)], 'method': args.method, 'limit': args.limit}
+                for i in range(args.requests)]
+    results: List[Tuple[int, float]] = []
+    limits = httpx.Limits(max_connections=args.clients)
+    async with httpx.AsyncClient(timeout=args.timeout, limits=limits) as http:
+        start = time.perf_counter()
+        await asyncio.gather(*(client(http, args.url.rstrip('/') + '/api/search', payloads[i::args.clients], results)
+                               for i in range(args.clients)))
+        elapsed = time.perf_counter() - start
+
+    statuses = Counter(status for status, _ in results)
+    latencies = np.array([latency for status, latency in results if status == 200]) * 1000
+    print(f"clients={args.clients} requests={args.requests} method={args.method} time={elapsed:.1f} s")
+    print(f"throughput: {statuses[200] / elapsed:.1f} ok req/s")
+    if latencies.size:
+        print(f"latency ok: p50 {np.percentile(latencies, 50):.1f} ms, p99 {np.percentile(latencies, 99):.1f} ms, "
+              f"max {latencies.max():.1f} ms")
+    print("status codes: " + ', '.join(f"{status or 'error'}: {count}" for status, count in sorted(statuses.items())))
+
+
+def main() -> None:
+    """Точка входа нагрузочного теста."""
+    parser = argparse.ArgumentParser(description="Load-test POST /api/search with concurrent clients.")
+    parser.add_argument('--url', default='http://127.0.0.1:8000')
+    parser.add_argument('--clients', type=int, default=16)
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--method', default='tf-idf', choices=['tf-idf', 'bm25', 'bert'])
+    parser.add_argument('--limit', type=int, default=5)
+    parser.add_argument('--timeout', type=float, default=60.0)
+    parser.add_argument('--queries', nargs='*', help="Queries to cycle through.")
+    args = parser.parse_args()
+    asyncio.run(run(args))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,134 @@
+import numpy as np
+from scipy import sparse
+from typing import Dict, List, Optional, Tuple
+from inverted_index import InvertedIndex
+
+
+class BM25Index:
+    """
+    Индекс для ранжирования Okapi BM25 по заранее лемматизированным текстам.
+
+    Длины документов, IDF и частоты терминов считаются один раз при построении:
+    вклад каждого термина в документ (impact) сохраняется в постингах
+    инвертированного индекса, поэтому запрос сводится к выборке списков
+    постингов его терминов и суммированию.
+    """
+
+    def __init__(self, k1: float = 1.5, b: float = 0.75) -> None:
+        """
+        Инициализация параметров BM25.
+
+        :param k1: Насыщение частоты термина.
+        :param b: Степень нормализации по длине документа.
+        """
+        self.k1 = k1
+        self.b = b
+        self.vocabulary: Dict[str, int] = {}
+        self.doc_lengths = np.empty(0, dtype=np.int32)
+        self.avg_doc_length = 0.0
+        self.idf = np.empty(0, dtype=np.float32)
+        self.index = None
+
+    @property
+    def n_docs(self) -> int:
+        """Количество документов в индексе."""
+        return self.doc_lengths.shape[0]
+
+    def fit(self, documents: List[str]) -> 'BM25Index':
+        """
+        Построение индекса по документам из токенов, разделённых пробелами
+        (например, колонке 'Processed_TFIDF').
+
+        :param documents: Список предобработанных текстов.
+        :return: Построенный индекс.
+        """
+        tokenized = [doc.split() for doc in documents]
+        self.vocabulary = {term: i for i, term in enumerate(sorted({t for tokens in tokenized for t in tokens}))}
+        self.doc_lengths = np.array([len(tokens) for tokens in tokenized], dtype=np.int32)
+        self.avg_doc_length = float(self.doc_lengths.mean()) if self.n_docs else 0.0
+
+        rows = np.repeat(np.arange(self.n_docs), self.doc_lengths)
+        cols = np.fromiter((self.vocabulary[t] for tokens in tokenized for t in tokens), dtype=np.int64, count=int(self.doc_lengths.sum()))
+        term_freqs = sparse.csr_matrix((np.ones(cols.shape[0], dtype=np.float32), (rows, cols)),
+                                       shape=(self.n_docs, len(self.vocabulary)))
+        term_freqs.sum_duplicates()
+
+        doc_freqs = np.bincount(term_freqs.indices, minlength=len(self.vocabulary))
+        self.idf = np.log1p((self.n_docs - doc_freqs + 0.5) / (doc_freqs + 0.5)).astype(np.float32)
+        self.index = InvertedIndex.from_matrix(self._impacts(term_freqs))
+        return self
+
+    def transform(self, documents: List[str]) -> sparse.csr_matrix:
+        """
+        Веса BM25 новых документов по словарю, IDF и средней длине построенного
+        индекса, без его перестроения. Термины вне словаря не учитываются.
+
+        :param documents: Список предобработанных текстов.
+        :return: Разреженная матрица весов (len(documents), размер словаря).
+        """
+        tokenized = [doc.split() for doc in documents]
+        term_freqs = self.query_matrix(tokenized)
+        lengths = np.array([len(tokens) for tokens in tokenized], dtype=np.float32)
+        return self._impacts(term_freqs, lengths)
+
+    def _impacts(self, term_freqs: sparse.csr_matrix, doc_lengths: Optional[np.ndarray] = None) -> sparse.csr_matrix:
+        """
+        Вклад BM25 каждого термина в каждый документ.
+
+        :param term_freqs: Матрица частот терминов документ × термин.
+        :param doc_lengths: Длины документов в токенах; None — суммы строк term_freqs.
+        :return: Матрица весов той же структуры.
+        """
+        if doc_lengths is None:
+            doc_lengths = np.asarray(term_freqs.sum(axis=1)).ravel()
+        lengths = np.repeat(doc_lengths, np.diff(term_freqs.indptr))
+        norm = self.k1 * (1 - self.b + self.b * lengths / max(self.avg_doc_length, 1e-9))
+        tf = term_freqs.data
+        weights = self.idf[term_freqs.indices] * tf * (self.k1 + 1) / (tf + norm)
+        return sparse.csr_matrix((weights.astype(np.float32), term_freqs.indices, term_freqs.indptr), shape=term_freqs.shape)
+
+    def query_vector(self, tokens: List[str]) -> sparse.csr_matrix:
+        """
+        Вектор запроса: количество вхождений каждого известного термина.
+
+        :param tokens: Лемматизированные токены запроса.
+        :return: Разреженный вектор размера (1, размер словаря).
+        """
+        return self.query_matrix([tokens])
+
+    def query_matrix(self, queries: List[List[str]]) -> sparse.csr_matrix:
+        """
+        Матрица запросов: по строке с количеством вхождений терминов на каждый запрос.
+
+        :param queries: Списки лемматизированных токенов запросов.
+        :return: Разреженная матрица размера (len(queries), размер словаря).
+        """
+        rows, ids = [], []
+        for row, tokens in enumerate(queries):
+            known = [self.vocabulary[t] for t in tokens if t in self.vocabulary]
+            rows.extend([row] * len(known))
+            ids.extend(known)
+        counts = np.ones(len(ids), dtype=np.float32)
+        matrix = sparse.csr_matrix((counts, (rows, ids)), shape=(len(queries), len(self.vocabulary)))
+        matrix.sum_duplicates()
+        return matrix
+
+    def search(self, tokens: List[str], top_n: int = 5) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Поиск top_n документов по BM25.
+
+        :param tokens: Лемматизированные токены запроса.
+        :param top_n: Количество результатов для возврата.
+        :return: Кортеж (номера документов, оценки BM25).
+        """
+        return self.index.search(self.query_vector(tokens), top_n)
+
+    def search_many(self, queries: List[List[str]], top_n: int = 5) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Пакетный поиск по BM25 одним произведением разреженных матриц.
+
+        :param queries: Списки лемматизированных токенов запросов.
+        :param top_n: Количество результатов для каждого запроса.
+        :return: Список кортежей (номера документов, оценки BM25) в порядке запросов.
+        """
+        return self.index.search_many(self.query_matrix(queries), top_n)
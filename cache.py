@@ -0,0 +1,120 @@
+import sys
+import time
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional
+import numpy as np
+
+
+def approximate_size(value: Any) -> int:
+    """
+    Приблизительный объём памяти значения в байтах.
+
+    :param value: Значение (массив NumPy, строка, кортеж, список и т.п.).
+    :return: Размер в байтах.
+    """
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, (tuple, list)):
+        return sys.getsizeof(value) + sum(approximate_size(item) for item in value)
+    return sys.getsizeof(value)
+
+
+class LRUCache:
+    """
+    Потокобезопасный LRU-кэш с ограничениями на количество записей, суммарный
+    объём памяти и время жизни записи (TTL). Считает попадания и промахи.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_bytes: Optional[int] = None, ttl: Optional[float] = None,
+                 clock: Callable[[], float] = time.monotonic) -> None:
+        """
+        Инициализация кэша.
+
+        :param max_entries: Максимальное количество записей.
+        :param max_bytes: Максимальный суммарный объём ключей и значений в байтах. None — без ограничения.
+        :param ttl: Время жизни записи в секундах. None — без ограничения.
+        :param clock: Источник времени.
+        """
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.clock = clock
+        self._data: 'OrderedDict[Hashable, tuple]' = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.expirations = 0
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """
+        Получение значения по ключу с обновлением его позиции в очереди LRU.
+
+        :param key: Ключ.
+        :param default: Значение, возвращаемое при промахе.
+        :return: Закэшированное значение или default.
+        """
+        with self._lock:
+            entry = self._data.get(key)
+            if entry is not None and self.ttl is not None and self.clock() - entry[1] > self.ttl:
+                self._remove(key)
+                self.expirations += 1
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return default
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        """
+        Сохранение значения с вытеснением самых давно использованных записей.
+
+        :param key: Ключ.
+        :param value: Значение.
+        """
+        size = approximate_size(key) + approximate_size(value)
+        if self.max_bytes is not None and size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._data:
+                self._remove(key)
+            self._data[key] = (value, self.clock(), size)
+            self._bytes += size
+            while len(self._data) > self.max_entries or (self.max_bytes is not None and self._bytes > self.max_bytes):
+                self._remove(next(iter(self._data)))
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Удаление всех записей (счётчики попаданий и промахов сохраняются)."""
+        with self._lock:
+            self._data.clear()
+            self._bytes = 0
+
+    def stats(self) -> Dict[str, int]:
+        """
+        Статистика кэша.
+
+        :return: Словарь со счётчиками попаданий, промахов, вытеснений, истечений TTL,
+            количеством записей и занятым объёмом.
+        """
+        with self._lock:
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'expirations': self.expirations,
+                'entries': len(self._data),
+                'bytes': self._bytes,
+            }
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def _remove(self, key: Hashable) -> None:
+        """Удаление записи без блокировки (вызывается под self._lock)."""
+        _, _, size = self._data.pop(key)
+        self._bytes -= size
@@ -3,8 +3,9 @@ import sys
 import time
 from information_retrieval import InformationRetrieval
 
-# Создаем объект класса поисковика
-ir = InformationRetrieval('new_biographies.csv', 'indexes/tfidf_index.pkl', 'indexes/bert_index.pkl')
+# Создаем объект класса поисковика (корпус, модели и индексы загружаются при первом поиске)
+ir = InformationRetrieval('new_biographies.csv', 'indexes/tfidf_index.pkl', 'indexes/bert_index.npy',
+                          bm25_pkl_file='indexes/bm25_index.pkl', embedding_store_dir='indexes/embeddings')
 
 @click.group()
 def cli():
@@ -17,18 +18,21 @@ def welcome():
     click.echo("Добро пожаловать в систему поиска!")
     click.echo("Индексация данных будет автоматически загружена из сохраненных файлов при запуске.")
     click.echo("Для поиска используйте команду:")
-    click.echo("python cli.py search <ваш запрос> --index <tf-idf|bert>.")
+    click.echo("python cli.py search <ваш запрос> --index <tf-idf|bm25|bert>.")
 
 @click.command()
 @click.argument('query', type=str)
-@click.option('--index', type=click.Choice(['tf-idf', 'bert'], case_sensitive=False), required=True,
-              help="Выберите индекс: 'tf-idf' или 'bert'.")
-def search(query: str, index: str):
+@click.option('--index', type=click.Choice(['tf-idf', 'bm25', 'bert'], case_sensitive=False), required=True,
+              help="Выберите индекс: 'tf-idf', 'bm25' или 'bert'.")
+@click.option('--relevance/--no-relevance', default=False,
+              help="Выводить оценку релевантности (требует загрузки BERT).")
+def search(query: str, index: str, relevance: bool):
     """
     Поиск по запросу с использованием указанного индекса.
 
     :param query: Запрос для поиска.
-    :param index: Тип индекса ('tf-idf' или 'bert').
+    :param index: Тип индекса ('tf-idf', 'bm25' или 'bert').
+    :param relevance: Выводить ли оценку релевантности.
     """
     click.echo(f"Выполняется поиск по запросу: '{query}' с использованием индекса '{index}'...")
 
@@ -38,6 +42,9 @@ def search(query: str, index: str):
     if index == 'tf-idf':
         results = ir.search_tfidf(query, top_n=2)
         method_name = "TF-IDF"
+    elif index == 'bm25':
+        results = ir.search_bm25(query, top_n=2)
+        method_name = "BM25"
     else:
         results = ir.search_bert(query, top_n=2)
         method_name = "BERT"
@@ -49,16 +56,32 @@ def search(query: str, index: str):
         for idx, result in enumerate(results):
             click.echo(f"\n--- Результат {idx + 1} ---\nID: {result[0]}\nCategory: {result[1]}\nText: {result[2]}\nLink: {result[3]}")
             # Здесь добавлен код для получения и отображения оценки релевантности
-            relevance_score = ir.evaluate_relevance(query, result[2])
-            click.echo(f"Оценка релевантности: {relevance_score:.4f}")
+            if relevance:
+                relevance_score = ir.evaluate_relevance(query, result[2])
+                click.echo(f"Оценка релевантности: {relevance_score:.4f}")
     else:
         click.echo("По вашему запросу ничего не найдено.")
 
     click.echo(f"\nВремя выполнения поиска: {elapsed_time:.2f} секунд.")
 
+@click.command('compact-embeddings')
+@click.option('--corpus-only', is_flag=True,
+              help="Оставить только эмбеддинги текстов текущего корпуса.")
+def compact_embeddings(corpus_only: bool):
+    """
+    Сжатие хранилища эмбеддингов: удаление повторов и, по желанию, эмбеддингов
+    текстов, которых больше нет в корпусе.
+
+    :param corpus_only: Оставить только эмбеддинги текстов текущего корпуса.
+    """
+    keep = [ir.embedding_key(text) for text in ir.df['Processed_BERT']] if corpus_only else None
+    before, after = ir.embedding_store.compact(keep)
+    click.echo(f"Записей в хранилище эмбеддингов: было {before}, стало {after}.")
+
 # Добавляем команды в главный интерфейс
 cli.add_command(welcome)
 cli.add_command(search)
+cli.add_command(compact_embeddings)
 
 if __name__ == '__main__':
     # Если скрипт запущен без параметров, вызываем команду welcome по умолчанию.
@@ -0,0 +1,130 @@
+import os
+import json
+import hashlib
+import numpy as np
+import pandas as pd
+from typing import Dict, Iterable, Optional, Union
+from atomic_io import replacing, save_npy
+from document_store import StringColumn
+
+FORMAT_VERSION = 1
+META_FILE = 'meta.json'
+
+Column = Union[np.ndarray, StringColumn]
+
+
+def file_fingerprint(path: str, previous: Optional[Dict] = None, chunk_size: int = 2 ** 20) -> Dict:
+    """
+    Отпечаток содержимого файла: размер, время изменения и SHA-256.
+
+    Если размер и время изменения совпадают с предыдущим отпечатком, хэш берётся
+    из него, чтобы не перечитывать большой файл при каждом запуске.
+
+    :param path: Путь к файлу.
+    :param previous: Предыдущий отпечаток того же файла.
+    :param chunk_size: Размер блока чтения в байтах.
+    :return: Словарь {'size', 'mtime_ns', 'sha256'}.
+    """
+    stat = os.stat(path)
+    if previous and previous.get('size') == stat.st_size and previous.get('mtime_ns') == stat.st_mtime_ns:
+        return dict(previous)
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'sha256': digest.hexdigest()}
+
+
+def save_frame(directory: str, df: pd.DataFrame, **metadata) -> None:
+    """
+    Сохранение DataFrame по столбцам: числовые — файлами .npy, остальные — как
+    StringColumn (буфер UTF-8 и смещения). Пропуски в строковых столбцах
+    становятся пустыми строками. Заголовок meta.json пишется последним, поэтому
+    прерванная запись не считается готовым кэшем.
+
+    :param directory: Каталог кэша.
+    :param df: Данные.
+    :param metadata: Дополнительные поля заголовка (отпечаток источника, настройки и т.п.).
+    """
+    os.makedirs(directory, exist_ok=True)
+    meta_file = os.path.join(directory, META_FILE)
+    if os.path.exists(meta_file):
+        os.remove(meta_file)
+
+    columns = {}
+    for name in df.columns:
+        path = os.path.join(directory, str(name))
+        values = df[name]
+        if values.dtype.kind in 'biuf':
+            save_npy(path + '.npy', values.to_numpy())
+            columns[str(name)] = 'numeric'
+        else:
+            StringColumn.from_strings(values).save(path)
+            columns[str(name)] = 'string'
+
+    header = {'format_version': FORMAT_VERSION, 'rows': len(df), 'columns': columns}
+    header.update(metadata)
+    with replacing(meta_file, 'w', encoding='utf-8') as f:
+        json.dump(header, f, ensure_ascii=False, indent=2)
+
+
+def read_metadata(directory: str) -> Optional[Dict]:
+    """
+    Заголовок кэша.
+
+    :param directory: Каталог кэша.
+    :return: Заголовок или None, если кэша нет или он записан другой версией формата.
+    """
+    meta_file = os.path.join(directory, META_FILE)
+    if not os.path.exists(meta_file):
+        return None
+    with open(meta_file, encoding='utf-8') as f:
+        header = json.load(f)
+    if header.get('format_version') != FORMAT_VERSION:
+        return None
+    return header
+
+
+def load_columns(directory: str, columns: Optional[Iterable[str]] = None, mmap: bool = True) -> Dict[str, Column]:
+    """
+    Загрузка отдельных столбцов без преобразования в DataFrame.
+
+    :param directory: Каталог кэша.
+    :param columns: Имена столбцов; None — все.
+    :param mmap: Отображать ли файлы в память вместо чтения целиком.
+    :return: Словарь {имя: массив numpy или StringColumn}.
+    """
+    header = read_metadata(directory)
+    if header is None:
+        raise FileNotFoundError(f"Нет кэша столбцов в {directory}")
+    names = list(columns) if columns is not None else list(header['columns'])
+
+    loaded = {}
+    for name in names:
+        kind = header['columns'].get(name)
+        if kind is None:
+            raise KeyError(f"Столбец {name} отсутствует в {directory}")
+        path = os.path.join(directory, name)
+        if kind == 'numeric':
+            loaded[name] = np.load(path + '.npy', mmap_mode='r' if mmap else None)
+        else:
+            loaded[name] = StringColumn.load(path, lazy=mmap)
+    return loaded
+
+
+def load_frame(directory: str, columns: Optional[Iterable[str]] = None) -> pd.DataFrame:
+    """
+    Загрузка DataFrame из кэша; читаются только указанные столбцы.
+
+    :param directory: Каталог кэша.
+    :param columns: Имена столбцов; None — все.
+    :return: Данные.
+    """
+    loaded = load_columns(directory, columns, mmap=True)
+    data = {}
+    for name, column in loaded.items():
+        if isinstance(column, StringColumn):
+            data[name] = column.take(np.arange(len(column)))
+        else:
+            data[name] = np.array(column)
+    return pd.DataFrame(data)
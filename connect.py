@@ -53,7 +53,10 @@ def setup_tables() -> None:
         id INT AUTO_INCREMENT PRIMARY KEY,
         query_text VARCHAR(255),
         method VARCHAR(50),
-        query_link VARCHAR(255)
+        query_link VARCHAR(255),
+        latency FLOAT NULL,
+        created_at TIMESTAMP NULL DEFAULT CURRENT_TIMESTAMP,
+        INDEX idx_query_link (query_link)
     )
     """)
 
@@ -70,10 +73,50 @@ def setup_tables() -> None:
     cursor.close()
     connection.close()
 
+def migrate_tables() -> None:
+    """Добавляет в таблицы, созданные прежними версиями, недостающие столбцы и индексы."""
+    connection = pymysql.connect(
+        host=DB_CONFIG['host'],
+        user=DB_CONFIG['user'],
+        password=DB_CONFIG['password'],
+        database=DB_CONFIG['database']
+    )
+    cursor = connection.cursor()
+
+    columns = {
+        ('Query', 'latency'): "ALTER TABLE Query ADD COLUMN latency FLOAT NULL",
+        ('Query', 'created_at'): "ALTER TABLE Query ADD COLUMN created_at TIMESTAMP NULL DEFAULT CURRENT_TIMESTAMP",
+    }
+    for (table, column), statement in columns.items():
+        cursor.execute(
+            "SELECT COUNT(*) FROM information_schema.COLUMNS "
+            "WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s AND COLUMN_NAME = %s",
+            (DB_CONFIG['database'], table, column)
+        )
+        if cursor.fetchone()[0] == 0:
+            cursor.execute(statement)
+
+    indexes = {
+        ('Query', 'idx_query_link'): "CREATE INDEX idx_query_link ON Query (query_link)",
+    }
+    for (table, index), statement in indexes.items():
+        cursor.execute(
+            "SELECT COUNT(*) FROM information_schema.STATISTICS "
+            "WHERE TABLE_SCHEMA = %s AND TABLE_NAME = %s AND INDEX_NAME = %s",
+            (DB_CONFIG['database'], table, index)
+        )
+        if cursor.fetchone()[0] == 0:
+            cursor.execute(statement)
+
+    connection.commit()
+    cursor.close()
+    connection.close()
+
 def setup_database() -> None:
     """Создает базу данных и таблицы, необходимые для работы приложения."""
     create_database()
     setup_tables()
+    migrate_tables()
 
 if __name__ == "__main__":
     setup_database()
\ No newline at end of file
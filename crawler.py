@@ -1,31 +1,288 @@
+import os
+import csv
+import json
+import time
+import sqlite3
+import hashlib
+import random
+import logging
+import argparse
+import threading
 import requests
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from urllib.parse import urljoin, urlparse
 from fake_useragent import UserAgent
 from bs4 import BeautifulSoup
+from extractors import NOT_FOUND_TEXT, get_extractor
 import pandas as pd
-from typing import List, Tuple, Dict
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 from tqdm import tqdm
 
+logger = logging.getLogger(__name__)
+
+# Коды ответа, после которых запрос повторяется
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+# Коды ответа, означающие, что страница биографии удалена
+GONE_STATUSES = {404, 410}
+# Поля строк дельты инкрементального обхода
+DELTA_FIELDS = ['op', 'Person', 'Category', 'Text', 'Link']
+
+
+class HostRateLimiter:
+    """Ограничение частоты запросов к каждому хосту, общее для всех потоков."""
+
+    def __init__(self, rate: float) -> None:
+        """
+        Args:
+            rate (float): Максимальное количество запросов в секунду к одному хосту; 0 — без ограничения.
+        """
+        self.interval = 1.0 / rate if rate > 0 else 0.0
+        self._next_slot: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def wait(self, url: str) -> None:
+        """Ожидает, пока к хосту URL можно будет отправить следующий запрос.
+
+        Args:
+            url (str): URL запроса.
+        """
+        if not self.interval:
+            return
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+
+class Checkpoint:
+    """Список уже обработанных URL в файле: по одному на строку, дописывается после каждой страницы."""
+
+    def __init__(self, path: str) -> None:
+        """
+        Args:
+            path (str): Путь к файлу контрольной точки.
+        """
+        self.path = path
+        self.done: Set[str] = set()
+        if os.path.exists(path):
+            with open(path, encoding='utf-8') as f:
+                self.done = {line.strip() for line in f if line.strip()}
+        self._file = open(path, 'a', encoding='utf-8')
+        self._lock = threading.Lock()
+
+    def __contains__(self, url: str) -> bool:
+        return url in self.done
+
+    def add(self, url: str) -> None:
+        """Отмечает URL как обработанный.
+
+        Args:
+            url (str): URL страницы.
+        """
+        with self._lock:
+            self._file.write(url + '\n')
+            self._file.flush()
+            self.done.add(url)
+
+    def close(self) -> None:
+        """Закрывает файл."""
+        self._file.close()
+
+
+class RowWriter:
+    """Потоковая запись строк результата в CSV или JSONL (по расширению файла) по мере их получения."""
+
+    FIELDS = ['Person', 'Category', 'Text', 'Link']
+
+    def __init__(self, path: str, fields: Optional[List[str]] = None, append: bool = True) -> None:
+        """
+        Args:
+            path (str): Путь к выходному файлу .csv или .jsonl.
+            fields (Optional[List[str]]): Поля строки; по умолчанию FIELDS.
+            append (bool): Дописывать ли существующий файл; иначе он перезаписывается.
+        """
+        self.path = path
+        self.fields = fields or self.FIELDS
+        self.jsonl = path.endswith('.jsonl')
+        is_new = not append or not os.path.exists(path) or os.path.getsize(path) == 0
+        self._file = open(path, 'a' if append else 'w', newline='', encoding='utf-8')
+        self._lock = threading.Lock()
+        self._writer = None
+        if not self.jsonl:
+            self._writer = csv.DictWriter(self._file, fieldnames=self.fields)
+            if is_new:
+                self._writer.writeheader()
+
+    def write(self, row: Dict[str, str]) -> None:
+        """Записывает строку и сбрасывает буфер на диск.
+
+        Args:
+            row (Dict[str, str]): Строка с полями fields.
+        """
+        with self._lock:
+            if self.jsonl:
+                self._file.write(json.dumps(row, ensure_ascii=False) + '\n')
+            else:
+                self._writer.writerow(row)
+            self._file.flush()
+
+    def close(self) -> None:
+        """Закрывает файл."""
+        self._file.close()
+
+
+class RecrawlStore:
+    """
+    Состояние инкрементального обхода в SQLite: для каждой страницы биографии —
+    валидаторы HTTP (ETag, Last-Modified), хэш содержимого и извлечённые данные.
+    """
+
+    def __init__(self, path: str) -> None:
+        """
+        Args:
+            path (str): Путь к файлу базы SQLite.
+        """
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("""
+        CREATE TABLE IF NOT EXISTS pages (
+            url TEXT PRIMARY KEY,
+            etag TEXT,
+            last_modified TEXT,
+            content_hash TEXT,
+            person TEXT,
+            categories TEXT,
+            text TEXT,
+            fetched_at REAL
+        )
+        """)
+
+    def load(self) -> Dict[str, Dict]:
+        """Все сохранённые страницы.
+
+        Returns:
+            Dict[str, Dict]: Словарь {url: запись}; categories — список категорий.
+        """
+        cursor = self.connection.execute(
+            "SELECT url, etag, last_modified, content_hash, person, categories, text FROM pages")
+        return {row[0]: {'etag': row[1], 'last_modified': row[2], 'content_hash': row[3], 'person': row[4],
+                         'categories': json.loads(row[5]), 'text': row[6]} for row in cursor}
+
+    def save(self, url: str, record: Dict) -> None:
+        """Сохраняет или заменяет запись страницы.
+
+        Args:
+            url (str): URL страницы.
+            record (Dict): Запись с полями, как в load().
+        """
+        self.connection.execute(
+            "INSERT OR REPLACE INTO pages VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (url, record['etag'], record['last_modified'], record['content_hash'], record['person'],
+             json.dumps(record['categories'], ensure_ascii=False), record['text'], time.time())
+        )
+
+    def delete(self, url: str) -> None:
+        """Удаляет запись страницы.
+
+        Args:
+            url (str): URL страницы.
+        """
+        self.connection.execute("DELETE FROM pages WHERE url = ?", (url,))
+
+    def commit(self) -> None:
+        """Фиксирует изменения."""
+        self.connection.commit()
+
+    def close(self) -> None:
+        """Фиксирует изменения и закрывает базу."""
+        self.connection.commit()
+        self.connection.close()
+
 
 class BiographiesCrawler:
-    def __init__(self) -> None:
-        """Инициализация краулера для биографий."""
+    def __init__(self, base_url: str = 'https://obrazovaka.ru', rate: float = 0, retries: int = 3,
+                 backoff: float = 0.5, timeout: float = 30, extractor: str = 'stream') -> None:
+        """Инициализация краулера для биографий.
+
+        Args:
+            base_url (str): Адрес сайта, относительно которого разрешаются ссылки.
+            rate (float): Максимальное количество запросов в секунду к одному хосту; 0 — без ограничения.
+            retries (int): Количество повторов запроса при сетевой ошибке или кодах RETRY_STATUSES.
+            backoff (float): Начальная пауза перед повтором в секундах; удваивается с каждой попыткой.
+            timeout (float): Таймаут одного запроса в секундах.
+            extractor (str): Функция извлечения текста биографии из extractors.EXTRACTORS:
+                'stream' — потоковый разбор, 'bs4' — BeautifulSoup (результат одинаковый).
+        """
+        self.base_url = base_url
         self.session = requests.Session()
         self.ua = UserAgent()
+        # UserAgent.random занимает несколько миллисекунд процессора и держит GIL,
+        # поэтому заголовки выбираются из заранее набранного списка
+        self.user_agents = [self.ua.random for _ in range(20)]
         self.categories_links: List[str] = []
         self.category_people: Dict[str, List[Tuple[str, str]]] = {}
+        self.limiter = HostRateLimiter(rate)
+        self.retries = retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.extract = get_extractor(extractor)
+        self._local = threading.local()
+
+    def _session(self) -> requests.Session:
+        """Сессия текущего потока: основной поток использует self.session, остальные — свои."""
+        if threading.current_thread() is threading.main_thread():
+            return self.session
+        if not hasattr(self._local, 'session'):
+            self._local.session = requests.Session()
+        return self._local.session
+
+    def get(self, url: str, headers: Optional[Dict[str, str]] = None) -> requests.Response:
+        """Загружает страницу с ограничением частоты и повторами с экспоненциальной паузой.
+
+        Args:
+            url (str): URL страницы.
+            headers (Optional[Dict[str, str]]): Дополнительные заголовки запроса.
+
+        Returns:
+            requests.Response: Ответ; после исчерпания повторов — последний полученный ответ.
+
+        Raises:
+            requests.RequestException: Ни одна попытка не получила ответа.
+        """
+        for attempt in range(self.retries + 1):
+            self.limiter.wait(url)
+            try:
+                response = self._session().get(url, headers={'User-Agent': random.choice(self.user_agents), **(headers or {})},
+                                               timeout=self.timeout)
+            except requests.RequestException:
+                if attempt == self.retries:
+                    raise
+                delay = self.backoff * 2 ** attempt
+            else:
+                if response.status_code not in RETRY_STATUSES or attempt == self.retries:
+                    return response
+                retry_after = response.headers.get('Retry-After', '')
+                delay = float(retry_after) if retry_after.isdigit() else self.backoff * 2 ** attempt
+            # Случайная добавка, чтобы потоки не повторяли запросы одновременно
+            time.sleep(delay * random.uniform(1.0, 1.5))
 
     def fetch_categories(self, url: str) -> None:
         """Парсит страничку с категориями и сохраняет ссылки на категории.
 
         Args:
             url (str): URL страницы с категориями.
+
+        Raises:
+            requests.RequestException: Страница не загружена или ответ — ошибка HTTP.
         """
-        req = self.session.get(url, headers={'User-Agent': self.ua.random})
-        page = req.text
-        soup = BeautifulSoup(page, 'html.parser')
+        response = self.get(url)
+        response.raise_for_status()
+        soup = BeautifulSoup(response.text, 'html.parser')
 
         links = soup.select('.item__body a')
-        self.categories_links = ['https://obrazovaka.ru' + str(link['href']) for link in links]
+        self.categories_links = [urljoin(self.base_url, str(link['href'])) for link in links]
 
     def get_every_person(self, url: str) -> List[Tuple[str, str]]:
         """Извлекает имена и ссылки на биографии из указанной категории.
@@ -35,26 +292,33 @@ class BiographiesCrawler:
 
         Returns:
             List[Tuple[str, str]]: Список кортежей с именами и ссылками на биографии.
+
+        Raises:
+            requests.RequestException: Страница не загружена или ответ — ошибка HTTP.
         """
-        req = self.session.get(url, headers={'User-Agent': self.ua.random})
-        page = req.text
-        soup = BeautifulSoup(page, 'html.parser')
+        response = self.get(url)
+        response.raise_for_status()
+        soup = BeautifulSoup(response.text, 'html.parser')
 
         biographies = soup.select('.biographis__item')
         list_of_people: List[Tuple[str, str]] = []
 
         for bio in biographies:
             name = bio.select_one('.item__name').text
-            link = bio.select_one('.item__name')['href']
+            link = urljoin(self.base_url, bio.select_one('.item__name')['href'])
             list_of_people.append((name, link))
 
         return list_of_people
 
     def crawl_categories(self) -> None:
-        """Обходит все категории и собирает информацию о людях."""
+        """Обходит все категории и собирает информацию о людях; неудавшиеся категории пропускаются."""
         for link in self.categories_links:
             category = link.split('/')[4]
-            result = self.get_every_person(link)
+            try:
+                result = self.get_every_person(link)
+            except requests.RequestException as e:
+                logger.error(f"Category {link} failed: {str(e)}")
+                continue
 
             if category not in self.category_people:
                 self.category_people[category] = []
@@ -69,38 +333,25 @@ class BiographiesCrawler:
 
         Returns:
             str: Текст биографии или сообщение об ошибке.
-        """
-        req = self.session.get(url, headers={'User-Agent': self.ua.random})
-        page = req.text
-        soup = BeautifulSoup(page, 'html.parser')
-
-        # Находим div с id 'summury_text'
-        summary_div = soup.find("div", id='summury_text')
-
-        if summary_div:
-            # Сначала собираем текст из summury_div
-            summary_text = summary_div.get_text(strip=True)
-
-            # Получаем следующий элемент после summury_div
-            next_element = summary_div.find_next_sibling()
 
-            paragraphs: List[str] = []
+        Raises:
+            requests.RequestException: Страница не загружена или ответ — ошибка HTTP
+                (в том числе 429 и 5xx после всех повторов).
+        """
+        response = self.get(url)
+        response.raise_for_status()
+        return self.extract_person_text(response.text)
 
-            # Ищем все <p> теги после найденного элемента
-            while next_element:
-                if next_element.name == 'p':
-                    paragraphs.append(next_element.get_text(strip=True))
-                # Если встречаем h4 с текстом "Оценка по биографии", прерываем цикл
-                elif next_element.name == 'h4' and next_element.get_text(strip=True) == "Оценка по биографии":
-                    break
+    def extract_person_text(self, page: str) -> str:
+        """Извлекает текст биографии из HTML страницы выбранной функцией извлечения.
 
-                # Переходим к следующему элементу
-                next_element = next_element.find_next_sibling()
+        Args:
+            page (str): HTML страницы с биографией.
 
-            # Объединяем текст из summary и найденные параграфы
-            return summary_text + " " + " ".join(paragraphs).strip()
-        else:
-            return "Элемент с id 'summury_text' не найден."
+        Returns:
+            str: Текст биографии или сообщение об ошибке.
+        """
+        return self.extract(page)
 
     def scrape(self, categories_url: str) -> pd.DataFrame:
         """Основной метод для запуска краулера и сбора данных в DataFrame.
@@ -109,32 +360,316 @@ class BiographiesCrawler:
             categories_url (str): URL страницы с категориями.
 
         Returns:
-            pd.DataFrame: DataFrame с информацией о людях и их биографиях.
+            pd.DataFrame: DataFrame с информацией о людях и их биографиях; страницы,
+                которые не удалось загрузить, пропускаются.
         """
         self.fetch_categories(categories_url)
         self.crawl_categories()
 
-        df = pd.DataFrame(columns=['Person', 'Category', 'Text', 'Link'])
-        person_id: int = 0
-
-        # Используем tqdm для отслеживания прогресса при обходе людей
-        total_people = sum(len(people) for people in self.category_people.values())
+        rows: List[List[str]] = []
 
         for category, people in tqdm(self.category_people.items(), desc="Сбор данных", total=len(self.category_people)):
             for person, link in people:
-                biography = self.get_person_text(link)
-                df.loc[person_id] = [person, category, biography, link]
-                person_id += 1
+                try:
+                    biography = self.get_person_text(link)
+                except requests.RequestException as e:
+                    logger.error(f"Page {link} failed: {str(e)}")
+                    continue
+                rows.append([person, category, biography, link])
 
-        return df
+        return pd.DataFrame(rows, columns=['Person', 'Category', 'Text', 'Link'])
 
+    def _collect_entries(self, categories_url: str, categories: Optional[Iterable[str]],
+                         executor: ThreadPoolExecutor) -> Tuple[Dict[str, List[Tuple[str, str]]], int, int]:
+        """Загружает страницу категорий и списки людей в категориях параллельно.
 
-crawler = BiographiesCrawler()
-categories_url = 'https://obrazovaka.ru/biografii'
-df = crawler.scrape(categories_url)
+        Args:
+            categories_url (str): URL страницы с категориями.
+            categories (Optional[Iterable[str]]): Обходимые категории; None — все.
+            executor (ThreadPoolExecutor): Пул потоков загрузки.
+
+        Returns:
+            Tuple[Dict[str, List[Tuple[str, str]]], int, int]: Словарь {ссылка на биографию:
+                [(имя, категория), ...]}, количество загруженных и неудавшихся страниц.
+        """
+        pages = 0
+        failed = 0
+
+        self.fetch_categories(categories_url)
+        pages += 1
+        wanted = set(categories) if categories is not None else None
+        category_links = [link for link in self.categories_links
+                          if wanted is None or link.split('/')[4] in wanted]
+
+        futures = {executor.submit(self.get_every_person, link): link for link in category_links}
+        for future in as_completed(futures):
+            link = futures[future]
+            try:
+                people = future.result()
+            except requests.RequestException as e:
+                failed += 1
+                logger.error(f"Category {link} failed: {str(e)}")
+                continue
+            pages += 1
+            self.category_people.setdefault(link.split('/')[4], []).extend(people)
+
+        # Человек может быть в нескольких категориях: страница загружается один раз
+        entries: Dict[str, List[Tuple[str, str]]] = {}
+        for category, people in self.category_people.items():
+            for person, link in people:
+                entries.setdefault(link, []).append((person, category))
+        return entries, pages, failed
+
+    def crawl(self, categories_url: str, output_path: str, checkpoint_path: Optional[str] = None,
+              categories: Optional[Iterable[str]] = None, workers: int = 8) -> Dict[str, float]:
+        """Параллельный обход с потоковой записью результата и возобновлением после остановки.
+
+        Страницы категорий и биографий загружаются в пуле из workers потоков. Каждая
+        биография записывается в output_path сразу после загрузки, а её URL — в
+        контрольную точку; при повторном запуске с той же контрольной точкой уже
+        обработанные страницы пропускаются. Строка пишется до отметки в контрольной
+        точке, поэтому после аварийной остановки страница может попасть в файл дважды.
+        Страницы без текста биографии не записываются. Страницы, которые не загрузились
+        или ответили ошибкой HTTP (в том числе 429 и 5xx после всех повторов),
+        считаются неудавшимися и не отмечаются в контрольной точке.
+
+        Args:
+            categories_url (str): URL страницы с категориями.
+            output_path (str): Выходной файл .csv или .jsonl.
+            checkpoint_path (Optional[str]): Файл контрольной точки; None — без возобновления.
+            categories (Optional[Iterable[str]]): Обходимые категории; None — все.
+            workers (int): Количество потоков загрузки.
+
+        Returns:
+            Dict[str, float]: Загруженные, пропущенные и неудавшиеся страницы,
+                время обхода и скорость в страницах в секунду.
+        """
+        start = time.perf_counter()
+
+        with ThreadPoolExecutor(max_workers=workers) as executor:
+            entries, pages, failed = self._collect_entries(categories_url, categories, executor)
+
+            checkpoint = Checkpoint(checkpoint_path) if checkpoint_path else None
+            writer = RowWriter(output_path)
+            todo = [link for link in entries if checkpoint is None or link not in checkpoint]
+            skipped = len(entries) - len(todo)
+            try:
+                futures = {executor.submit(self.get_person_text, link): link for link in todo}
+                progress = tqdm(as_completed(futures), desc="Сбор данных", total=len(futures))
+                for future in progress:
+                    link = futures[future]
+                    try:
+                        biography = future.result()
+                    except requests.RequestException as e:
+                        # Страница не отмечается в контрольной точке и загрузится при следующем запуске
+                        failed += 1
+                        logger.error(f"Page {link} failed: {str(e)}")
+                        continue
+                    pages += 1
+                    if biography != NOT_FOUND_TEXT:
+                        for person, category in entries[link]:
+                            writer.write({'Person': person, 'Category': category, 'Text': biography, 'Link': link})
+                    if checkpoint is not None:
+                        checkpoint.add(link)
+                    progress.set_postfix(pages_per_s=f"{pages / (time.perf_counter() - start):.1f}")
+            finally:
+                writer.close()
+                if checkpoint is not None:
+                    checkpoint.close()
+
+        elapsed = time.perf_counter() - start
+        stats = {'pages': pages, 'skipped': skipped, 'failed': failed, 'elapsed': elapsed,
+                 'pages_per_second': pages / elapsed if elapsed else 0.0}
+        logger.info(f"Crawl finished: {stats}")
+        return stats
+
+    def _fetch_if_changed(self, url: str, previous: Optional[Dict]) -> Tuple[str, Dict]:
+        """Условный запрос страницы биографии; текст извлекается только из изменившейся страницы.
+
+        Args:
+            url (str): URL страницы.
+            previous (Optional[Dict]): Сохранённая запись страницы из RecrawlStore.
+
+        Returns:
+            Tuple[str, Dict]: Статус ('not_modified' — ответ 304, 'same' — содержимое
+                с тем же хэшем, 'fetched' — новое содержимое, 'gone' — ответ 404 или 410)
+                и валидаторы с хэшем ('text' — только для 'fetched').
 
-df = df[df['Text'] != "Элемент с id 'summury_text' не найден."]
-df = df.drop_duplicates()
-df = df[df['Category'].isin(['iskusstvo', 'obshhestvo-kultura-obrazovanie'])]
+        Raises:
+            requests.RequestException: Страница не загружена или ответ — другая ошибка HTTP
+                (в том числе 429 и 5xx после всех повторов).
+        """
+        headers = {}
+        if previous is not None:
+            if previous['etag']:
+                headers['If-None-Match'] = previous['etag']
+            if previous['last_modified']:
+                headers['If-Modified-Since'] = previous['last_modified']
+
+        response = self.get(url, headers=headers)
+        if response.status_code == 304 and previous is not None:
+            return 'not_modified', {key: previous[key] for key in ('etag', 'last_modified', 'content_hash')}
+        if response.status_code in GONE_STATUSES:
+            return 'gone', {'etag': None, 'last_modified': None, 'content_hash': None}
+        if response.status_code != 200:
+            raise requests.HTTPError(f"{response.status_code} Error for url: {url}", response=response)
+
+        data = {
+            'etag': response.headers.get('ETag'),
+            'last_modified': response.headers.get('Last-Modified'),
+            'content_hash': hashlib.sha256(response.content).hexdigest(),
+        }
+        if previous is not None and previous['content_hash'] == data['content_hash']:
+            return 'same', data
+        data['text'] = self.extract_person_text(response.text)
+        return 'fetched', data
+
+    def recrawl(self, categories_url: str, store_path: str, delta_path: str,
+                categories: Optional[Iterable[str]] = None, workers: int = 8) -> Dict[str, float]:
+        """Инкрементальный обход: в delta_path попадают только добавленные, изменённые и удалённые биографии.
+
+        Для каждой страницы в RecrawlStore хранятся ETag, Last-Modified и хэш
+        содержимого. Страницы запрашиваются условно (If-None-Match, If-Modified-Since);
+        ответ 304 и содержимое с прежним хэшем не разбираются. Строки дельты в
+        формате JSONL или CSV имеют поле op: 'added' и 'changed' — по строке на
+        каждую категорию человека (строки 'changed' заменяют все прежние строки с
+        той же ссылкой), 'removed' — одна строка со ссылкой. Страница удаляется,
+        если пропала из списков категорий, отвечает 404 или 410 или больше не содержит
+        биографии. Страницы, ответившие другой ошибкой (в том числе 429 и 5xx после
+        всех повторов), считаются неудавшимися и сохраняют прежнее состояние; при
+        ошибке загрузки какой-либо категории удаления не определяются. Состояние
+        фиксируется в базе только после записи всей дельты, поэтому прерванный
+        обход можно просто запустить заново.
+
+        Args:
+            categories_url (str): URL страницы с категориями.
+            store_path (str): Файл базы SQLite с состоянием обхода.
+            delta_path (str): Выходной файл дельты .jsonl или .csv (перезаписывается).
+            categories (Optional[Iterable[str]]): Обходимые категории; None — все.
+            workers (int): Количество потоков загрузки.
 
-df.to_csv('biographies.csv')
\ No newline at end of file
+        Returns:
+            Dict[str, float]: Количество добавленных, изменённых, неизменённых, удалённых
+                и неудавшихся страниц, время обхода и скорость в страницах в секунду.
+        """
+        start = time.perf_counter()
+        store = RecrawlStore(store_path)
+        previous = store.load()
+        counts = {'added': 0, 'changed': 0, 'unchanged': 0, 'removed': 0}
+        writer = RowWriter(delta_path, fields=DELTA_FIELDS, append=False)
+
+        try:
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                entries, pages, failed = self._collect_entries(categories_url, categories, executor)
+                listing_complete = failed == 0
+
+                futures = {executor.submit(self._fetch_if_changed, link, previous.get(link)): link for link in entries}
+                progress = tqdm(as_completed(futures), desc="Проверка изменений", total=len(futures))
+                for future in progress:
+                    link = futures[future]
+                    try:
+                        status, data = future.result()
+                    except requests.RequestException as e:
+                        failed += 1
+                        logger.error(f"Page {link} failed: {str(e)}")
+                        continue
+                    pages += 1
+
+                    old = previous.get(link)
+                    person = entries[link][0][0]
+                    page_categories = sorted({category for _, category in entries[link]})
+                    if status == 'fetched':
+                        text = data.pop('text')
+                        text = text if text != NOT_FOUND_TEXT else None
+                    elif status == 'gone':
+                        text = None
+                    else:
+                        text = old['text']
+                    store.save(link, {**data, 'person': person, 'categories': page_categories, 'text': text})
+
+                    had_text = old is not None and old['text'] is not None
+                    if text is None:
+                        op = 'removed' if had_text else None
+                    elif not had_text:
+                        op = 'added'
+                    elif (text, person, page_categories) != (old['text'], old['person'], old['categories']):
+                        op = 'changed'
+                    else:
+                        op = None
+
+                    if op == 'removed':
+                        writer.write({'op': op, 'Person': old['person'], 'Category': '', 'Text': '', 'Link': link})
+                    elif op is not None:
+                        for category in page_categories:
+                            writer.write({'op': op, 'Person': person, 'Category': category, 'Text': text, 'Link': link})
+                    counts[op or 'unchanged'] += 1
+                    progress.set_postfix(pages_per_s=f"{pages / (time.perf_counter() - start):.1f}")
+
+            if listing_complete:
+                wanted = set(categories) if categories is not None else None
+                for link, old in previous.items():
+                    if link in entries or (wanted is not None and not wanted & set(old['categories'])):
+                        continue
+                    store.delete(link)
+                    if old['text'] is not None:
+                        writer.write({'op': 'removed', 'Person': old['person'], 'Category': '', 'Text': '', 'Link': link})
+                        counts['removed'] += 1
+        finally:
+            writer.close()
+        store.close()
+
+        elapsed = time.perf_counter() - start
+        stats = {**counts, 'pages': pages, 'failed': failed, 'elapsed': elapsed, 'pages_per_second': pages / elapsed if elapsed else 0.0}
+        logger.info(f"Recrawl finished: {stats}")
+        return stats
+
+
+def main() -> None:
+    """Точка входа: последовательный обход в biographies.csv, параллельный с потоковой записью или инкрементальный."""
+    parser = argparse.ArgumentParser(description="Crawl biographies from obrazovaka.ru.")
+    parser.add_argument('--base-url', default='https://obrazovaka.ru')
+    parser.add_argument('--categories', nargs='*', default=['iskusstvo', 'obshhestvo-kultura-obrazovanie'],
+                        help="Categories to keep (none given means all).")
+    parser.add_argument('--concurrent', action='store_true', help="Crawl with a thread pool and stream rows.")
+    parser.add_argument('--output', default='biographies.csv', help="Output .csv or .jsonl file.")
+    parser.add_argument('--checkpoint', default='crawler_checkpoint.txt', help="Fetched URLs, for resuming.")
+    parser.add_argument('--recrawl', action='store_true', help="Fetch only changed pages and write a delta file.")
+    parser.add_argument('--store', default='crawler_state.sqlite', help="Recrawl state (validators, hashes).")
+    parser.add_argument('--delta', default='delta.jsonl', help="Recrawl output .jsonl or .csv file.")
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--rate', type=float, default=10, help="Max requests per second per host (0 = unlimited).")
+    parser.add_argument('--retries', type=int, default=3)
+    parser.add_argument('--extractor', choices=['stream', 'bs4'], default='stream')
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    crawler = BiographiesCrawler(base_url=args.base_url, rate=args.rate, retries=args.retries,
+                                 extractor=args.extractor)
+    categories_url = urljoin(args.base_url, '/biografii')
+
+    if args.concurrent:
+        stats = crawler.crawl(categories_url, args.output, checkpoint_path=args.checkpoint,
+                              categories=args.categories or None, workers=args.workers)
+        print(f"{stats['pages']} pages in {stats['elapsed']:.1f} s ({stats['pages_per_second']:.1f} pages/s), "
+              f"skipped {stats['skipped']}, failed {stats['failed']}")
+        return
+
+    if args.recrawl:
+        stats = crawler.recrawl(categories_url, args.store, args.delta,
+                                categories=args.categories or None, workers=args.workers)
+        print(f"added {stats['added']}, changed {stats['changed']}, removed {stats['removed']}, "
+              f"unchanged {stats['unchanged']}, failed {stats['failed']} in {stats['elapsed']:.1f} s")
+        return
+
+    df = crawler.scrape(categories_url)
+
+    df = df[df['Text'] != NOT_FOUND_TEXT]
+    df = df.drop_duplicates()
+    if args.categories:
+        df = df[df['Category'].isin(args.categories)]
+
+    df.to_csv(args.output)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,6 +1,13 @@
 from information_retrieval import InformationRetrieval
+from app.config import CONFIG
 
-ir = InformationRetrieval('new_biographies.csv')
+if __name__ == '__main__':
+    # Защита нужна для пула процессов предобработки на платформах со spawn
+    ir = InformationRetrieval('new_biographies.csv', n_jobs=CONFIG.PREPROCESS_WORKERS,
+                              document_store_dir=CONFIG.DOCUMENT_STORE_DIR or None,
+                              embedding_store_dir=CONFIG.EMBEDDING_STORE_DIR or None)
 
-ir.index_tfidf()
-ir.index_bert()
\ No newline at end of file
+    ir.index_documents()
+    ir.index_tfidf()
+    ir.index_bm25()
+    ir.index_bert(storage=CONFIG.BERT_STORAGE)
\ No newline at end of file
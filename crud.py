@@ -1,7 +1,13 @@
 import pymysql
+import sqlite3
 import pandas as pd
 import argparse
-from typing import List, Dict
+import threading
+import time
+from datetime import datetime
+from typing import Callable, Iterable, List, Dict, Optional, Tuple
+from app.config import CONFIG
+from db_pool import ConnectionPool
 
 # Настройки подключения к базе данных
 DB_CONFIG = {
@@ -20,6 +26,47 @@ def create_connection():
         database=DB_CONFIG['database']
     )
 
+_pool: Optional[ConnectionPool] = None
+_pool_lock = threading.Lock()
+
+def get_pool() -> ConnectionPool:
+    """Возвращает общий пул подключений, создавая его при первом обращении."""
+    global _pool
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ConnectionPool(
+                    create_connection,
+                    size=CONFIG.DB_POOL_SIZE,
+                    recycle=CONFIG.DB_POOL_RECYCLE,
+                    timeout=CONFIG.DB_POOL_TIMEOUT,
+                    pre_ping=CONFIG.DB_POOL_PRE_PING
+                )
+    return _pool
+
+# Подписчики на изменения данных персон (например, поисковый индекс сервера)
+_change_listeners: List[Callable[[str, int, Dict[str, str]], None]] = []
+
+def add_change_listener(listener: Callable[[str, int, Dict[str, str]], None]) -> None:
+    """Регистрирует функцию, вызываемую после изменения данных персоны.
+
+    Args:
+        listener (Callable[[str, int, Dict[str, str]], None]): Функция listener(action, person_id, fields),
+            где action — 'insert', 'update' или 'delete', fields — значения 'name', 'text', 'link'
+            и 'category' для 'insert' и 'update' и пустой словарь для 'delete'.
+
+    Подписчики вызываются только в процессе, который изменил данные: сервер
+    регистрирует свой поисковый индекс, поэтому изменения, сделанные через его API,
+    сразу попадают в поиск, а изменения из командной строки crud.py — только после
+    перестроения индексов (create_indexes.py).
+    """
+    _change_listeners.append(listener)
+
+def _notify_change(action: str, person_id: int, fields: Dict[str, str]) -> None:
+    """Сообщает подписчикам об изменении данных персоны после фиксации транзакции."""
+    for listener in _change_listeners:
+        listener(action, person_id, fields)
+
 def insert_data(file_path: str) -> None:
     """Вставляет данные из CSV файла в базу данных.
 
@@ -27,23 +74,79 @@ def insert_data(file_path: str) -> None:
         file_path (str): Путь к CSV файлу.
     """
     df = pd.read_csv(file_path)
-    connection = create_connection()
-    cursor = connection.cursor()
+    with get_pool().connection() as connection:
+        cursor = connection.cursor()
 
-    for _, row in df.iterrows():
-        cursor.execute("INSERT IGNORE INTO Person (name) VALUES (%s)", (row['Person'],))
-        cursor.execute("SELECT id FROM Person WHERE name = %s", (row['Person'],))
-        person_id = cursor.fetchone()[0]
+        for _, row in df.iterrows():
+            cursor.execute("INSERT IGNORE INTO Person (name) VALUES (%s)", (row['Person'],))
+            cursor.execute("SELECT id FROM Person WHERE name = %s", (row['Person'],))
+            person_id = cursor.fetchone()[0]
 
-        cursor.execute("INSERT INTO Biography (person_id, text, link) VALUES (%s, %s, %s)",
-                       (person_id, row['Text'], row['Link']))
+            cursor.execute("INSERT INTO Biography (person_id, text, link) VALUES (%s, %s, %s)",
+                           (person_id, row['Text'], row['Link']))
 
-        cursor.execute("INSERT INTO Categories (person_id, name) VALUES (%s, %s)",
-                       (person_id, row['Category']))
+            cursor.execute("INSERT INTO Categories (person_id, name) VALUES (%s, %s)",
+                           (person_id, row['Category']))
 
-    connection.commit()
-    cursor.close()
-    connection.close()
+        connection.commit()
+        cursor.close()
+
+def insert_data_bulk(file_path: str, chunk_size: int = 5000) -> int:
+    """Вставляет данные из CSV файла в базу данных пакетами.
+
+    CSV читается частями по chunk_size строк, каждая часть загружается одной
+    транзакцией: новые имена вставляются одним executemany, id персон всей
+    части выбираются одним запросом с IN (...), биографии и категории
+    вставляются многострочными INSERT. Порядок вставки тот же, что у insert_data,
+    поэтому содержимое таблиц и id биографий и категорий совпадают. id новых
+    персон могут отличаться только пропусками: insert_data выполняет INSERT IGNORE
+    для каждой строки и может расходовать значения AUTO_INCREMENT на повторах имён.
+
+    Args:
+        file_path (str): Путь к CSV файлу.
+        chunk_size (int): Количество строк CSV в одной транзакции.
+
+    Returns:
+        int: Количество загруженных строк.
+    """
+    start_time = time.time()
+    total_rows = 0
+
+    with get_pool().connection() as connection:
+        cursor = connection.cursor()
+
+        for chunk in pd.read_csv(file_path, chunksize=chunk_size):
+            names = list(dict.fromkeys(chunk['Person']))
+            marker = ', '.join(['%s'] * len(names))
+
+            # Вставляются только имена, которых ещё нет, в порядке первого появления
+            cursor.execute(f"SELECT name FROM Person WHERE name IN ({marker})", names)
+            existing = {row[0] for row in cursor.fetchall()}
+            cursor.executemany("INSERT IGNORE INTO Person (name) VALUES (%s)",
+                               [(name,) for name in names if name not in existing])
+
+            cursor.execute(f"SELECT id, name FROM Person WHERE name IN ({marker})", names)
+            person_ids = {name: person_id for person_id, name in cursor.fetchall()}
+            for name in names:
+                if name not in person_ids:
+                    # Имя совпало с существующим только по правилам сравнения (collation) MySQL
+                    cursor.execute("SELECT id FROM Person WHERE name = %s", (name,))
+                    person_ids[name] = cursor.fetchone()[0]
+
+            ids = [person_ids[name] for name in chunk['Person']]
+            cursor.executemany("INSERT INTO Biography (person_id, text, link) VALUES (%s, %s, %s)",
+                               list(zip(ids, chunk['Text'], chunk['Link'])))
+            cursor.executemany("INSERT INTO Categories (person_id, name) VALUES (%s, %s)",
+                               list(zip(ids, chunk['Category'])))
+            connection.commit()
+
+            total_rows += len(chunk)
+            elapsed = time.time() - start_time
+            print(f"Inserted {total_rows} rows, {total_rows / elapsed:.0f} rows/s")
+
+        cursor.close()
+
+    return total_rows
 
 def read_data(person_id: int) -> Dict[str, str]:
     """Читает данные о персоне по ID.
@@ -54,44 +157,132 @@ def read_data(person_id: int) -> Dict[str, str]:
     Returns:
         Dict[str, str]: Словарь с данными о персоне.
     """
-    connection = create_connection()
+    with get_pool().connection() as connection:
+        cursor = connection.cursor()
+
+        cursor.execute("SELECT * FROM Person WHERE id = %s", (person_id,))
+        person = cursor.fetchone()
+
+        if person:
+            person_data = {
+                'id': person[0],
+                'name': person[1],
+                'biographies': [],
+                'categories': []
+            }
+
+            cursor.execute("SELECT * FROM Biography WHERE person_id = %s", (person_id,))
+            biographies = cursor.fetchall()
+            for bio in biographies:
+                person_data['biographies'].append({
+                    'id': bio[0],
+                    'text': bio[2],
+                    'link': bio[3]
+                })
+
+            cursor.execute("SELECT * FROM Categories WHERE person_id = %s", (person_id,))
+            categories = cursor.fetchall()
+            for category in categories:
+                person_data['categories'].append({
+                    'id': category[0],
+                    'name': category[2]
+                })
+
+            cursor.close()
+            return person_data
+        else:
+            cursor.close()
+            return {}
+
+def _placeholder(connection) -> str:
+    """Возвращает маркер параметра запроса для драйвера подключения (pymysql или sqlite3)."""
+    return '?' if isinstance(connection, sqlite3.Connection) else '%s'
+
+def read_data_many(person_ids: Iterable[int], connection: Optional[object] = None) -> List[Dict[str, str]]:
+    """Читает данные о нескольких персонах одним запросом.
+
+    Персоны, биографии и категории выбираются одним LEFT JOIN с условием IN (...)
+    вместо трёх запросов и отдельного подключения на каждую персону.
+
+    Args:
+        person_ids (Iterable[int]): ID персон в порядке ранжирования; повторы допускаются.
+        connection (Optional[object]): Открытое подключение (pymysql или sqlite3). Если не задано,
+            берётся подключение из общего пула.
+
+    Returns:
+        List[Dict[str, str]]: Данные о персонах в том же порядке, что и person_ids,
+            в формате read_data; для отсутствующих персон — пустой словарь.
+    """
+    person_ids = [int(person_id) for person_id in person_ids]
+    unique_ids = list(dict.fromkeys(person_ids))
+    if not unique_ids:
+        return []
+
+    if connection is None:
+        with get_pool().connection() as connection:
+            return read_data_many(person_ids, connection)
+
     cursor = connection.cursor()
 
-    cursor.execute("SELECT * FROM Person WHERE id = %s", (person_id,))
-    person = cursor.fetchone()
-
-    if person:
-        person_data = {
-            'id': person[0],
-            'name': person[1],
-            'biographies': [],
-            'categories': []
-        }
-
-        cursor.execute("SELECT * FROM Biography WHERE person_id = %s", (person_id,))
-        biographies = cursor.fetchall()
-        for bio in biographies:
-            person_data['biographies'].append({
-                'id': bio[0],
-                'text': bio[2],
-                'link': bio[3]
-            })
-
-        cursor.execute("SELECT * FROM Categories WHERE person_id = %s", (person_id,))
-        categories = cursor.fetchall()
-        for category in categories:
-            person_data['categories'].append({
-                'id': category[0],
-                'name': category[2]
-            })
+    marker = _placeholder(connection)
+    cursor.execute(
+        "SELECT p.id, p.name, b.id, b.text, b.link, c.id, c.name "
+        "FROM Person p "
+        "LEFT JOIN Biography b ON b.person_id = p.id "
+        "LEFT JOIN Categories c ON c.person_id = p.id "
+        f"WHERE p.id IN ({', '.join([marker] * len(unique_ids))}) "
+        "ORDER BY p.id, b.id, c.id",
+        unique_ids
+    )
+    rows = cursor.fetchall()
+    cursor.close()
 
+    # JOIN двух таблиц повторяет биографии и категории, поэтому они собираются по id
+    people = {}
+    for person_id, name, bio_id, bio_text, bio_link, category_id, category_name in rows:
+        person = people.setdefault(person_id, {'id': person_id, 'name': name, 'biographies': {}, 'categories': {}})
+        if bio_id is not None:
+            person['biographies'].setdefault(bio_id, {'id': bio_id, 'text': bio_text, 'link': bio_link})
+        if category_id is not None:
+            person['categories'].setdefault(category_id, {'id': category_id, 'name': category_name})
+
+    for person in people.values():
+        person['biographies'] = list(person['biographies'].values())
+        person['categories'] = list(person['categories'].values())
+
+    return [people.get(person_id, {}) for person_id in person_ids]
+
+def create_person(name: str, bio_text: str, link: str, category: str) -> int:
+    """Добавляет персону с биографией и категорией.
+
+    Если персона с таким именем уже есть, биография и категория добавляются к ней.
+
+    Args:
+        name (str): Имя персоны.
+        bio_text (str): Текст биографии.
+        link (str): Ссылка на биографию.
+        category (str): Категория.
+
+    Returns:
+        int: ID персоны.
+    """
+    with get_pool().connection() as connection:
+        cursor = connection.cursor()
+
+        cursor.execute("INSERT IGNORE INTO Person (name) VALUES (%s)", (name,))
+        cursor.execute("SELECT id FROM Person WHERE name = %s", (name,))
+        person_id = cursor.fetchone()[0]
+
+        cursor.execute("INSERT INTO Biography (person_id, text, link) VALUES (%s, %s, %s)",
+                       (person_id, bio_text, link))
+        cursor.execute("INSERT INTO Categories (person_id, name) VALUES (%s, %s)",
+                       (person_id, category))
+
+        connection.commit()
         cursor.close()
-        connection.close()
-        return person_data
-    else:
-        cursor.close()
-        connection.close()
-        return {}
+
+    _notify_change('insert', person_id, {'name': name, 'text': bio_text, 'link': link, 'category': category})
+    return person_id
 
 def update_data(person_id: int, new_name: str, new_bio_text: str, new_link: str, new_category: str) -> None:
     """Обновляет данные персоны и связанные с ней записи.
@@ -103,23 +294,25 @@ def update_data(person_id: int, new_name: str, new_bio_text: str, new_link: str,
         new_link (str): Новый линк для биографии.
         new_category (str): Новая категория для персоны.
     """
-    connection = create_connection()
-    cursor = connection.cursor()
+    with get_pool().connection() as connection:
+        cursor = connection.cursor()
 
-    # Обновляем имя в таблице Person
-    cursor.execute("UPDATE Person SET name = %s WHERE id = %s", (new_name, person_id))
+        # Обновляем имя в таблице Person
+        cursor.execute("UPDATE Person SET name = %s WHERE id = %s", (new_name, person_id))
 
-    # Обновляем биографию
-    cursor.execute("UPDATE Biography SET text = %s, link = %s WHERE person_id = %s",
-                   (new_bio_text, new_link, person_id))
+        # Обновляем биографию
+        cursor.execute("UPDATE Biography SET text = %s, link = %s WHERE person_id = %s",
+                       (new_bio_text, new_link, person_id))
 
-    # Обновляем категорию
-    cursor.execute("UPDATE Categories SET name = %s WHERE person_id = %s",
-                   (new_category, person_id))
+        # Обновляем категорию
+        cursor.execute("UPDATE Categories SET name = %s WHERE person_id = %s",
+                       (new_category, person_id))
 
-    connection.commit()
-    cursor.close()
-    connection.close()
+        connection.commit()
+        cursor.close()
+
+    _notify_change('update', person_id, {'name': new_name, 'text': new_bio_text, 'link': new_link,
+                                         'category': new_category})
 
 def delete_data(person_id: int) -> None:
     """Удаляет персону и связанные с ней данные по ID.
@@ -127,42 +320,101 @@ def delete_data(person_id: int) -> None:
     Args:
         person_id (int): ID персоны.
     """
-    connection = create_connection()
-    cursor = connection.cursor()
+    with get_pool().connection() as connection:
+        cursor = connection.cursor()
 
-    cursor.execute("DELETE FROM Categories WHERE person_id = %s", (person_id,))
-    cursor.execute("DELETE FROM Biography WHERE person_id = %s", (person_id,))
-    cursor.execute("DELETE FROM Person WHERE id = %s", (person_id,))
+        cursor.execute("DELETE FROM Categories WHERE person_id = %s", (person_id,))
+        cursor.execute("DELETE FROM Biography WHERE person_id = %s", (person_id,))
+        cursor.execute("DELETE FROM Person WHERE id = %s", (person_id,))
 
-    connection.commit()
-    cursor.close()
-    connection.close()
+        connection.commit()
+        cursor.close()
+
+    _notify_change('delete', person_id, {})
 
 def save_query(query_text: str, method: str, query_link: str) -> None:
     """Сохраняет запрос пользователя и метод в таблицу Query."""
-    connection = create_connection()
-    cursor = connection.cursor()
+    with get_pool().connection() as connection:
+        cursor = connection.cursor()
 
-    cursor.execute("INSERT INTO Query (query_text, method, query_link) VALUES (%s, %s, %s)",
-                   (query_text, method, query_link))
+        cursor.execute("INSERT INTO Query (query_text, method, query_link) VALUES (%s, %s, %s)",
+                       (query_text, method, query_link))
 
-    connection.commit()
-    cursor.close()
-    connection.close()
+        connection.commit()
+        cursor.close()
+
+def save_queries(records: List[Tuple[str, str, str, Optional[float], datetime]]) -> None:
+    """Сохраняет пакет запросов в таблицу Query одним многострочным INSERT.
+
+    Args:
+        records (List[Tuple[str, str, str, Optional[float], datetime]]): Записи
+            (текст запроса, метод, ссылка, время поиска в секундах, время запроса).
+    """
+    if not records:
+        return
+
+    with get_pool().connection() as connection:
+        cursor = connection.cursor()
+
+        cursor.executemany("INSERT INTO Query (query_text, method, query_link, latency, created_at) "
+                           "VALUES (%s, %s, %s, %s, %s)", records)
+
+        connection.commit()
+        cursor.close()
 
 def get_saved_queries() -> List[Dict[str, str]]:
     """Читает все запросы из таблицы Query."""
-    connection = create_connection()
-    cursor = connection.cursor()
+    with get_pool().connection() as connection:
+        cursor = connection.cursor()
 
-    cursor.execute("SELECT * FROM Query")
-    queries = cursor.fetchall()
+        cursor.execute("SELECT * FROM Query")
+        queries = cursor.fetchall()
 
-    cursor.close()
-    connection.close()
+        cursor.close()
 
     return [{'id': q[0], 'query_text': q[1], 'method': q[2], 'query_link': q[3]} for q in queries]
 
+def get_top_queries(limit: int = 50, order_by: str = 'recent') -> List[Dict[str, object]]:
+    """Читает уникальные запросы из таблицы Query, сгруппированные по ссылке.
+
+    Группировка, подсчёт и отбор выполняются в базе данных (по индексу на query_link),
+    поэтому объём чтения ограничен limit строками независимо от размера таблицы.
+    Текст и метод берутся из первой записи с этой ссылкой.
+
+    Args:
+        limit (int): Максимальное количество запросов.
+        order_by (str): 'recent' — сначала последние, 'frequent' — сначала частые.
+
+    Returns:
+        List[Dict[str, object]]: Запросы с количеством повторов и временем последнего.
+    """
+    orderings = {
+        'recent': "last_id DESC",
+        'frequent': "hits DESC, last_id DESC",
+    }
+    if order_by not in orderings:
+        raise ValueError(f"Unknown order: {order_by}")
+    ordering = orderings[order_by]
+
+    with get_pool().connection() as connection:
+        cursor = connection.cursor()
+        marker = _placeholder(connection)
+
+        cursor.execute(
+            "SELECT q.id, q.query_text, q.method, q.query_link, g.hits, g.last_seen "
+            "FROM (SELECT query_link, MIN(id) AS first_id, MAX(id) AS last_id, "
+            "COUNT(*) AS hits, MAX(created_at) AS last_seen "
+            f"FROM Query GROUP BY query_link ORDER BY {ordering} LIMIT {marker}) AS g "
+            f"JOIN Query AS q ON q.id = g.first_id ORDER BY {ordering}",
+            (limit,)
+        )
+        queries = cursor.fetchall()
+
+        cursor.close()
+
+    return [{'id': q[0], 'query_text': q[1], 'method': q[2], 'query_link': q[3], 'count': q[4], 'last_seen': q[5]}
+            for q in queries]
+
 def main() -> None:
     """Главная функция для обработки аргументов командной строки."""
     parser = argparse.ArgumentParser(description="Insert data into the database.")
@@ -173,11 +425,15 @@ def main() -> None:
     parser.add_argument('--bio', type=str, help='New biography text for updating')
     parser.add_argument('--link', type=str, help='New biography link for updating')
     parser.add_argument('--category', type=str, help='New category name for updating')
+    parser.add_argument('--bulk', action='store_true', help='Use batched bulk loading for insertion')
+    parser.add_argument('--chunk-size', type=int, default=5000, help='CSV rows per transaction for bulk insertion')
 
     args = parser.parse_args()
 
     if args.action == 'insert':
-        if args.file:
+        if args.file and args.bulk:
+            insert_data_bulk(args.file, args.chunk_size)
+        elif args.file:
             insert_data(args.file)
         else:
             print("File path is required for insert action.")
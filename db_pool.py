@@ -0,0 +1,124 @@
+import time
+import queue
+import threading
+from contextlib import contextmanager
+from typing import Any, Callable, Iterator, Tuple
+
+
+class PoolTimeout(Exception):
+    """За отведённое время в пуле не освободилось ни одного подключения."""
+
+
+class ConnectionPool:
+    """
+    Потокобезопасный пул подключений к базе данных.
+
+    Подключения создаются по мере надобности, но не больше size одновременно;
+    свободные хранятся в стеке (последнее возвращённое выдаётся первым, чтобы
+    редко используемые подключения дольше простаивали и закрывались по recycle).
+    Перед выдачей подключение старше recycle секунд пересоздаётся, а остальные
+    проверяются ping(), если драйвер его поддерживает. При возврате открытая
+    транзакция откатывается, чтобы следующий пользователь не видел старый снимок данных.
+    """
+
+    def __init__(self, connect: Callable[[], Any], size: int = 5, recycle: float = 3600,
+                 timeout: float = 30, pre_ping: bool = True) -> None:
+        """
+        Инициализация пула.
+
+        Args:
+            connect (Callable[[], Any]): Функция, создающая новое подключение.
+            size (int): Максимальное количество подключений.
+            recycle (float): Время жизни подключения в секундах; 0 — без ограничения.
+            timeout (float): Время ожидания свободного подключения в секундах.
+            pre_ping (bool): Проверять ли подключение перед выдачей.
+        """
+        self.connect = connect
+        self.size = size
+        self.recycle = recycle
+        self.timeout = timeout
+        self.pre_ping = pre_ping
+        self._idle: 'queue.LifoQueue[Tuple[Any, float]]' = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+
+    @contextmanager
+    def connection(self) -> Iterator[Any]:
+        """
+        Выдача подключения на время блока with.
+
+        Yields:
+            Any: Подключение к базе данных.
+
+        Raises:
+            PoolTimeout: Все подключения заняты дольше timeout секунд.
+        """
+        if not self._slots.acquire(timeout=self.timeout):
+            raise PoolTimeout(f"Нет свободных подключений в пуле ({self.size}) за {self.timeout} с")
+        try:
+            connection, created_at = self._checkout()
+        except BaseException:
+            self._slots.release()
+            raise
+
+        try:
+            yield connection
+        finally:
+            self._checkin(connection, created_at)
+
+    def _checkout(self) -> Tuple[Any, float]:
+        """
+        Свободное подключение из пула или новое.
+
+        Returns:
+            Tuple[Any, float]: Подключение и время его создания.
+        """
+        while True:
+            try:
+                connection, created_at = self._idle.get_nowait()
+            except queue.Empty:
+                return self.connect(), time.monotonic()
+            if self.recycle and time.monotonic() - created_at > self.recycle:
+                self._close(connection)
+                continue
+            if self.pre_ping and hasattr(connection, 'ping'):
+                try:
+                    connection.ping(reconnect=False)
+                except Exception:
+                    self._close(connection)
+                    continue
+            return connection, created_at
+
+    def _checkin(self, connection: Any, created_at: float) -> None:
+        """
+        Возврат подключения в пул с откатом незавершённой транзакции.
+
+        Args:
+            connection (Any): Подключение.
+            created_at (float): Время его создания.
+        """
+        try:
+            connection.rollback()
+        except Exception:
+            # Сломанное подключение не возвращается в пул
+            self._close(connection)
+        else:
+            self._idle.put((connection, created_at))
+        finally:
+            self._slots.release()
+
+    @staticmethod
+    def _close(connection: Any) -> None:
+        """Закрытие подключения без выброса исключений."""
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    def close_all(self) -> None:
+        """Закрытие всех свободных подключений."""
+        while True:
+            try:
+                connection, _ = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            self._close(connection)
@@ -0,0 +1,169 @@
+import os
+import mmap
+import numpy as np
+import pandas as pd
+from typing import Iterable, List, Tuple, Union
+from atomic_io import replacing, save_npy
+
+
+class StringColumn:
+    """
+    Столбец строк в компактном виде: все строки в UTF-8 подряд в одном буфере
+    и массив смещений (n + 1,) начал строк. Строка i — blob[offsets[i]:offsets[i + 1]].
+
+    Буфер может быть байтовой строкой в памяти или отображением файла (mmap):
+    тогда в память читаются только страницы запрошенных строк.
+    """
+
+    def __init__(self, offsets: np.ndarray, blob: Union[bytes, mmap.mmap]) -> None:
+        """
+        :param offsets: Смещения начал строк в буфере, последний элемент — длина буфера.
+        :param blob: Буфер со строками в UTF-8.
+        """
+        self.offsets = offsets
+        self.blob = blob
+
+    @classmethod
+    def from_strings(cls, values: Iterable) -> 'StringColumn':
+        """
+        Построение столбца по последовательности строк; пропуски (None, NaN) становятся пустыми строками.
+
+        :param values: Строки.
+        :return: Столбец.
+        """
+        encoded = [value.encode('utf-8') if isinstance(value, str) else
+                   ('' if pd.isna(value) else str(value)).encode('utf-8') for value in values]
+        offsets = np.zeros(len(encoded) + 1, dtype=np.int64)
+        np.cumsum([len(value) for value in encoded], out=offsets[1:])
+        return cls(offsets, b''.join(encoded))
+
+    def __len__(self) -> int:
+        return len(self.offsets) - 1
+
+    def __getitem__(self, i: int) -> str:
+        return self.blob[self.offsets[i]:self.offsets[i + 1]].decode('utf-8')
+
+    def take(self, indices: np.ndarray) -> List[str]:
+        """
+        Строки по номерам.
+
+        :param indices: Номера строк.
+        :return: Список строк в порядке номеров.
+        """
+        starts = self.offsets[indices].tolist()
+        ends = self.offsets[np.asarray(indices) + 1].tolist()
+        return [self.blob[start:end].decode('utf-8') for start, end in zip(starts, ends)]
+
+    def save(self, path: str) -> None:
+        """
+        Сохранение в два файла: path + '.offsets.npy' и path + '.bin'.
+
+        :param path: Путь к столбцу без расширения.
+        """
+        # Файлы заменяются атомарно: прежний столбец может быть отображён в память
+        save_npy(path + '.offsets.npy', np.asarray(self.offsets, dtype=np.int64))
+        with replacing(path + '.bin') as f:
+            f.write(self.blob)
+
+    @classmethod
+    def load(cls, path: str, lazy: bool = False) -> 'StringColumn':
+        """
+        Загрузка столбца, сохранённого save().
+
+        :param path: Путь к столбцу без расширения.
+        :param lazy: Отображать ли файлы в память вместо чтения целиком.
+        :return: Столбец.
+        """
+        offsets = np.load(path + '.offsets.npy', mmap_mode='r' if lazy else None)
+        with open(path + '.bin', 'rb') as f:
+            # Пустой файл нельзя отобразить в память
+            if lazy and os.fstat(f.fileno()).st_size > 0:
+                blob = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+            else:
+                blob = f.read()
+        return cls(offsets, blob)
+
+
+class DocumentStore:
+    """
+    Хранилище полей документов для выдачи результатов поиска: id, категория,
+    текст и ссылка в виде отдельных столбцов. Результаты по номерам документов
+    собираются одной выборкой по каждому столбцу, без обращения к строкам DataFrame.
+    """
+
+    def __init__(self, ids: np.ndarray, categories: StringColumn, texts: StringColumn, links: StringColumn) -> None:
+        """
+        :param ids: Идентификаторы документов (n,).
+        :param categories: Категории.
+        :param texts: Тексты.
+        :param links: Ссылки.
+        """
+        self.ids = ids
+        self.categories = categories
+        self.texts = texts
+        self.links = links
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> 'DocumentStore':
+        """
+        Построение хранилища по корпусу с колонками 'id', 'Category', 'Text' и 'Link'.
+
+        :param df: Корпус.
+        :return: Хранилище.
+        """
+        return cls(
+            df['id'].to_numpy(dtype=np.int64),
+            StringColumn.from_strings(df['Category']),
+            StringColumn.from_strings(df['Text']),
+            StringColumn.from_strings(df['Link'])
+        )
+
+    def __len__(self) -> int:
+        return len(self.ids)
+
+    def gather(self, indices: Iterable[int]) -> List[Tuple[int, str, str, str]]:
+        """
+        Поля документов по их номерам в корпусе.
+
+        :param indices: Номера документов.
+        :return: Список кортежей (id документа, категория, текст, ссылка).
+        """
+        indices = np.asarray(indices, dtype=np.intp)
+        return list(zip(self.ids[indices].tolist(), self.categories.take(indices),
+                        self.texts.take(indices), self.links.take(indices)))
+
+    def save(self, directory: str) -> None:
+        """
+        Сохранение хранилища в каталог.
+
+        :param directory: Каталог хранилища.
+        """
+        os.makedirs(directory, exist_ok=True)
+        self.categories.save(os.path.join(directory, 'categories'))
+        self.texts.save(os.path.join(directory, 'texts'))
+        self.links.save(os.path.join(directory, 'links'))
+        # Идентификаторы записываются последними: по ним exists() считает хранилище готовым
+        save_npy(os.path.join(directory, 'ids.npy'), self.ids)
+
+    @classmethod
+    def load(cls, directory: str, lazy_texts: bool = True) -> 'DocumentStore':
+        """
+        Загрузка хранилища из каталога. Идентификаторы, категории и ссылки читаются
+        в память, тексты по умолчанию остаются на диске и читаются только для
+        возвращаемых документов.
+
+        :param directory: Каталог хранилища.
+        :param lazy_texts: Отображать ли тексты в память вместо чтения целиком.
+        :return: Хранилище.
+        """
+        return cls(
+            np.load(os.path.join(directory, 'ids.npy')),
+            StringColumn.load(os.path.join(directory, 'categories')),
+            StringColumn.load(os.path.join(directory, 'texts'), lazy=lazy_texts),
+            StringColumn.load(os.path.join(directory, 'links'))
+        )
+
+    @staticmethod
+    def exists(directory: str) -> bool:
+        """Сохранено ли хранилище в каталоге."""
+        return os.path.exists(os.path.join(directory, 'ids.npy'))
@@ -0,0 +1,211 @@
+import os
+import json
+import hashlib
+import threading
+import numpy as np
+from contextlib import contextmanager
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from atomic_io import replacing
+
+try:
+    import fcntl
+except ImportError:  # Windows: запись согласована только внутри процесса
+    fcntl = None
+
+FORMAT_VERSION = 1
+META_FILE = 'meta.json'
+RECORDS_FILE = 'embeddings.bin'
+LOCK_FILE = 'embeddings.lock'
+KEY_SIZE = 32
+
+
+class EmbeddingStore:
+    """
+    Хранилище эмбеддингов с адресацией по содержимому: ключ — SHA-256 от
+    предобработанного текста, имени модели и максимальной длины входа, значение —
+    вектор float32. Записи (ключ и вектор подряд) только дописываются в конец
+    одного файла, который читается через отображение в память; в памяти хранится
+    лишь словарь ключ → номер записи. Повторные и устаревшие записи убирает compact().
+
+    Файл могут одновременно дописывать несколько процессов (воркеры сервера):
+    дописывание и сжатие выполняются под блокировкой fcntl.flock на файле
+    embeddings.lock, а чтение идёт без блокировки. Незавершённая запись в конце
+    файла (например, после сбоя) при чтении отбрасывается и обрезается перед
+    следующей записью, чтобы новые записи не сдвинулись.
+    """
+
+    def __init__(self, directory: str) -> None:
+        """
+        Открытие хранилища; каталог создаётся при первой записи.
+
+        :param directory: Каталог хранилища.
+        """
+        self.directory = directory
+        self.dim: Optional[int] = None
+        self._lock = threading.Lock()
+        self._records = None
+        self._index: Dict[bytes, int] = {}
+        self._stamp: Tuple[int, int] = (0, 0)
+        meta_file = os.path.join(directory, META_FILE)
+        if os.path.exists(meta_file):
+            with open(meta_file, encoding='utf-8') as f:
+                header = json.load(f)
+            if header.get('format_version') != FORMAT_VERSION:
+                raise ValueError(f"Неподдерживаемая версия хранилища эмбеддингов: {header.get('format_version')}")
+            self.dim = int(header['dim'])
+            self.refresh()
+
+    @staticmethod
+    def key(text: str, model: str, max_length: int) -> bytes:
+        """
+        Ключ эмбеддинга.
+
+        :param text: Предобработанный текст.
+        :param model: Имя модели.
+        :param max_length: Максимальная длина входа модели в токенах.
+        :return: 32 байта SHA-256.
+        """
+        return hashlib.sha256(f"{model}\0{max_length}\0{text}".encode('utf-8')).digest()
+
+    @property
+    def path(self) -> str:
+        """Путь к файлу записей."""
+        return os.path.join(self.directory, RECORDS_FILE)
+
+    @property
+    def record_dtype(self) -> np.dtype:
+        """Тип записи: ключ и вектор."""
+        return np.dtype([('key', f'V{KEY_SIZE}'), ('vector', '<f4', (self.dim,))])
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def __contains__(self, key: bytes) -> bool:
+        return key in self._index
+
+    def refresh(self) -> None:
+        """Чтение записей, дописанных после открытия (в том числе другими процессами)."""
+        with self._lock:
+            self._refresh()
+
+    def _file_stamp(self) -> Tuple[int, int]:
+        """Inode и размер файла записей: по ним видно дописывание и замену файла при сжатии."""
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return 0, 0
+        return stat.st_ino, stat.st_size
+
+    @contextmanager
+    def _write_lock(self) -> Iterator[None]:
+        """Блокировка записи, общая для процессов; снимается при закрытии файла блокировки."""
+        with open(os.path.join(self.directory, LOCK_FILE), 'a') as f:
+            if fcntl is not None:
+                fcntl.flock(f, fcntl.LOCK_EX)
+            yield
+
+    def _refresh(self) -> None:
+        """Отображение файла записей в память и дополнение словаря новыми ключами."""
+        stamp = self._file_stamp()
+        if self.dim is None or stamp == self._stamp:
+            return
+        count = stamp[1] // self.record_dtype.itemsize
+        records = np.memmap(self.path, dtype=self.record_dtype, mode='r', shape=(count,)) if count else None
+        # Тот же файл дописан — читаются только новые ключи; файл заменён — все заново
+        start = self._records.shape[0] if self._records is not None and stamp[0] == self._stamp[0] else 0
+        if records is not None and start < count:
+            keys = records['key'][start:].tobytes()
+            index = self._index if start else {}
+            for i in range(count - start):
+                index[keys[i * KEY_SIZE:(i + 1) * KEY_SIZE]] = start + i
+        else:
+            index = self._index if start else {}
+        # Сначала отображение, затем словарь: номера из словаря всегда есть в отображении
+        self._records, self._stamp = records, stamp
+        self._index = index
+
+    def get_many(self, keys: List[bytes]) -> Tuple[Optional[np.ndarray], np.ndarray]:
+        """
+        Поиск эмбеддингов по ключам.
+
+        :param keys: Ключи.
+        :return: Кортеж (матрица float32 (len(keys), dim) с нулями на месте
+            отсутствующих или None, если хранилище пусто; маска найденных).
+        """
+        if self.dim is not None and self._file_stamp() != self._stamp:
+            self.refresh()
+        index = self._index
+        rows = np.fromiter((index.get(key, -1) for key in keys), dtype=np.int64, count=len(keys))
+        found = rows >= 0
+        records = self._records
+        if records is None:
+            return None, found
+        vectors = np.zeros((len(keys), self.dim), dtype=np.float32)
+        if found.any():
+            vectors[found] = records['vector'][rows[found]]
+        return vectors, found
+
+    def put_many(self, keys: List[bytes], vectors: np.ndarray) -> None:
+        """
+        Дописывание эмбеддингов; ключи, которые уже есть, пропускаются.
+
+        :param keys: Ключи.
+        :param vectors: Матрица (len(keys), dim).
+        """
+        vectors = np.asarray(vectors, dtype=np.float32)
+        with self._lock:
+            if self.dim is None:
+                self.dim = int(vectors.shape[1])
+                os.makedirs(self.directory, exist_ok=True)
+                with replacing(os.path.join(self.directory, META_FILE), 'w', encoding='utf-8') as f:
+                    json.dump({'format_version': FORMAT_VERSION, 'dim': self.dim}, f)
+            elif vectors.shape[1] != self.dim:
+                raise ValueError(f"Размерность эмбеддингов {vectors.shape[1]} не совпадает с хранилищем ({self.dim})")
+
+            with self._write_lock():
+                # Под блокировкой видны все записи других процессов: их ключи не дописываются повторно
+                self._refresh()
+                new = {}
+                for key, vector in zip(keys, vectors):
+                    if key not in self._index:
+                        new.setdefault(key, vector)
+                if not new:
+                    return
+                records = np.empty(len(new), dtype=self.record_dtype)
+                records['key'] = np.frombuffer(b''.join(new), dtype=f'V{KEY_SIZE}')
+                records['vector'] = np.stack(list(new.values()))
+                with open(self.path, 'ab') as f:
+                    # Обрезается только незавершённая запись прерванного дописывания
+                    size = os.fstat(f.fileno()).st_size
+                    torn = size % self.record_dtype.itemsize
+                    if torn:
+                        f.truncate(size - torn)
+                    f.write(records.tobytes())
+            self._refresh()
+
+    def compact(self, keep: Optional[Iterable[bytes]] = None) -> Tuple[int, int]:
+        """
+        Перезапись файла без повторов и, если задан keep, без ключей вне него.
+        Файл заменяется атомарно.
+
+        :param keep: Ключи, которые нужно сохранить; None — все.
+        :return: Количество записей в файле до и после.
+        """
+        with self._lock:
+            if self.dim is None:
+                return 0, 0
+            with self._write_lock():
+                self._refresh()
+                if self._records is None:
+                    return 0, 0
+                before = self._records.shape[0]
+                index = self._index
+                if keep is not None:
+                    index = {key: index[key] for key in keep if key in index}
+                rows = np.sort(np.fromiter(index.values(), dtype=np.int64, count=len(index)))
+                with replacing(self.path) as f:
+                    # Блоками, чтобы не читать весь файл в память
+                    for start in range(0, rows.shape[0], 65536):
+                        f.write(np.ascontiguousarray(self._records[rows[start:start + 65536]]).tobytes())
+                self._refresh()
+            return before, len(self._index)
@@ -0,0 +1,257 @@
+import re
+from html.parser import HTMLParser
+from typing import Callable, Dict, List, Optional, Tuple
+from bs4 import BeautifulSoup
+from bs4.dammit import EntitySubstitution, UnicodeDammit
+
+NOT_FOUND_TEXT = "Элемент с id 'summury_text' не найден."
+END_MARKER = "Оценка по биографии"
+
+# Теги без закрывающего тега (как HTMLTreeBuilder.empty_element_tags в BeautifulSoup)
+VOID_ELEMENTS = frozenset({
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'keygen', 'link', 'menuitem', 'meta',
+    'param', 'source', 'track', 'wbr', 'basefont', 'bgsound', 'command', 'frame', 'image', 'isindex',
+    'nextid', 'spacer',
+})
+# Теги, текст внутри которых BeautifulSoup хранит как особые строки, не входящие в get_text()
+STRING_CONTAINERS = frozenset({'script', 'style', 'template', 'rt', 'rp'})
+
+
+def extract_bs4(page: str) -> str:
+    """Извлекает текст биографии из HTML страницы через BeautifulSoup (эталонная реализация).
+
+    Args:
+        page (str): HTML страницы с биографией.
+
+    Returns:
+        str: Текст биографии или NOT_FOUND_TEXT.
+    """
+    soup = BeautifulSoup(page, 'html.parser')
+
+    # Находим div с id 'summury_text'
+    summary_div = soup.find("div", id='summury_text')
+
+    if summary_div:
+        # Сначала собираем текст из summury_div
+        summary_text = summary_div.get_text(strip=True)
+
+        # Получаем следующий элемент после summury_div
+        next_element = summary_div.find_next_sibling()
+
+        paragraphs: List[str] = []
+
+        # Ищем все <p> теги после найденного элемента
+        while next_element:
+            if next_element.name == 'p':
+                paragraphs.append(next_element.get_text(strip=True))
+            # Если встречаем h4 с текстом "Оценка по биографии", прерываем цикл
+            elif next_element.name == 'h4' and next_element.get_text(strip=True) == END_MARKER:
+                break
+
+            # Переходим к следующему элементу
+            next_element = next_element.find_next_sibling()
+
+        # Объединяем текст из summary и найденные параграфы
+        return summary_text + " " + " ".join(paragraphs).strip()
+    else:
+        return NOT_FOUND_TEXT
+
+
+class _Done(Exception):
+    """Разбор можно прекратить: текст биографии собран."""
+
+
+class SummaryParser(HTMLParser):
+    """
+    Потоковый разбор страницы биографии без построения дерева.
+
+    Повторяет поведение BeautifulSoup с html.parser в той части, от которой
+    зависит результат extract_bs4: стек открытых тегов (закрывающий тег
+    закрывает все теги до ближайшего открытого с тем же именем, закрывающий тег
+    без открытого игнорируется), пустые элементы, разбор ссылок на символы и
+    get_text(strip=True) — конкатенация непустых очищенных от пробелов текстовых
+    узлов без комментариев, объявлений и содержимого script, style, template,
+    rt и rp (кроме CDATA, которые входят в текст и там). Разбор прекращается на заголовке
+    END_MARKER или при закрытии родителя div#summury_text.
+    """
+
+    _DECIMAL_REFERENCE = re.compile(r'^([0-9]+)(.*)')
+    _HEX_REFERENCE = re.compile(r'^([0-9a-f]+)(.*)')
+
+    def __init__(self) -> None:
+        super().__init__(convert_charrefs=False)
+        self.stack: List[str] = []
+        # Глубина div#summury_text в стеке; None — ещё не найден
+        self.summary_depth: Optional[int] = None
+        self.summary_closed = False
+        self.summary = ''
+        self.paragraphs: List[str] = []
+        # Собираемое поддерево: вид ('summary', 'p', 'h4'), его глубина и текстовые узлы
+        self._collect: Optional[Tuple[str, int, List[str]]] = None
+        self._data: List[str] = []
+        # Количество открытых тегов из STRING_CONTAINERS
+        self._containers = 0
+        # Пустые элементы без «/>»: их закрывающий тег, если встретится, игнорируется
+        # и, как в BeautifulSoup, не разрывает текстовый узел
+        self._already_closed: List[str] = []
+
+    def _end_data(self) -> None:
+        """Завершает текущий текстовый узел и добавляет его в собираемое поддерево."""
+        if self._data:
+            text = ''.join(self._data).strip()
+            self._data = []
+            if text and self._collect is not None and not self._containers:
+                self._collect[2].append(text)
+
+    def handle_starttag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        self._start(tag, attrs)
+        if tag in VOID_ELEMENTS:
+            self._already_closed.append(tag)
+
+    def handle_startendtag(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        self._start(tag, attrs)
+        self._end(tag)
+
+    def handle_endtag(self, tag: str) -> None:
+        if tag in self._already_closed:
+            self._already_closed.remove(tag)
+            return
+        self._end(tag)
+
+    def _start(self, tag: str, attrs: List[Tuple[str, Optional[str]]]) -> None:
+        """Открытие элемента."""
+        self._end_data()
+        if tag in VOID_ELEMENTS:
+            return
+        self.stack.append(tag)
+        depth = len(self.stack)
+        if tag in STRING_CONTAINERS:
+            self._containers += 1
+
+        if self.summary_depth is None:
+            if tag == 'div' and dict(attrs).get('id') == 'summury_text':
+                self.summary_depth = depth
+                self._collect = ('summary', depth, [])
+        elif self.summary_closed and self._collect is None and depth == self.summary_depth and tag in ('p', 'h4'):
+            # Следующий за div#summury_text соседний элемент
+            self._collect = (tag, depth, [])
+
+    def _end(self, tag: str) -> None:
+        """Закрытие элемента и всех открытых внутри него."""
+        self._end_data()
+        if tag not in self.stack:
+            return
+        while True:
+            depth = len(self.stack)
+            name = self.stack.pop()
+            self._pop(name, depth)
+            if name == tag:
+                return
+
+    def _pop(self, name: str, depth: int) -> None:
+        """Обработка закрытия элемента name на глубине depth."""
+        if name in STRING_CONTAINERS:
+            self._containers -= 1
+        if self._collect is not None and self._collect[1] == depth:
+            kind, _, strings = self._collect
+            self._collect = None
+            text = ''.join(strings)
+            if kind == 'summary':
+                self.summary = text
+                self.summary_closed = True
+            elif kind == 'p':
+                self.paragraphs.append(text)
+            elif text == END_MARKER:
+                raise _Done()
+        elif self.summary_closed and depth == self.summary_depth - 1:
+            # Закрыт родитель div#summury_text: соседних элементов больше нет
+            raise _Done()
+
+    def finish(self) -> None:
+        """Конец документа: закрытие всех открытых тегов, как при завершении разбора BeautifulSoup."""
+        self._end_data()
+        while self.stack:
+            depth = len(self.stack)
+            self._pop(self.stack.pop(), depth)
+
+    def handle_data(self, data: str) -> None:
+        self._data.append(data)
+
+    def handle_charref(self, name: str) -> None:
+        base, reference = 10, self._DECIMAL_REFERENCE
+        if name.startswith('x') or name.startswith('X'):
+            name, base, reference = name[1:], 16, self._HEX_REFERENCE
+        try:
+            code, extra = int(name, base), ''
+        except ValueError:
+            match = reference.search(name)
+            code, extra = (int(match.group(1), base), match.group(2)) if match else (None, name)
+        if code is not None:
+            self.handle_data(UnicodeDammit.numeric_character_reference(code)[0])
+        if extra:
+            self.handle_data(extra)
+
+    def handle_entityref(self, name: str) -> None:
+        character = EntitySubstitution.HTML_ENTITY_TO_CHARACTER.get(name)
+        self.handle_data(character if character is not None else f"&{name}")
+
+    def handle_comment(self, data: str) -> None:
+        self._end_data()
+
+    def handle_decl(self, decl: str) -> None:
+        self._end_data()
+
+    def handle_pi(self, data: str) -> None:
+        self._end_data()
+
+    def unknown_decl(self, data: str) -> None:
+        self._end_data()
+        # CDATA входит в get_text() BeautifulSoup даже внутри template, rt и rp, остальные объявления — нет
+        if data.upper().startswith('CDATA['):
+            text = data[len('CDATA['):].strip()
+            if text and self._collect is not None:
+                self._collect[2].append(text)
+
+
+def extract_stream(page: str) -> str:
+    """Извлекает текст биографии потоковым разбором SummaryParser; результат совпадает с extract_bs4.
+
+    Args:
+        page (str): HTML страницы с биографией.
+
+    Returns:
+        str: Текст биографии или NOT_FOUND_TEXT.
+    """
+    parser = SummaryParser()
+    try:
+        parser.feed(page)
+        parser.close()
+        parser.finish()
+    except _Done:
+        pass
+    if parser.summary_depth is None:
+        return NOT_FOUND_TEXT
+    return parser.summary + " " + " ".join(parser.paragraphs).strip()
+
+
+EXTRACTORS: Dict[str, Callable[[str], str]] = {
+    'bs4': extract_bs4,
+    'stream': extract_stream,
+}
+
+
+def get_extractor(name: str) -> Callable[[str], str]:
+    """Функция извлечения текста биографии по имени.
+
+    Args:
+        name (str): 'bs4' или 'stream'.
+
+    Returns:
+        Callable[[str], str]: Функция, принимающая HTML страницы.
+
+    Raises:
+        ValueError: Неизвестное имя.
+    """
+    if name not in EXTRACTORS:
+        raise ValueError(f"Unknown extractor: {name}")
+    return EXTRACTORS[name]
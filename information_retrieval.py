@@ -1,18 +1,28 @@
 import os
+import logging
+import threading
 import pandas as pd
-import pymorphy2
-import re
-import string
 import pickle
 import joblib
 import numpy as np
-from typing import List, Tuple, Optional
-from sklearn.feature_extraction.text import TfidfVectorizer
-from sklearn.metrics.pairwise import cosine_similarity
-from transformers import BertTokenizer, BertModel
-from nltk.corpus import stopwords
-import torch
+from typing import Callable, Dict, Hashable, Iterable, List, Tuple, Optional
 from tqdm import tqdm
+from ranking import top_k
+from inverted_index import InvertedIndex
+from bm25 import BM25Index
+from ann_index import IVFIndex
+from quantization import QuantizedIndex
+from vector_store import normalize_rows, save_embedding_matrix, load_embedding_matrix
+from cache import LRUCache
+from preprocessing import TextPreprocessor, preprocess_corpus
+from batching import MicroBatcher
+from document_store import DocumentStore
+from column_store import file_fingerprint, load_columns, load_frame, read_metadata, save_frame
+from segments import DeltaDocument, DeltaSegment, delta_results, merge_rankings
+from atomic_io import replacing
+from embedding_store import EmbeddingStore
+
+logger = logging.getLogger(__name__)
 
 class InformationRetrieval:
     """
@@ -22,60 +32,263 @@ class InformationRetrieval:
     - Предобработка текста
     - Индексация текстов с помощью TF-IDF и BERT
     - Поиск по индексам с использованием TF-IDF и BERT
+
+    Корпус, модель BERT, морфологический анализатор и индексы загружаются
+    лениво, при первом обращении; сервер может загрузить их заранее через warmup().
+
+    Документы можно добавлять, изменять и удалять без перестроения индексов
+    (add_documents, update_document, delete_document): изменения накапливаются в
+    дельта-сегменте поверх основного индекса и вливаются в него при слиянии
+    merge_segments, в том числе в фоновом потоке (start_merger).
     """
 
-    def __init__(self, csv_file: str, tfidf_pkl_file: Optional[str] = None, bert_pkl_file: Optional[str] = None, processed_data_file: Optional[str] = 'processed_data.pkl') -> None:
+    METHODS = ('tf-idf', 'bm25', 'bert')
+
+    def __init__(self, csv_file: str, tfidf_pkl_file: Optional[str] = None, bert_pkl_file: Optional[str] = None, processed_data_file: Optional[str] = 'processed_data', bm25_pkl_file: Optional[str] = None, bert_nprobe: Optional[int] = None, bert_rerank: bool = True, result_cache: Optional[LRUCache] = None, embedding_cache: Optional[LRUCache] = None, lemma_cache_file: Optional[str] = 'indexes/lemma_cache.pkl', n_jobs: int = 1, batch_max_size: int = 1, batch_wait_ms: float = 0.0, document_store_dir: Optional[str] = None, embedding_store_dir: Optional[str] = None) -> None:
         """
         Инициализация класса.
 
         :param csv_file: Путь к файлу CSV с колонкой 'Text', содержащей тексты для анализа.
         :param tfidf_pkl_file: Путь к файлу PKL с моделью TF-IDF.
-        :param bert_pkl_file: Путь к файлу PKL с эмбеддингами BERT.
-        :param processed_data_file: Путь к файлу PKL с предобработанными данными.
-        """
-        self.df = pd.read_csv(csv_file)
-        if 'id' not in self.df.columns:
-            self.df['id'] = range(1, len(self.df) + 1)
-        self.morph = pymorphy2.MorphAnalyzer()
-        self.stop_words = set(stopwords.words('russian'))
-        self.tfidf_vectorizer = TfidfVectorizer(preprocessor=self.preprocess_text_tf_idf)
+        :param bert_pkl_file: Путь к файлу с эмбеддингами BERT (.npy; старый формат PKL тоже поддерживается).
+        :param processed_data_file: Каталог кэша предобработанного корпуса (см. column_store).
+            Кэш пересоздаётся, если изменился CSV или настройки предобработки.
+        :param bm25_pkl_file: Путь к файлу PKL с индексом BM25.
+        :param bert_nprobe: Количество кластеров, просматриваемых приближённым поиском BERT.
+            None — точный перебор всех эмбеддингов.
+        :param bert_rerank: Переранжировать ли кандидатов сжатого индекса BERT (int8/pq)
+            по точным float32-эмбеддингам.
+        :param result_cache: Кэш ранжированных номеров документов по ключу
+            (нормализованный запрос, метод, top_n). По умолчанию — LRU на 1024 записи.
+        :param embedding_cache: Кэш эмбеддингов по нормализованному запросу.
+            По умолчанию — LRU на 1024 записи.
+        :param lemma_cache_file: Путь к файлу PKL с кэшем лемм pymorphy2. Загружается,
+            если существует, и сохраняется после предобработки корпуса.
+        :param n_jobs: Количество процессов для предобработки корпуса; -1 — по числу ядер.
+        :param batch_max_size: Максимальный размер пакета одновременных запросов BERT,
+            кодируемых одним проходом модели. 1 — каждый запрос кодируется отдельно.
+        :param batch_wait_ms: Сколько миллисекунд ждать других запросов для пакета.
+        :param document_store_dir: Каталог хранилища полей документов для выдачи результатов.
+            Если хранилище там есть, тексты читаются с диска только для найденных документов
+            и корпус не загружается для поиска; если нет — оно строится по корпусу и сохраняется.
+            None — хранилище строится в памяти.
+        :param embedding_store_dir: Каталог хранилища эмбеддингов BERT по хэшу текста (см. embedding_store):
+            get_embeddings пропускает через модель только тексты, которых там нет.
+            None — эмбеддинги каждый раз вычисляются заново.
+        """
+        self.csv_file = csv_file
+        self.processed_data_file = processed_data_file
+        self.lemma_cache_file = lemma_cache_file
+        self.n_jobs = n_jobs
+        self._df = None
+        self.document_store_dir = document_store_dir
+        self._documents = None
+        self._load_lock = threading.RLock()
+        self.preprocessor = TextPreprocessor()
+        self.tfidf_vectorizer = None
         self.tfidf_matrix = None
-        self.tokenizer = BertTokenizer.from_pretrained('bert-base-uncased')
-        self.model = BertModel.from_pretrained('bert-base-uncased')
+        self.tfidf_inverted_index = None
+        self.bert_model_name = 'bert-base-uncased'
+        self.bert_max_length = 512
+        self._tokenizer = None
+        self._model = None
+        self.embedding_store_dir = embedding_store_dir
+        self._embedding_store = None
+        self.batch_max_size = batch_max_size
+        self.batch_wait_ms = batch_wait_ms
+        self._query_batcher = None
         self.bert_embeddings = None
+        self.bert_ann_index = None
+        self._bert_ivf_file = None
+        self.bert_nprobe = bert_nprobe
+        self.bert_quantized_index = None
+        self.bert_rerank = bert_rerank
+        self.bm25_index = None
+        self.result_cache = result_cache if result_cache is not None else LRUCache()
+        self.embedding_cache = embedding_cache if embedding_cache is not None else LRUCache()
+
+        # Изменения поверх основного индекса. Изменения сегмента выполняются под _index_lock,
+        # слияния — под _merge_lock; _swap_version нечётен, пока слияние заменяет основной индекс
+        self._segment = DeltaSegment()
+        self._index_lock = threading.RLock()
+        self._merge_lock = threading.Lock()
+        self._swap_version = 0
+        self.merge_interval = 300.0
+        self.merge_max_delta = 1000
+        self._merger = None
+        self._merger_stop = threading.Event()
+        self._merge_wakeup = threading.Event()
+
+        # Индексы загружаются при первом поиске соответствующим методом
+        self._pending_indexes: Dict[str, Callable[[], None]] = {}
+        if tfidf_pkl_file and bert_pkl_file:
+            self._pending_indexes = {
+                'tf-idf': lambda: self._load_tfidf_index(tfidf_pkl_file),
+                'bm25': lambda: self._load_bm25_index(bm25_pkl_file),
+                'bert': lambda: self._load_bert_index(bert_pkl_file),
+            }
+
+    @property
+    def df(self) -> pd.DataFrame:
+        """Корпус с предобработанными текстами, загружаемый при первом обращении."""
+        if self._df is None:
+            with self._load_lock:
+                if self._df is None:
+                    self._load_corpus()
+        return self._df
+
+    @df.setter
+    def df(self, value: pd.DataFrame) -> None:
+        self._df = value
+        self._documents = None
+
+    @property
+    def documents(self) -> DocumentStore:
+        """Хранилище полей документов, загружаемое или строящееся при первом обращении."""
+        if self._documents is None:
+            with self._load_lock:
+                if self._documents is None:
+                    self._documents = self._load_documents()
+        return self._documents
+
+    def _load_documents(self) -> DocumentStore:
+        """
+        Загрузка хранилища документов из document_store_dir или построение по корпусу.
+
+        :return: Хранилище.
+        """
+        if self.document_store_dir and DocumentStore.exists(self.document_store_dir):
+            return DocumentStore.load(self.document_store_dir)
+        if self._df is None and self._processed_data_fresh():
+            # Столбцы кэша корпуса отображаются в память без загрузки всего корпуса
+            columns = load_columns(self.processed_data_file, ['id', 'Category', 'Text', 'Link'])
+            return DocumentStore(np.asarray(columns['id'], dtype=np.int64), columns['Category'],
+                                 columns['Text'], columns['Link'])
+        self.index_documents()
+        return self._documents
+
+    @property
+    def tokenizer(self):
+        """Токенизатор BERT, загружаемый при первом обращении."""
+        if self._tokenizer is None:
+            with self._load_lock:
+                if self._tokenizer is None:
+                    from transformers import BertTokenizer
+                    self._tokenizer = BertTokenizer.from_pretrained(self.bert_model_name)
+        return self._tokenizer
+
+    @property
+    def model(self):
+        """Модель BERT, загружаемая при первом обращении."""
+        if self._model is None:
+            with self._load_lock:
+                if self._model is None:
+                    from transformers import BertModel
+                    self._model = BertModel.from_pretrained(self.bert_model_name)
+        return self._model
+
+    @property
+    def embedding_store(self) -> Optional[EmbeddingStore]:
+        """Хранилище эмбеддингов, открываемое при первом обращении; None, если каталог не задан."""
+        if self._embedding_store is None and self.embedding_store_dir:
+            with self._load_lock:
+                if self._embedding_store is None:
+                    self._embedding_store = EmbeddingStore(self.embedding_store_dir)
+        return self._embedding_store
+
+    def embedding_key(self, text: str) -> bytes:
+        """
+        Ключ эмбеддинга текста в хранилище: зависит от текста, модели и максимальной длины входа.
+
+        :param text: Предобработанный для BERT текст.
+        :return: Ключ.
+        """
+        return EmbeddingStore.key(text, self.bert_model_name, self.bert_max_length)
+
+    def _processed_data_fresh(self) -> bool:
+        """
+        Соответствует ли кэш предобработанного корпуса текущему CSV и настройкам предобработки.
+
+        :return: True, если кэш можно использовать.
+        """
+        if not self.processed_data_file:
+            return False
+        header = read_metadata(self.processed_data_file)
+        if header is None:
+            return False
+        source = file_fingerprint(self.csv_file, previous=header.get('source'))
+        return (source['sha256'] == header.get('source', {}).get('sha256')
+                and header.get('settings') == self.preprocessor.settings_hash())
 
-        # Проверка наличия файла с предобработанными данными
-        if os.path.exists(processed_data_file):
-            self.load_processed_data(processed_data_file)
+    def _load_corpus(self) -> None:
+        """
+        Загрузка корпуса: предобработанные данные читаются из кэша, если он актуален,
+        иначе CSV предобрабатывается и кэш пересоздаётся.
+        """
+        if self.lemma_cache_file:
+            self.preprocessor.load_lemmas(self.lemma_cache_file)
+
+        if self._processed_data_fresh():
+            self.load_processed_data(self.processed_data_file)
             print('Processed data loaded successfully!')
         else:
+            df = pd.read_csv(self.csv_file)
+            if 'id' not in df.columns:
+                df['id'] = range(1, len(df) + 1)
             # Предобработка текста
-            self.df['Processed_TFIDF'] = self.df['Text'].apply(self.preprocess_text_tf_idf)
-            self.df['Processed_BERT'] = self.df['Text'].apply(self.preprocess_text_bert)
-            self.save_processed_data(processed_data_file)
+            df['Processed_TFIDF'], df['Processed_BERT'] = preprocess_corpus(
+                df['Text'].tolist(), self.preprocessor, n_jobs=self.n_jobs)
+            self.df = df
+            if self.processed_data_file:
+                self.save_processed_data(self.processed_data_file)
+            if self.lemma_cache_file:
+                self.preprocessor.save_lemmas(self.lemma_cache_file)
             print('Texts processed and saved successfully!')
 
-        # Загрузка индексов
-        if tfidf_pkl_file and bert_pkl_file:
-            self.load_index(tfidf_pkl_file, bert_pkl_file)
+    def _require_index(self, method: str) -> None:
+        """
+        Загрузка индекса метода, если он ещё не загружен.
+
+        :param method: Метод поиска: 'tf-idf', 'bm25' или 'bert'.
+        """
+        if method in self._pending_indexes or (method == 'bm25' and self.bm25_index is None):
+            with self._load_lock:
+                loader = self._pending_indexes.get(method)
+                if loader is not None:
+                    loader()
+                    # Удаляется только после загрузки: другие потоки до этого ждут на блокировке
+                    self._pending_indexes.pop(method, None)
+                # Если файла индекса BM25 нет, он строится по корпусу один раз
+                if method == 'bm25' and self.bm25_index is None:
+                    self.index_bm25()
+
+    def warmup(self, methods: Iterable[str] = METHODS) -> None:
+        """
+        Заблаговременная загрузка корпуса, индексов и моделей для указанных методов,
+        чтобы первый запрос не ждал загрузки.
+
+        :param methods: Методы поиска, которые нужно подготовить.
+        """
+        methods = set(methods)
+        self.documents
+        for method in methods:
+            self._require_index(method)
+        if methods & {'tf-idf', 'bm25'}:
+            self.preprocessor.morph
+            self.preprocessor.stop_words
+        if 'bert' in methods:
+            self.tokenizer
+            self.model
 
     def preprocess_text_tf_idf(self, text: str) -> str:
         """
         Предобработка текста: преобразование в нижний регистр, удаление пунктуации,
-        цифр и стоп-слов.
+        цифр и стоп-слов, лемматизация с кэшем лемм.
 
         :param text: Исходный текст.
         :return: Обработанный текст.
         """
-        text = text.lower()
-        text = text.translate(str.maketrans("", "", string.punctuation))
-        text = re.sub(r'\d+', '', text)
-        tokens = text.split()
-        processed_tokens = [
-            self.morph.parse(token)[0].normal_form
-            for token in tokens if token not in self.stop_words
-        ]
-        return ' '.join(processed_tokens)
+        return self.preprocessor.preprocess_tf_idf(text)
 
     def preprocess_text_bert(self, text: str) -> str:
         """
@@ -85,96 +298,821 @@ class InformationRetrieval:
         :param text: Исходный текст.
         :return: Обработанный текст.
         """
-        text = text.lower()
-        text = text.translate(str.maketrans("", "", string.punctuation))
-        text = re.sub(r'\d+', '', text)
-        text = re.sub(r'\s+', ' ', text).strip()
+        return self.preprocessor.preprocess_bert(text)
 
-        return text
+    def index_documents(self) -> None:
+        """
+        Построение хранилища полей документов по корпусу и сохранение в document_store_dir, если он задан.
+        """
+        store = DocumentStore.from_frame(self.df)
+        if self.document_store_dir:
+            store.save(self.document_store_dir)
+        self._documents = store
 
     def index_tfidf(self) -> None:
         """
         Индексация текстов с использованием модели TF-IDF.
         Результат сохраняется в файл 'tfidf_index.pkl'.
         """
+        self._pending_indexes.pop('tf-idf', None)
         if not self.df.empty:
-            texts = self.df['Processed_TFIDF'].tolist()
-            self.tfidf_matrix = self.tfidf_vectorizer.fit_transform(tqdm(texts, desc="Processing TF-IDF"))
-            with open('indexes/tfidf_index.pkl', 'wb') as f:
-                pickle.dump((self.tfidf_vectorizer, self.tfidf_matrix), f)
+            self.tfidf_vectorizer, self.tfidf_matrix = self._fit_tfidf(self.df['Processed_TFIDF'].tolist())
+            self.tfidf_inverted_index = InvertedIndex.from_matrix(self.tfidf_matrix)
+            self.result_cache.clear()
+            self._save_tfidf_index()
 
-    def index_bert(self) -> None:
+    def _fit_tfidf(self, texts: List[str]):
+        """
+        Обучение векторизатора TF-IDF.
+
+        :param texts: Предобработанные тексты 'Processed_TFIDF'.
+        :return: Кортеж (векторизатор, матрица документ × термин).
+        """
+        from sklearn.feature_extraction.text import TfidfVectorizer
+
+        # Векторизатор ссылается на препроцессор, а не на весь объект: он сериализуется вместе с индексом
+        vectorizer = TfidfVectorizer(preprocessor=self.preprocessor.preprocess_tf_idf)
+        return vectorizer, vectorizer.fit_transform(tqdm(texts, desc="Processing TF-IDF"))
+
+    def _save_tfidf_index(self) -> None:
+        """Сохранение индекса TF-IDF в файл 'tfidf_index.pkl'."""
+        with replacing('indexes/tfidf_index.pkl') as f:
+            pickle.dump((self.tfidf_vectorizer, self.tfidf_matrix), f)
+
+    def index_bert(self, storage: str = 'float32') -> None:
         """
         Индексация текстов с использованием модели BERT.
-        Результат сохраняется в файл 'bert_index.pkl'.
+        L2-нормализованные эмбеддинги float32 сохраняются одной матрицей в файл
+        'bert_index.npy' (заголовок — 'bert_index.json'). Для формата 'float32'
+        дополнительно строится приближённый индекс IVF ('bert_index_ivf.pkl'), для
+        'int8' и 'pq' — сжатый индекс ('bert_index_int8.pkl' / 'bert_index_pq.pkl'),
+        по которому идёт поиск, а матрица float32 читается с диска только для
+        переранжирования.
+
+        :param storage: Формат индекса для поиска: 'float32', 'int8' или 'pq'.
         """
+        if storage != 'float32' and storage not in QuantizedIndex.STORAGES:
+            raise ValueError(f"Неизвестный формат хранения: {storage}")
+
+        self._pending_indexes.pop('bert', None)
         if not self.df.empty:
             texts = self.df['Processed_BERT'].tolist()
-            self.bert_embeddings = self.get_embeddings(texts)
-            joblib.dump(self.bert_embeddings, 'indexes/bert_index.pkl')
+            self.bert_embeddings = normalize_rows(self.get_embeddings(texts))
+            self.bert_ann_index, self.bert_quantized_index = self._fit_bert_search_index(self.bert_embeddings, storage)
+            self._bert_ivf_file = None
+            self.result_cache.clear()
+            self._save_bert_index(storage)
+
+    @staticmethod
+    def _fit_bert_search_index(embeddings: np.ndarray, storage: str) -> Tuple[Optional[IVFIndex], Optional[QuantizedIndex]]:
+        """
+        Построение поискового индекса BERT в заданном формате.
+
+        :param embeddings: Нормализованные эмбеддинги корпуса.
+        :param storage: 'float32' (индекс IVF), 'int8' или 'pq' (сжатый индекс).
+        :return: Кортеж (индекс IVF, сжатый индекс); один из них None.
+        """
+        if storage == 'float32':
+            return IVFIndex().fit(embeddings), None
+        return None, QuantizedIndex(storage).fit(embeddings)
+
+    def _save_bert_index(self, storage: str) -> None:
+        """
+        Сохранение эмбеддингов BERT ('bert_index.npy') и поискового индекса в формате storage.
+
+        :param storage: 'float32', 'int8' или 'pq'.
+        """
+        save_embedding_matrix('indexes/bert_index.npy', self.bert_embeddings, model=self.bert_model_name,
+                              normalized=True, storage=storage)
+        if storage == 'float32':
+            with replacing('indexes/bert_index_ivf.pkl') as f:
+                joblib.dump(self.bert_ann_index, f)
+        else:
+            with replacing(f'indexes/bert_index_{storage}.pkl') as f:
+                joblib.dump(self.bert_quantized_index, f)
+
+    def index_bm25(self) -> None:
+        """
+        Индексация текстов для ранжирования BM25 по лемматизированным токенам 'Processed_TFIDF'.
+        Результат сохраняется в файл 'bm25_index.pkl'.
+        """
+        self._pending_indexes.pop('bm25', None)
+        if not self.df.empty:
+            self.bm25_index = BM25Index().fit(self.df['Processed_TFIDF'].tolist())
+            self.result_cache.clear()
+            self._save_bm25_index()
+
+    def _save_bm25_index(self) -> None:
+        """Сохранение индекса BM25 в файл 'bm25_index.pkl'."""
+        with replacing('indexes/bm25_index.pkl') as f:
+            pickle.dump(self.bm25_index, f)
+
+    def add_documents(self, documents: Iterable[Dict[str, object]]) -> None:
+        """
+        Добавление документов без перестроения индексов: документы попадают в
+        дельта-сегмент и сразу участвуют в поиске, а в основной индекс вливаются
+        при слиянии (merge_segments). Для BERT кодируются только тексты новых документов.
+
+        :param documents: Документы — словари с ключами 'id', 'Text', 'Category' и 'Link'
+            (и, при необходимости, другими колонками корпуса).
+        :raises ValueError: Документ с таким id уже есть в индексе.
+        """
+        with self._index_lock:
+            segment = self._segment
+            added: List[DeltaDocument] = []
+            for fields in documents:
+                doc_id = int(fields['id'])
+                if self._current_fields(segment, doc_id) is not None or any(doc.id == doc_id for doc in added):
+                    raise ValueError(f"Документ с id {doc_id} уже есть в индексе")
+                added.append(self._delta_document(fields))
+            self._apply_segment(segment.changed(add=added))
+
+    def update_document(self, doc_id: int, text: Optional[str] = None, category: Optional[str] = None,
+                        link: Optional[str] = None) -> None:
+        """
+        Изменение документа без перестроения индексов: прежняя версия помечается
+        надгробием, новая попадает в дельта-сегмент. Незаданные поля не меняются.
+
+        :param doc_id: Id документа.
+        :param text: Новый текст.
+        :param category: Новая категория.
+        :param link: Новая ссылка.
+        :raises KeyError: Документа с таким id нет в индексе.
+        """
+        with self._index_lock:
+            segment = self._segment
+            fields = self._current_fields(segment, doc_id)
+            if fields is None:
+                raise KeyError(doc_id)
+            fields = dict(fields)
+            for name, value in (('Text', text), ('Category', category), ('Link', link)):
+                if value is not None:
+                    fields[name] = value
+            self._apply_segment(self._replace_document(segment, doc_id, [self._delta_document(fields)]))
+
+    def delete_document(self, doc_id: int) -> None:
+        """
+        Удаление документа из поиска без перестроения индексов: документ основного
+        индекса помечается надгробием, документ дельта-сегмента убирается из него.
+
+        :param doc_id: Id документа.
+        :raises KeyError: Документа с таким id нет в индексе.
+        """
+        with self._index_lock:
+            segment = self._segment
+            if self._current_fields(segment, doc_id) is None:
+                raise KeyError(doc_id)
+            self._apply_segment(self._replace_document(segment, doc_id, []))
+
+    @property
+    def pending_changes(self) -> int:
+        """Количество изменений (документов и надгробий) дельта-сегмента, ещё не влитых в основной индекс."""
+        return self._segment.size
+
+    def _current_fields(self, segment: DeltaSegment, doc_id: int) -> Optional[Dict[str, object]]:
+        """
+        Текущие поля документа с учётом дельта-сегмента.
+
+        :param segment: Дельта-сегмент.
+        :param doc_id: Id документа.
+        :return: Словарь полей или None, если документа нет.
+        """
+        doc = segment.find(doc_id)
+        if doc is not None:
+            return doc.fields
+        if int(doc_id) in segment.deleted_ids:
+            return None
+        positions = self._base_positions([doc_id])
+        if positions.shape[0] == 0:
+            return None
+        doc_id, category, text, link = self.documents.gather(positions[:1])[0]
+        return {'id': doc_id, 'Category': category, 'Text': text, 'Link': link}
+
+    def _base_positions(self, doc_ids: Iterable[int]) -> np.ndarray:
+        """
+        Номера документов основного индекса с данными id.
+
+        :param doc_ids: Id документов.
+        :return: Отсортированные номера.
+        """
+        return np.flatnonzero(np.isin(self.documents.ids, [int(doc_id) for doc_id in doc_ids]))
+
+    def _delta_document(self, fields: Dict[str, object]) -> DeltaDocument:
+        """
+        Документ дельта-сегмента с предобработанными текстами.
+
+        :param fields: Поля документа.
+        :return: Документ.
+        """
+        fields = dict(fields)
+        fields['id'] = int(fields['id'])
+        text = str(fields.get('Text', ''))
+        return DeltaDocument(fields, self.preprocess_text_tf_idf(text), self.preprocess_text_bert(text))
+
+    def _replace_document(self, segment: DeltaSegment, doc_id: int, added: List[DeltaDocument]) -> DeltaSegment:
+        """
+        Сегмент, в котором документ doc_id заменён документами added (или удалён, если их нет).
+
+        :param segment: Текущий сегмент.
+        :param doc_id: Id документа.
+        :param added: Новые версии документа.
+        :return: Сегмент следующего поколения.
+        """
+        doc_id = int(doc_id)
+        deleted_ids, positions = segment.deleted_ids, segment.deleted_positions
+        found = self._base_positions([doc_id])
+        if found.shape[0] and doc_id not in deleted_ids:
+            deleted_ids, positions = deleted_ids | {doc_id}, np.union1d(positions, found)
+        return segment.changed(remove_ids=[doc_id], add=added, deleted_ids=deleted_ids, deleted_positions=positions)
+
+    def _apply_segment(self, segment: DeltaSegment) -> None:
+        """
+        Публикация нового дельта-сегмента. Векторы его документов сразу вычисляются
+        для методов, индексы которых загружены.
+
+        :param segment: Сегмент.
+        """
+        for method in self.METHODS:
+            if segment.documents and self._index_loaded(method):
+                self._delta_matrix(segment, method)
+        self._segment = segment
+        # Ключ кэша содержит поколение сегмента: прежние записи больше не будут прочитаны
+        self.result_cache.clear()
+        if self._merger is not None and segment.size >= self.merge_max_delta:
+            self._merge_wakeup.set()
+
+    def _index_loaded(self, method: str) -> bool:
+        """
+        Загружен ли основной индекс метода.
+
+        :param method: Метод поиска.
+        :return: True, если индекс загружен.
+        """
+        index = {'tf-idf': self.tfidf_inverted_index, 'bm25': self.bm25_index, 'bert': self.bert_embeddings}[method]
+        return method not in self._pending_indexes and index is not None
+
+    def _delta_matrix(self, segment: DeltaSegment, method: str) -> object:
+        """
+        Векторы документов дельта-сегмента для метода. Недостающие векторы
+        вычисляются одним пакетом по основному индексу метода: для TF-IDF — его
+        векторизатором, для BM25 — его словарём и статистиками, для BERT кодируются
+        только документы, у которых ещё нет эмбеддинга.
+
+        :param segment: Дельта-сегмент.
+        :param method: Метод поиска.
+        :return: Матрица векторов (len(segment.documents), размерность).
+        """
+        if any(method not in doc.vectors for doc in segment.documents):
+            with self._index_lock:
+                missing = [doc for doc in segment.documents if method not in doc.vectors]
+                if missing:
+                    if method == 'tf-idf':
+                        vectors = self.tfidf_vectorizer.transform([doc.processed_tfidf for doc in missing])
+                    elif method == 'bm25':
+                        vectors = self.bm25_index.transform([doc.processed_tfidf for doc in missing])
+                    else:
+                        vectors = normalize_rows(self.get_embeddings([doc.processed_bert for doc in missing]))
+                    for i, doc in enumerate(missing):
+                        doc.vectors[method] = vectors[i]
+        return segment.matrix(method)
+
+    def merge_segments(self) -> bool:
+        """
+        Слияние дельта-сегмента с основным индексом. Документы с надгробиями
+        удаляются из корпуса, документы сегмента добавляются в его конец; TF-IDF и
+        BM25 перестраиваются по уже предобработанным текстам, а матрица BERT
+        собирается из прежних эмбеддингов и эмбеддингов сегмента без повторного
+        кодирования (индексы, которые не были построены, пропускаются). Новые
+        индексы заменяют прежние, после чего сохраняются вместе с
+        хранилищем документов и кэшем корпуса (который с этого момента отражает CSV
+        с внесёнными изменениями). Изменения, сделанные во время слияния, остаются
+        в новом дельта-сегменте.
+
+        :return: True, если было что сливать.
+        """
+        with self._merge_lock:
+            snapshot = self._segment
+            if snapshot.empty:
+                return False
+            for method in self.METHODS:
+                self._require_index(method)
+            has_tfidf, has_bert = self.tfidf_vectorizer is not None, self.bert_embeddings is not None
+            bert_delta = self._delta_matrix(snapshot, 'bert') if has_bert and snapshot.documents else None
+
+            df = self.df
+            keep = np.ones(len(df), dtype=bool)
+            keep[snapshot.deleted_positions] = False
+            # Колонки, которых нет в документе сегмента (например, 'Person'), берутся из прежней версии
+            previous = df[~keep].drop_duplicates('id').set_index('id', drop=False).to_dict('index')
+            rows = []
+            for doc in snapshot.documents:
+                row = dict(previous.get(doc.id, {}))
+                row.update(doc.fields)
+                row['Processed_TFIDF'], row['Processed_BERT'] = doc.processed_tfidf, doc.processed_bert
+                rows.append(row)
+            merged = pd.concat([df[keep], pd.DataFrame(rows, columns=df.columns)], ignore_index=True)
+
+            texts = merged['Processed_TFIDF'].tolist()
+            tfidf_vectorizer, tfidf_matrix = self._fit_tfidf(texts) if has_tfidf else (None, None)
+            # Для пустого исходного корпуса индекс BM25 не строился: берутся параметры по умолчанию
+            bm25_index = (BM25Index(self.bm25_index.k1, self.bm25_index.b) if self.bm25_index is not None
+                          else BM25Index()).fit(texts)
+            storage = self.bert_quantized_index.storage if self.bert_quantized_index is not None else 'float32'
+            bert_embeddings, bert_ann_index, bert_quantized_index = None, None, None
+            if has_bert:
+                bert_parts = [np.asarray(self.bert_embeddings[keep], dtype=np.float32)]
+                if bert_delta is not None:
+                    bert_parts.append(bert_delta)
+                bert_embeddings = np.vstack(bert_parts)
+                bert_ann_index, bert_quantized_index = self._fit_bert_search_index(bert_embeddings, storage)
+            documents = DocumentStore.from_frame(merged)
+
+            with self._index_lock:
+                self._swap_version += 1
+                try:
+                    self._df, self._documents = merged, documents
+                    self.tfidf_vectorizer, self.tfidf_matrix = tfidf_vectorizer, tfidf_matrix
+                    self.tfidf_inverted_index = InvertedIndex.from_matrix(tfidf_matrix) if has_tfidf else None
+                    self.bm25_index = bm25_index
+                    self.bert_embeddings = bert_embeddings
+                    self.bert_ann_index, self.bert_quantized_index = bert_ann_index, bert_quantized_index
+                    self._bert_ivf_file = None
+                    self._segment = self._segment.rebase(snapshot, documents.ids)
+                finally:
+                    self._swap_version += 1
+                self._apply_segment(self._segment)
+
+            if has_tfidf:
+                self._save_tfidf_index()
+            self._save_bm25_index()
+            if has_bert:
+                self._save_bert_index(storage)
+            if self.document_store_dir:
+                documents.save(self.document_store_dir)
+            if self.processed_data_file:
+                self.save_processed_data(self.processed_data_file)
+            return True
+
+    def start_merger(self, interval: float = 300.0, max_delta: int = 1000) -> None:
+        """
+        Запуск фонового слияния дельта-сегмента с основным индексом: каждые interval
+        секунд, если есть изменения, и сразу, когда в сегменте накопилось max_delta
+        изменений. Несохранённые изменения сегмента живут только в памяти, поэтому
+        при завершении нужно вызвать stop_merger().
+
+        :param interval: Интервал слияния в секундах.
+        :param max_delta: Количество изменений, после которого слияние запускается досрочно.
+        """
+        if self._merger is not None:
+            return
+        self.merge_interval, self.merge_max_delta = interval, max_delta
+        self._merger_stop.clear()
+        self._merger = threading.Thread(target=self._merge_loop, name='index-merger', daemon=True)
+        self._merger.start()
+
+    def stop_merger(self, merge: bool = True) -> None:
+        """
+        Остановка фонового слияния.
 
-    def get_embeddings(self, texts: List[str], batch_size: int = 32) -> List[np.ndarray]:
+        :param merge: Слить и сохранить оставшиеся изменения.
+        """
+        if self._merger is not None:
+            self._merger_stop.set()
+            self._merge_wakeup.set()
+            self._merger.join()
+            self._merger = None
+        if merge:
+            self.merge_segments()
+
+    def _merge_loop(self) -> None:
+        """Цикл фонового слияния."""
+        while not self._merger_stop.is_set():
+            self._merge_wakeup.wait(self.merge_interval)
+            self._merge_wakeup.clear()
+            if self._merger_stop.is_set():
+                break
+            try:
+                self.merge_segments()
+            except Exception:
+                logger.exception("Index segment merge failed")
+
+    def get_embeddings(self, texts: List[str], batch_size: int = 32, store: bool = True) -> np.ndarray:
         """
         Получение эмбеддингов для заданных текстов с использованием BERT.
 
+        Если задано хранилище эмбеддингов, сначала ищутся сохранённые эмбеддинги;
+        через модель пакетами проходят только недостающие тексты (повторяющиеся — один
+        раз), и их эмбеддинги дописываются в хранилище.
+
         :param texts: Список текстов для обработки.
         :param batch_size: Размер батча для обработки.
-        :return: Список эмбеддингов.
+        :param store: Использовать ли хранилище эмбеддингов. Запросы пользователей
+            в него не пишутся, чтобы оно не росло без ограничений.
+        :return: Матрица эмбеддингов float32 размера (len(texts), hidden_size).
         """
-        embeddings = []
+        embedding_store = self.embedding_store if store else None
+        if embedding_store is None or not texts:
+            return self._encode(texts, batch_size)
+
+        keys = [self.embedding_key(text) for text in texts]
+        embeddings, found = embedding_store.get_many(keys)
+        if found.all():
+            return embeddings
+
+        missing = {}
+        for i in np.flatnonzero(~found):
+            missing.setdefault(keys[i], i)
+        encoded = self._encode([texts[i] for i in missing.values()], batch_size)
+        embedding_store.put_many(list(missing), encoded)
+        if embeddings is None:
+            embeddings = np.empty((len(texts), encoded.shape[1]), dtype=np.float32)
+        rows = {key: row for row, key in enumerate(missing)}
+        for i in np.flatnonzero(~found):
+            embeddings[i] = encoded[rows[keys[i]]]
+        return embeddings
+
+    def _encode(self, texts: List[str], batch_size: int) -> np.ndarray:
+        """
+        Эмбеддинги текстов моделью BERT (выход токена [CLS]).
+
+        :param texts: Список текстов.
+        :param batch_size: Размер батча.
+        :return: Матрица эмбеддингов float32 размера (len(texts), hidden_size).
+        """
+        import torch
+
+        embeddings = np.empty((len(texts), self.model.config.hidden_size), dtype=np.float32)
         for i in tqdm(range(0, len(texts), batch_size), desc="Processing BERT embeddings"):
             batch_texts = texts[i:i + batch_size]
-            inputs = self.tokenizer(batch_texts, return_tensors='pt', padding=True, truncation=True)
+            inputs = self.tokenizer(batch_texts, return_tensors='pt', padding=True, truncation=True,
+                                    max_length=self.bert_max_length)
             with torch.no_grad():
                 outputs = self.model(**inputs)
-                batch_embeddings = outputs.last_hidden_state[:, 0, :].numpy()
-                embeddings.extend(batch_embeddings)
+                embeddings[i:i + len(batch_texts)] = outputs.last_hidden_state[:, 0, :].numpy()
         return embeddings
 
-    def load_index(self, tfidf_pkl_file: str, bert_pkl_file: str) -> None:
+    def load_index(self, tfidf_pkl_file: str, bert_pkl_file: str, bm25_pkl_file: Optional[str] = None) -> None:
+        """
+        Загрузка ранее сохраненных индексов TF-IDF, BERT и BM25 из файлов.
+
+        :param tfidf_pkl_file: Путь к файлу PKL с моделью TF-IDF.
+        :param bert_pkl_file: Путь к файлу с эмбеддингами BERT. Матрица .npy открывается
+            через mmap; если её нет, читается файл старого формата .pkl с тем же именем.
+        :param bm25_pkl_file: Путь к файлу PKL с индексом BM25. Если файла нет,
+            индекс будет построен при первом поиске BM25.
         """
-        Загрузка ранее сохраненных индексов TF-IDF и BERT из файлов.
+        with self._load_lock:
+            self._pending_indexes.clear()
+            self._load_tfidf_index(tfidf_pkl_file)
+            self._load_bert_index(bert_pkl_file)
+            self._load_bm25_index(bm25_pkl_file)
+
+        # Закэшированные результаты относятся к прежним индексам
+        self.result_cache.clear()
+
+    def _load_tfidf_index(self, tfidf_pkl_file: str) -> None:
+        """
+        Загрузка индекса TF-IDF.
 
         :param tfidf_pkl_file: Путь к файлу PKL с моделью TF-IDF.
-        :param bert_pkl_file: Путь к файлу PKL с эмбеддингами BERT.
         """
         with open(tfidf_pkl_file, 'rb') as f:
             self.tfidf_vectorizer, self.tfidf_matrix = pickle.load(f)
+        # В старых файлах препроцессором был метод прежнего объекта InformationRetrieval
+        self.tfidf_vectorizer.preprocessor = self.preprocessor.preprocess_tf_idf
+        self.tfidf_inverted_index = InvertedIndex.from_matrix(self.tfidf_matrix)
+
+    def _load_bert_index(self, bert_pkl_file: str) -> None:
+        """
+        Загрузка эмбеддингов BERT и поискового индекса в формате из заголовка.
+
+        :param bert_pkl_file: Путь к файлу с эмбеддингами BERT.
+        """
+        bert_base = os.path.splitext(bert_pkl_file)[0]
+        bert_header = {}
+        if os.path.exists(bert_base + '.npy'):
+            self.bert_embeddings, bert_header = load_embedding_matrix(bert_base + '.npy')
+        else:
+            # Старый формат: список векторов, сохранённый joblib, без нормализации
+            with open(bert_base + '.pkl', 'rb') as f:
+                self.bert_embeddings = normalize_rows(np.vstack(joblib.load(f)))
+
+        # Формат поискового индекса выбирается при индексации и записан в заголовке
+        storage = bert_header.get('storage', 'float32')
+        self._bert_ivf_file = None
+        if storage != 'float32':
+            self.bert_quantized_index = joblib.load(f'{bert_base}_{storage}.pkl', mmap_mode='r')
+        elif os.path.exists(bert_base + '_ivf.pkl'):
+            # Индекс IVF хранит свою копию векторов и нужен только поиску с nprobe (см. _ann_index)
+            self.bert_ann_index = None
+            self._bert_ivf_file = bert_base + '_ivf.pkl'
+
+    def _load_bm25_index(self, bm25_pkl_file: Optional[str]) -> None:
+        """
+        Загрузка индекса BM25, если файл существует.
 
-        with open(bert_pkl_file, 'rb') as f:
-            self.bert_embeddings = joblib.load(f)
+        :param bm25_pkl_file: Путь к файлу PKL с индексом BM25.
+        """
+        if bm25_pkl_file and os.path.exists(bm25_pkl_file):
+            with open(bm25_pkl_file, 'rb') as f:
+                self.bm25_index = pickle.load(f)
+
+    def embed_query(self, query: str) -> np.ndarray:
+        """
+        Эмбеддинг запроса с кэшированием по нормализованному тексту запроса.
+
+        :param query: Запрос.
+        :return: Эмбеддинг (hidden_size,), только для чтения.
+        """
+        processed_query = self.preprocess_text_bert(query)
+        embedding = self.embedding_cache.get(processed_query)
+        if embedding is None:
+            if self.batch_max_size > 1:
+                # Копия строки, чтобы кэш не удерживал матрицу всего пакета
+                embedding = self.query_batcher(processed_query).copy()
+            else:
+                embedding = self.get_embeddings([processed_query], store=False)[0]
+            embedding.flags.writeable = False
+            self.embedding_cache.set(processed_query, embedding)
+        return embedding
+
+    @property
+    def query_batcher(self) -> MicroBatcher:
+        """Планировщик, объединяющий одновременные запросы BERT в пакеты."""
+        if self._query_batcher is None:
+            with self._load_lock:
+                if self._query_batcher is None:
+                    self._query_batcher = MicroBatcher(
+                        lambda texts: self.get_embeddings(texts, batch_size=len(texts), store=False),
+                        max_batch_size=self.batch_max_size, max_wait_ms=self.batch_wait_ms)
+        return self._query_batcher
 
-    def search_tfidf(self, query: str, top_n: int = 5) -> List[Tuple[int, str, str]]:
+    def _cached_ranking(self, query: str, method: Hashable, top_n: int, rank: Callable[[], np.ndarray],
+                        generation: int = 0) -> np.ndarray:
+        """
+        Ранжирование с кэшированием по ключу (нормализованный запрос, метод, top_n,
+        поколение дельта-сегмента).
+
+        Запрос нормализуется так же, как для BERT (регистр, пунктуация, цифры,
+        пробелы): после такой нормализации лемматизация TF-IDF и BM25 даёт те же
+        токены, поэтому ключ подходит для всех методов.
+
+        :param query: Запрос.
+        :param method: Метод поиска вместе с параметрами, влияющими на результат.
+        :param top_n: Количество результатов.
+        :param rank: Функция ранжирования, вызываемая при промахе кэша.
+        :param generation: Поколение дельта-сегмента, по которому ранжируются документы.
+        :return: Номера документов в порядке убывания оценки, только для чтения.
+        """
+        key = (self.preprocess_text_bert(query), method, top_n, generation)
+        top_indices = self.result_cache.get(key)
+        if top_indices is None:
+            top_indices = np.asarray(rank())
+            top_indices.flags.writeable = False
+            self.result_cache.set(key, top_indices)
+        return top_indices
+
+    def cache_stats(self) -> Dict[str, Dict[str, int]]:
+        """
+        Статистика кэшей эмбеддингов и результатов.
+
+        :return: Словарь {'embeddings': ..., 'results': ...} со счётчиками LRUCache.stats().
+        """
+        return {'embeddings': self.embedding_cache.stats(), 'results': self.result_cache.stats()}
+
+    def search_tfidf(self, query: str, top_n: int = 5, strategy: str = 'exhaustive') -> List[Tuple[int, str, str]]:
         """
         Поиск по индексам TF-IDF.
 
+        Оценки накапливаются по инвертированному индексу только для документов,
+        содержащих термины запроса.
+
+        :param query: Запрос для поиска.
+        :param top_n: Количество результатов для возврата.
+        :param strategy: Стратегия обхода индекса: 'exhaustive' или 'maxscore'.
+        :return: Список кортежей (id документа, текст, ссылка).
+        """
+        self._require_index('tf-idf')
+
+        def rank(segment: DeltaSegment) -> np.ndarray:
+            query_vector = self.tfidf_vectorizer.transform([query])
+            # Документы с надгробиями отбрасываются, поэтому из основного индекса берётся запас
+            base_ids, base_scores = self.tfidf_inverted_index.search(
+                query_vector, top_n + len(segment.deleted_positions), strategy=strategy)
+            return self._merge_delta(segment, 'tf-idf', base_ids, base_scores, query_vector, top_n)
+
+        # Обе стратегии дают одинаковый результат, поэтому стратегия не входит в ключ кэша
+        return self._search(query, 'tf-idf', top_n, rank)
+
+    def search_bm25(self, query: str, top_n: int = 5) -> List[Tuple[int, str, str]]:
+        """
+        Поиск с ранжированием BM25.
+
         :param query: Запрос для поиска.
         :param top_n: Количество результатов для возврата.
         :return: Список кортежей (id документа, текст, ссылка).
         """
-        query_vector = self.tfidf_vectorizer.transform([query])
-        scores = np.array(query_vector.dot(self.tfidf_matrix.T).toarray()).flatten()
-        top_indices = np.argsort(scores)[::-1][:top_n]
+        self._require_index('bm25')
 
-        return [(self.df.iloc[i]['id'], self.df.iloc[i]['Category'], self.df.iloc[i]['Text'], self.df.iloc[i]['Link']) for i in top_indices]
+        def rank(segment: DeltaSegment) -> np.ndarray:
+            tokens = self.preprocess_text_tf_idf(query).split()
+            base_ids, base_scores = self.bm25_index.search(tokens, top_n + len(segment.deleted_positions))
+            return self._merge_delta(segment, 'bm25', base_ids, base_scores,
+                                     lambda: self.bm25_index.query_vector(tokens), top_n)
 
-    def search_bert(self, query: str, top_n: int = 5) -> List[Tuple[int, str, str]]:
+        return self._search(query, 'bm25', top_n, rank)
+
+    def search_bert(self, query: str, top_n: int = 5, nprobe: Optional[int] = None) -> List[Tuple[int, str, str]]:
         """
         Поиск по индексам BERT.
 
+        Если задан nprobe (или bert_nprobe при инициализации) и построен индекс IVF,
+        поиск идёт только по nprobe ближайшим кластерам. Если индекс построен в
+        сжатом формате (int8/pq), перебираются коды с необязательным точным
+        переранжированием. Иначе — точный перебор.
+
         :param query: Запрос для поиска.
         :param top_n: Количество результатов для возврата.
+        :param nprobe: Количество просматриваемых кластеров IVF.
         :return: Список кортежей (id документа, текст, ссылка).
         """
-        processed_query = self.preprocess_text_bert(query)
-        query_embedding = self.get_embeddings([processed_query])[0].reshape(1, -1)
+        self._require_index('bert')
 
-        similarities = cosine_similarity(query_embedding, self.bert_embeddings).flatten()
-        similarities = (similarities - np.min(similarities)) / (np.max(similarities) - np.min(similarities))
+        def rank(segment: DeltaSegment) -> np.ndarray:
+            query_embedding = self.embed_query(query)
+            base_ids, base_scores = self._rank_bert(query_embedding, top_n + len(segment.deleted_positions), nprobe)
+            return self._merge_delta(segment, 'bert', base_ids, base_scores,
+                                     lambda: normalize_rows(query_embedding.reshape(1, -1))[0], top_n)
 
-        top_indices = np.argsort(similarities)[::-1][:top_n]
+        return self._search(query, ('bert', nprobe), top_n, rank)
 
-        return [(self.df.iloc[i]['id'], self.df.iloc[i]['Category'], self.df.iloc[i]['Text'], self.df.iloc[i]['Link']) for i in top_indices]
+    def _ann_index(self, nprobe: Optional[int]) -> Optional[IVFIndex]:
+        """
+        Индекс IVF для поиска по nprobe кластерам. Сохранённый индекс загружается при
+        первом таком поиске через отображение в память, поэтому воркеры разделяют его
+        копию векторов, а без nprobe он не загружается вовсе.
+
+        :param nprobe: Количество просматриваемых кластеров.
+        :return: Индекс или None, если nprobe не задан или индекс не построен.
+        """
+        if not nprobe:
+            return None
+        if self.bert_ann_index is None and self._bert_ivf_file is not None:
+            with self._load_lock:
+                if self.bert_ann_index is None and self._bert_ivf_file is not None:
+                    self.bert_ann_index = joblib.load(self._bert_ivf_file, mmap_mode='r')
+        return self.bert_ann_index
+
+    def _rank_bert(self, query_embedding: np.ndarray, top_n: int, nprobe: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Ранжирование документов по эмбеддингу запроса.
+
+        :param query_embedding: Эмбеддинг запроса (hidden_size,).
+        :param top_n: Количество результатов для возврата.
+        :param nprobe: Количество просматриваемых кластеров IVF.
+        :return: Кортеж (номера документов в порядке убывания близости, оценки).
+        """
+        nprobe = nprobe if nprobe is not None else self.bert_nprobe
+
+        ann_index = self._ann_index(nprobe)
+        if ann_index is not None:
+            return ann_index.search(query_embedding, top_n, nprobe=nprobe)
+        if self.bert_quantized_index is not None:
+            rerank_vectors = self.bert_embeddings if self.bert_rerank else None
+            return self.bert_quantized_index.search(query_embedding, top_n, rerank_vectors=rerank_vectors)
+        # Эмбеддинги корпуса уже нормализованы: косинусная близость — одно произведение матрицы на вектор
+        similarities = self.bert_embeddings @ normalize_rows(query_embedding.reshape(1, -1))[0]
+        top_indices = top_k(similarities, top_n)
+        return top_indices, similarities[top_indices]
+
+    def _search(self, query: str, method: Hashable, top_n: int,
+                rank: Callable[[DeltaSegment], np.ndarray]) -> List[Tuple[int, str, str, str]]:
+        """
+        Ранжирование с кэшированием и сборка результатов по согласованному состоянию
+        основного индекса и дельта-сегмента.
+
+        :param query: Запрос.
+        :param method: Метод поиска вместе с параметрами, влияющими на результат.
+        :param top_n: Количество результатов.
+        :param rank: Функция ранжирования с учётом дельта-сегмента.
+        :return: Список кортежей (id документа, категория, текст, ссылка).
+        """
+        return self._read_consistent(lambda segment: self._hydrate(self._cached_ranking(
+            query, method, top_n, lambda: rank(segment), segment.generation), segment))
+
+    def _read_consistent(self, read: Callable[[DeltaSegment], object]) -> object:
+        """
+        Чтение индексов без блокировки, согласованное со слиянием сегментов: слияние
+        увеличивает _swap_version до и после замены основного индекса, и чтение,
+        во время которого счётчик изменился, повторяется (даже если оно завершилось
+        ошибкой из-за несогласованного состояния).
+
+        :param read: Функция чтения, получающая текущий дельта-сегмент.
+        :return: Результат read.
+        """
+        while True:
+            version = self._swap_version
+            if version % 2:
+                # Основной индекс заменяется: ждём окончания замены
+                with self._index_lock:
+                    pass
+                continue
+            try:
+                result = read(self._segment)
+            except Exception:
+                if self._swap_version == version:
+                    raise
+                continue
+            if self._swap_version == version:
+                return result
+
+    def _merge_delta(self, segment: DeltaSegment, method: str, base_ids: np.ndarray, base_scores: np.ndarray,
+                     query_vector, top_n: int) -> np.ndarray:
+        """
+        Объединение результатов основного индекса с документами дельта-сегмента.
+
+        :param segment: Дельта-сегмент.
+        :param method: Метод поиска.
+        :param base_ids: Номера документов основного индекса с запасом на надгробия.
+        :param base_scores: Их оценки.
+        :param query_vector: Вектор запроса в пространстве метода (разреженная строка
+            или нормализованный эмбеддинг) либо функция, которая его вычисляет.
+        :param top_n: Количество результатов.
+        :return: Номера документов в порядке убывания оценки.
+        """
+        if segment.empty:
+            return base_ids[:top_n]
+        delta_scores = np.empty(0)
+        if segment.documents:
+            query_vector = query_vector() if callable(query_vector) else query_vector
+            matrix = self._delta_matrix(segment, method)
+            if method == 'bert':
+                delta_scores = matrix @ query_vector
+            else:
+                delta_scores = (matrix @ query_vector.T).toarray().ravel()
+        return merge_rankings(base_ids, base_scores, segment, delta_scores, len(self.documents), top_n)
+
+    def search_many(self, queries: List[str], method: str = 'tf-idf', top_n: int = 5,
+                    query_block_size: int = 256) -> List[List[Tuple[int, str, str]]]:
+        """
+        Пакетный поиск по списку запросов.
+
+        Все запросы предобрабатываются сразу и оцениваются одним матричным
+        произведением: для TF-IDF и BM25 — разреженные запросы × индекс, для BERT —
+        один вызов get_embeddings на все запросы и произведение плотных матриц
+        (блоками по query_block_size запросов, чтобы ограничить память).
+
+        :param queries: Список запросов.
+        :param method: Метод поиска: 'tf-idf', 'bm25' или 'bert'.
+        :param top_n: Количество результатов для каждого запроса.
+        :param query_block_size: Количество запросов в одном блоке произведения BERT.
+        :return: Списки кортежей (id документа, текст, ссылка) в порядке запросов.
+        """
+        self._require_index(method)
+        if method not in self.METHODS:
+            raise ValueError(f"Неподдерживаемый метод поиска: {method}")
+
+        def read(segment: DeltaSegment) -> List[List[Tuple[int, str, str]]]:
+            # Запас на документы основного индекса с надгробиями
+            n = top_n + len(segment.deleted_positions)
+            if method == 'tf-idf':
+                query_vectors = self.tfidf_vectorizer.transform(queries)
+                ranked = self.tfidf_inverted_index.search_many(query_vectors, n)
+            elif method == 'bm25':
+                tokens = [self.preprocess_text_tf_idf(query).split() for query in queries]
+                query_vectors = self.bm25_index.query_matrix(tokens)
+                ranked = self.bm25_index.search_many(tokens, n)
+            else:
+                embeddings = self.get_embeddings([self.preprocess_text_bert(query) for query in queries], store=False)
+                query_vectors = normalize_rows(embeddings)
+                if self._ann_index(self.bert_nprobe) is not None or self.bert_quantized_index is not None:
+                    ranked = [self._rank_bert(embedding, n) for embedding in embeddings]
+                else:
+                    ranked = []
+                    for i in range(0, query_vectors.shape[0], query_block_size):
+                        similarities = query_vectors[i:i + query_block_size] @ self.bert_embeddings.T
+                        for row in similarities:
+                            best = top_k(row, n)
+                            ranked.append((best, row[best]))
+
+            top_indices = [self._merge_delta(segment, method, indices, scores, query_vectors[i], top_n)
+                           for i, (indices, scores) in enumerate(ranked)]
+            return [self._hydrate(indices, segment) for indices in top_indices]
+
+        return self._read_consistent(read)
+
+    def _hydrate(self, top_indices: np.ndarray, segment: Optional[DeltaSegment] = None) -> List[Tuple[int, str, str]]:
+        """
+        Сборка результатов поиска по номерам документов.
+
+        :param top_indices: Номера документов в корпусе; номера от размера корпуса и
+            больше относятся к документам дельта-сегмента.
+        :param segment: Дельта-сегмент, по которому получены номера.
+        :return: Список кортежей (id документа, категория, текст, ссылка).
+        """
+        if segment is None or not segment.documents:
+            return self.documents.gather(top_indices)
+        return delta_results(top_indices, segment, len(self.documents), self.documents.gather)
 
     def evaluate_relevance(self, query: str, response: str) -> float:
         """
@@ -184,10 +1122,11 @@ class InformationRetrieval:
         :param response: Ответ на запрос.
         :return: Оценка релевантности (косинусное сходство).
         """
-        processed_query = self.preprocess_text_bert(query)
+        from sklearn.metrics.pairwise import cosine_similarity
+
         processed_response = self.preprocess_text_bert(response)
 
-        query_embedding = self.get_embeddings([processed_query])[0].reshape(1, -1)
+        query_embedding = self.embed_query(query).reshape(1, -1)
         response_embedding = self.get_embeddings([processed_response])[0].reshape(1, -1)
 
         relevance_score = cosine_similarity(query_embedding, response_embedding).flatten()[0]
@@ -195,18 +1134,18 @@ class InformationRetrieval:
 
     def save_processed_data(self, file_path: str) -> None:
         """
-        Сохранение предобработанных данных в файл.
+        Сохранение предобработанных данных в кэш по столбцам с отпечатком CSV и хэшем настроек предобработки.
 
-        :param file_path: Путь к файлу для сохранения.
+        :param file_path: Каталог кэша.
         """
-        with open(file_path, 'wb') as f:
-            pickle.dump(self.df, f)
+        save_frame(file_path, self.df, source=file_fingerprint(self.csv_file),
+                   settings=self.preprocessor.settings_hash())
 
-    def load_processed_data(self, file_path: str) -> None:
+    def load_processed_data(self, file_path: str, columns: Optional[List[str]] = None) -> None:
         """
-        Загрузка предобработанных данных из файла.
+        Загрузка предобработанных данных из кэша.
 
-        :param file_path: Путь к файлу для загрузки.
+        :param file_path: Каталог кэша.
+        :param columns: Загружаемые столбцы; None — все.
         """
-        with open(file_path, 'rb') as f:
-            self.df = pickle.load(f)
\ No newline at end of file
+        self.df = load_frame(file_path, columns)
\ No newline at end of file
@@ -0,0 +1,234 @@
+import numpy as np
+from scipy import sparse
+from typing import List, Tuple
+from ranking import top_k
+
+
+class InvertedIndex:
+    """
+    Инвертированный индекс над разреженной матрицей документ × термин.
+
+    Для каждого термина хранится список постингов (id документов и веса) в трёх
+    плотных массивах в формате CSR по терминам: indptr, doc_ids и weights.
+    Поиск накапливает оценки только для документов-кандидатов из списков
+    терминов запроса и поддерживает досрочное отсечение MaxScore для top-k.
+    """
+
+    STRATEGIES = ('exhaustive', 'maxscore')
+
+    def __init__(self, indptr: np.ndarray, doc_ids: np.ndarray, weights: np.ndarray, n_docs: int) -> None:
+        """
+        Инициализация индекса из готовых массивов постингов.
+
+        :param indptr: Границы списков постингов по терминам (длина n_terms + 1).
+        :param doc_ids: Id документов, отсортированные внутри каждого списка.
+        :param weights: Веса термина в документе.
+        :param n_docs: Количество документов в корпусе.
+        """
+        self.indptr = np.asarray(indptr, dtype=np.int64)
+        self.doc_ids = np.asarray(doc_ids, dtype=np.int32)
+        self.weights = np.asarray(weights)
+        self.n_docs = int(n_docs)
+        self.n_terms = self.indptr.shape[0] - 1
+
+        # Максимальный вес каждого термина — верхняя граница его вклада в оценку
+        self.max_weights = np.zeros(self.n_terms, dtype=self.weights.dtype)
+        non_empty = np.diff(self.indptr) > 0
+        if non_empty.any():
+            self.max_weights[non_empty] = np.maximum.reduceat(self.weights, self.indptr[:-1][non_empty])
+
+    @classmethod
+    def from_matrix(cls, matrix: sparse.spmatrix) -> 'InvertedIndex':
+        """
+        Построение индекса из матрицы документ × термин (например, результата TfidfVectorizer).
+
+        :param matrix: Разреженная матрица размера (n_docs, n_terms).
+        :return: Инвертированный индекс.
+        """
+        by_term = sparse.csc_matrix(matrix)
+        by_term.sum_duplicates()
+        by_term.sort_indices()
+        return cls(by_term.indptr, by_term.indices, by_term.data, by_term.shape[0])
+
+    def postings(self, term_id: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Список постингов термина.
+
+        :param term_id: Номер термина в словаре.
+        :return: Кортеж (id документов, веса).
+        """
+        start, end = self.indptr[term_id], self.indptr[term_id + 1]
+        return self.doc_ids[start:end], self.weights[start:end]
+
+    def search(self, query_vector: sparse.spmatrix, top_n: int = 5, strategy: str = 'exhaustive') -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Поиск top_n документов по скалярному произведению с вектором запроса.
+
+        Результат совпадает с плотным ранжированием query_vector · matrix.T через
+        ranking.top_k: если кандидатов меньше top_n, ответ дополняется документами
+        с нулевой оценкой в порядке возрастания id.
+
+        :param query_vector: Вектор запроса размера (1, n_terms).
+        :param top_n: Количество результатов для возврата.
+        :param strategy: 'exhaustive' — оценить всех кандидатов, 'maxscore' — отсекать
+            документы, которые уже не могут попасть в top_n.
+        :return: Кортеж (id документов, оценки).
+        """
+        if strategy not in self.STRATEGIES:
+            raise ValueError(f"Неизвестная стратегия поиска: {strategy}")
+
+        query = sparse.csr_matrix(query_vector)
+        query.sum_duplicates()
+        terms = query.indices[query.data != 0].astype(np.int64)
+        query_weights = query.data[query.data != 0]
+        top_n = min(int(top_n), self.n_docs)
+
+        if strategy == 'maxscore' and terms.shape[0] > 1:
+            candidates = self._maxscore_candidates(terms, query_weights, top_n)
+            scores = self._score_candidates(candidates, terms, query_weights)
+        else:
+            candidates, scores = self._accumulate(terms, query_weights)
+
+        best = top_k(scores, top_n)
+        doc_ids, doc_scores = candidates[best].astype(np.int64), scores[best]
+        return self._pad_with_zeros(doc_ids, doc_scores, candidates, top_n)
+
+    def search_many(self, query_matrix: sparse.spmatrix, top_n: int = 5) -> List[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Пакетный поиск: оценки всех запросов считаются одним произведением
+        разреженных матриц (запросы × термины) · (термины × документы).
+
+        :param query_matrix: Матрица запросов размера (n_queries, n_terms).
+        :param top_n: Количество результатов для каждого запроса.
+        :return: Список кортежей (id документов, оценки) в порядке запросов.
+        """
+        scores = sparse.csr_matrix(query_matrix) @ self.as_matrix()
+        scores.sort_indices()
+        top_n = min(int(top_n), self.n_docs)
+
+        results = []
+        for row in range(scores.shape[0]):
+            start, end = scores.indptr[row], scores.indptr[row + 1]
+            candidates, row_scores = scores.indices[start:end], scores.data[start:end]
+            best = top_k(row_scores, top_n)
+            results.append(self._pad_with_zeros(candidates[best].astype(np.int64), row_scores[best], candidates, top_n))
+        return results
+
+    def as_matrix(self) -> sparse.csr_matrix:
+        """
+        Представление индекса матрицей термин × документ без копирования массивов.
+
+        :return: Разреженная матрица размера (n_terms, n_docs).
+        """
+        return sparse.csr_matrix((self.weights, self.doc_ids, self.indptr), shape=(self.n_terms, self.n_docs), copy=False)
+
+    def _accumulate(self, terms: np.ndarray, query_weights: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Полное накопление оценок всех документов из списков терминов запроса.
+
+        :param terms: Номера терминов запроса.
+        :param query_weights: Веса терминов в запросе.
+        :return: Кортеж (отсортированные id кандидатов, их оценки).
+        """
+        if terms.shape[0] == 0:
+            return np.empty(0, dtype=np.int32), np.empty(0, dtype=self.weights.dtype)
+
+        ids = [self.postings(t)[0] for t in terms]
+        contributions = [self.postings(t)[1] * w for t, w in zip(terms, query_weights)]
+        candidates, inverse = np.unique(np.concatenate(ids), return_inverse=True)
+        scores = np.bincount(inverse, weights=np.concatenate(contributions), minlength=candidates.shape[0])
+        return candidates, scores
+
+    def _maxscore_candidates(self, terms: np.ndarray, query_weights: np.ndarray, top_n: int) -> np.ndarray:
+        """
+        Отбор кандидатов по схеме MaxScore (term-at-a-time).
+
+        Термины обрабатываются по убыванию верхней границы вклада. Как только
+        сумма границ оставшихся терминов становится меньше текущего порога top_n,
+        новые документы больше не добавляются, а кандидаты, которые не могут
+        догнать порог, отбрасываются.
+
+        :param terms: Номера терминов запроса.
+        :param query_weights: Веса терминов в запросе.
+        :param top_n: Количество результатов.
+        :return: Отсортированные id документов, которые могут попасть в top_n.
+        """
+        bounds = self.max_weights[terms] * query_weights
+        order = np.argsort(-bounds, kind='stable')
+        # rest[j] — максимально возможный вклад терминов order[j:]
+        rest = np.concatenate([np.cumsum(bounds[order][::-1])[::-1], [0.0]])
+
+        candidates = np.empty(0, dtype=np.int32)
+        partial = np.empty(0, dtype=np.float64)
+        threshold = -np.inf
+
+        for j, position in enumerate(order):
+            ids, weights = self.postings(terms[position])
+            contribution = weights * query_weights[position]
+
+            if candidates.shape[0] >= top_n and rest[j] < threshold:
+                # Новые документы уже не наберут порог: обновляем только существующих кандидатов
+                found, matched = self._lookup(ids, candidates)
+                partial[found] += contribution[matched]
+            else:
+                merged, inverse = np.unique(np.concatenate([candidates, ids]), return_inverse=True)
+                partial = np.bincount(inverse, weights=np.concatenate([partial, contribution]), minlength=merged.shape[0])
+                candidates = merged
+
+            if candidates.shape[0] > top_n:
+                threshold = np.partition(partial, partial.shape[0] - top_n)[partial.shape[0] - top_n]
+                # Небольшой допуск защищает от ошибок округления при другом порядке суммирования
+                keep = partial + rest[j + 1] >= threshold - 1e-9 * abs(threshold)
+                candidates, partial = candidates[keep], partial[keep]
+
+        return candidates
+
+    def _score_candidates(self, candidates: np.ndarray, terms: np.ndarray, query_weights: np.ndarray) -> np.ndarray:
+        """
+        Точные оценки кандидатов в том же порядке суммирования, что и при полном накоплении.
+
+        :param candidates: Отсортированные id документов.
+        :param terms: Номера терминов запроса.
+        :param query_weights: Веса терминов в запросе.
+        :return: Оценки кандидатов.
+        """
+        scores = np.zeros(candidates.shape[0], dtype=np.result_type(self.weights.dtype, query_weights.dtype))
+        for term, weight in zip(terms, query_weights):
+            ids, weights = self.postings(term)
+            found, matched = self._lookup(ids, candidates)
+            scores[found] += weights[matched] * weight
+        return scores
+
+    @staticmethod
+    def _lookup(ids: np.ndarray, candidates: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Поиск кандидатов в отсортированном списке постингов.
+
+        :param ids: Отсортированные id документов списка постингов.
+        :param candidates: Отсортированные id кандидатов.
+        :return: Кортеж (позиции найденных кандидатов, соответствующие позиции в списке).
+        """
+        if ids.shape[0] == 0:
+            return np.empty(0, dtype=np.intp), np.empty(0, dtype=np.intp)
+        positions = np.searchsorted(ids, candidates)
+        clipped = np.minimum(positions, ids.shape[0] - 1)
+        found = np.flatnonzero(ids[clipped] == candidates)
+        return found, positions[found]
+
+    def _pad_with_zeros(self, doc_ids: np.ndarray, scores: np.ndarray, candidates: np.ndarray, top_n: int) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Дополнение ответа документами с нулевой оценкой, как при плотном ранжировании.
+
+        :param doc_ids: Найденные id документов.
+        :param scores: Их оценки.
+        :param candidates: Все документы, получившие оценку.
+        :param top_n: Требуемое количество результатов.
+        :return: Кортеж (id документов, оценки) длиной top_n.
+        """
+        missing = top_n - doc_ids.shape[0]
+        if missing <= 0:
+            return doc_ids, scores
+        pool = np.arange(min(self.n_docs, top_n + candidates.shape[0]))
+        padding = np.setdiff1d(pool, candidates, assume_unique=True)[:missing]
+        return (np.concatenate([doc_ids, padding]).astype(np.int64),
+                np.concatenate([scores, np.zeros(padding.shape[0], dtype=scores.dtype)]))
@@ -1,17 +1,40 @@
-from fastapi import FastAPI, Request
+import asyncio
+from contextlib import asynccontextmanager
+from fastapi import FastAPI, HTTPException, Request
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from app.api import router as api_router
-from app.services import search
-from crud import save_query, get_saved_queries
+from app.services import search, warmup, stop_index_merger
+from app.concurrency import ServiceOverloaded, run_search, run_db, shutdown
+from app.query_log import query_log
+from app.config import CONFIG
+from cache import LRUCache
+from crud import get_top_queries
 import logging
 
 # Настройка логирования
 logging.basicConfig(level=logging.DEBUG, format="%(asctime)s - %(levelname)s - %(message)s")
 logger = logging.getLogger(__name__)
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    """
+    Жизненный цикл приложения: загрузка корпуса, индексов и моделей до приёма запросов,
+    запуск журнала запросов и фонового слияния изменений индекса; при завершении —
+    запись оставшихся запросов в базу, сохранение изменений индекса и остановка пулов потоков.
+
+    Args:
+        app (FastAPI): Экземпляр приложения.
+    """
+    warmup()
+    await query_log.start()
+    yield
+    await query_log.stop()
+    stop_index_merger()
+    shutdown()
+
 # Создание экземпляра FastAPI
-app = FastAPI()
+app = FastAPI(lifespan=lifespan)
 
 # Монтирование статических файлов
 app.mount("/static", StaticFiles(directory="app/static"), name="static")
@@ -19,6 +42,10 @@ app.mount("/static", StaticFiles(directory="app/static"), name="static")
 # Настройка шаблонов Jinja2
 templates = Jinja2Templates(directory="app/templates")
 
+# Список сохранённых запросов одинаков для всех посетителей, поэтому кэшируется
+# на короткое время: новые запросы появляются на странице с задержкой до SAVED_QUERIES_TTL секунд
+saved_queries_cache = LRUCache(max_entries=1, ttl=CONFIG.SAVED_QUERIES_TTL)
+
 @app.get("/")
 async def read_index(request: Request):
     """
@@ -43,17 +70,13 @@ async def search_page(request: Request):
     Returns:
         TemplateResponse: Ответ с шаблоном страницы поиска.
     """
-    saved_queries = get_saved_queries()
-    seen_queries = set()
-    unique_queries = []
+    key = (CONFIG.SAVED_QUERIES_LIMIT, CONFIG.SAVED_QUERIES_ORDER)
+    saved_queries = saved_queries_cache.get(key)
+    if saved_queries is None:
+        saved_queries = await run_db(get_top_queries, CONFIG.SAVED_QUERIES_LIMIT, CONFIG.SAVED_QUERIES_ORDER)
+        saved_queries_cache.set(key, saved_queries)
 
-    for query in saved_queries:
-        query_link = query['query_link']
-        if query_link not in seen_queries:
-            seen_queries.add(query_link)
-            unique_queries.append(query)
-
-    return templates.TemplateResponse("search_page.html", {"request": request, "saved_queries": unique_queries})
+    return templates.TemplateResponse("search_page.html", {"request": request, "saved_queries": saved_queries})
 
 @app.get("/results")
 async def results_page(request: Request, query: str, method: str, limit: int, relevance_score: bool):
@@ -70,12 +93,17 @@ async def results_page(request: Request, query: str, method: str, limit: int, re
     Returns:
         TemplateResponse: Ответ с шаблоном страницы результатов поиска.
     """
-    # Логика обработки запроса и получения данных
-    results, total_time = search(query, method, limit, relevance_score)
-
-    # Сохранение запроса и метода в базу данных
+    # Логика обработки запроса и получения данных в пуле поиска, не блокируя цикл событий
+    try:
+        results, total_time = await run_search(search, query, method, limit, relevance_score)
+    except ServiceOverloaded as e:
+        raise HTTPException(status_code=503, detail=str(e), headers={"Retry-After": "1"})
+    except asyncio.TimeoutError:
+        raise HTTPException(status_code=504, detail="Превышено время выполнения поиска")
+
+    # Запрос ставится в очередь журнала и записывается в базу данных фоновой задачей
     query_link = f"/results?query={query}&method={method}&limit={limit}&relevance_score={relevance_score}"
-    save_query(query, method, query_link)
+    query_log.record(query, method, query_link, total_time)
 
     # Передаем результаты и время в шаблон
     return templates.TemplateResponse("result_page.html", {
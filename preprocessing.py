@@ -0,0 +1,213 @@
+import os
+import re
+import string
+import pickle
+import hashlib
+import itertools
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from atomic_io import replacing
+
+
+class TextPreprocessor:
+    """
+    Предобработка текстов для TF-IDF/BM25 и BERT с кэшем лемм.
+
+    Таблица удаления пунктуации и регулярные выражения компилируются один раз,
+    а каждая словоформа разбирается pymorphy2 только при первой встрече: дальше
+    лемма берётся из словаря. Словарь ограничен по размеру, сохраняется на диск
+    и передаётся в процессы-воркеры вместе с объектом (анализатор pymorphy2 при
+    этом не сериализуется и создаётся заново в каждом процессе). Анализатор и
+    стоп-слова NLTK загружаются при первом обращении.
+    """
+
+    # Увеличивается при любом изменении алгоритма предобработки: по нему кэш
+    # предобработанного корпуса признаётся устаревшим
+    VERSION = 1
+
+    def __init__(self, stop_words: Optional[Iterable[str]] = None, max_lemmas: int = 500_000) -> None:
+        """
+        Инициализация препроцессора.
+
+        :param stop_words: Стоп-слова. По умолчанию — русские стоп-слова NLTK.
+        :param max_lemmas: Максимальное количество словоформ в кэше лемм; после
+            заполнения новые словоформы разбираются без сохранения.
+        """
+        self._stop_words = set(stop_words) if stop_words is not None else None
+        self.max_lemmas = max_lemmas
+        self.lemmas: Dict[str, str] = {}
+        self._morph = None
+        self._punctuation = str.maketrans('', '', string.punctuation)
+        self._digits = re.compile(r'\d+')
+        self._spaces = re.compile(r'\s+')
+
+    @property
+    def morph(self):
+        """Морфологический анализатор pymorphy2, создаваемый при первом обращении."""
+        if self._morph is None:
+            import pymorphy2
+            self._morph = pymorphy2.MorphAnalyzer()
+        return self._morph
+
+    @property
+    def stop_words(self) -> Set[str]:
+        """Стоп-слова; по умолчанию русские стоп-слова NLTK, загружаемые при первом обращении."""
+        if self._stop_words is None:
+            from nltk.corpus import stopwords
+            self._stop_words = set(stopwords.words('russian'))
+        return self._stop_words
+
+    def __getstate__(self) -> Dict:
+        state = self.__dict__.copy()
+        state['_morph'] = None
+        return state
+
+    def settings_hash(self) -> str:
+        """
+        Хэш настроек, от которых зависит результат предобработки: версии алгоритма и стоп-слов.
+
+        :return: Шестнадцатеричный SHA-256.
+        """
+        settings = f"{self.VERSION}\n" + '\n'.join(sorted(self.stop_words))
+        return hashlib.sha256(settings.encode('utf-8')).hexdigest()
+
+    def normalize(self, text: str) -> str:
+        """
+        Преобразование в нижний регистр, удаление пунктуации и цифр.
+
+        :param text: Исходный текст.
+        :return: Нормализованный текст.
+        """
+        return self._digits.sub('', text.lower().translate(self._punctuation))
+
+    def lemmatize(self, token: str) -> str:
+        """
+        Нормальная форма слова с кэшированием.
+
+        :param token: Словоформа.
+        :return: Лемма.
+        """
+        lemma = self.lemmas.get(token)
+        if lemma is None:
+            lemma = self.morph.parse(token)[0].normal_form
+            if len(self.lemmas) < self.max_lemmas:
+                self.lemmas[token] = lemma
+        return lemma
+
+    def preprocess_tf_idf(self, text: str) -> str:
+        """
+        Предобработка текста для TF-IDF и BM25: нормализация, удаление стоп-слов
+        и лемматизация.
+
+        :param text: Исходный текст.
+        :return: Обработанный текст.
+        """
+        lemmas = self.lemmas
+        stop_words = self.stop_words
+        processed_tokens = []
+        for token in self.normalize(text).split():
+            if token in stop_words:
+                continue
+            lemma = lemmas.get(token)
+            processed_tokens.append(lemma if lemma is not None else self.lemmatize(token))
+        return ' '.join(processed_tokens)
+
+    def preprocess_bert(self, text: str) -> str:
+        """
+        Предобработка текста для BERT: нормализация и схлопывание пробелов.
+
+        :param text: Исходный текст.
+        :return: Обработанный текст.
+        """
+        return self._spaces.sub(' ', self.normalize(text)).strip()
+
+    def save_lemmas(self, file_path: str) -> None:
+        """
+        Сохранение кэша лемм в файл с атомарной заменой: прерванная запись не
+        оставляет испорченный кэш.
+
+        :param file_path: Путь к файлу PKL.
+        """
+        with replacing(file_path) as f:
+            pickle.dump(self.lemmas, f)
+
+    def load_lemmas(self, file_path: str) -> bool:
+        """
+        Загрузка кэша лемм из файла, если он существует.
+
+        :param file_path: Путь к файлу PKL.
+        :return: True, если кэш загружен.
+        """
+        if not os.path.exists(file_path):
+            return False
+        with open(file_path, 'rb') as f:
+            self.lemmas.update(pickle.load(f))
+        return True
+
+
+# Препроцессор процесса-воркера и количество лемм его кэша, уже отправленных в основной процесс
+_worker_preprocessor: Optional[TextPreprocessor] = None
+_worker_reported_lemmas = 0
+
+
+def _init_worker(preprocessor: TextPreprocessor) -> None:
+    """
+    Инициализация процесса-воркера: копия препроцессора со своим MorphAnalyzer.
+
+    :param preprocessor: Препроцессор основного процесса (без анализатора).
+    """
+    global _worker_preprocessor, _worker_reported_lemmas
+    _worker_preprocessor = preprocessor
+    _worker_reported_lemmas = len(preprocessor.lemmas)
+
+
+def _preprocess_chunk(texts: List[str]) -> Tuple[List[str], List[str], Dict[str, str]]:
+    """
+    Предобработка части корпуса в процессе-воркере.
+
+    :param texts: Тексты документов.
+    :return: Кортеж (тексты для TF-IDF, тексты для BERT, новые леммы воркера).
+    """
+    global _worker_reported_lemmas
+    preprocessor = _worker_preprocessor
+    tfidf_texts = [preprocessor.preprocess_tf_idf(text) for text in texts]
+    bert_texts = [preprocessor.preprocess_bert(text) for text in texts]
+    new_lemmas = dict(itertools.islice(preprocessor.lemmas.items(), _worker_reported_lemmas, None))
+    _worker_reported_lemmas = len(preprocessor.lemmas)
+    return tfidf_texts, bert_texts, new_lemmas
+
+
+def preprocess_corpus(texts: List[str], preprocessor: TextPreprocessor, n_jobs: int = 1,
+                      chunk_size: Optional[int] = None) -> Tuple[List[str], List[str]]:
+    """
+    Предобработка корпуса для TF-IDF и BERT, при n_jobs > 1 — в пуле процессов.
+
+    Документы делятся на последовательные части, каждая обрабатывается воркером
+    со своим MorphAnalyzer, результаты собираются в исходном порядке и совпадают
+    с последовательной обработкой. Леммы, найденные воркерами, добавляются в кэш
+    основного препроцессора.
+
+    :param texts: Тексты документов.
+    :param preprocessor: Препроцессор.
+    :param n_jobs: Количество процессов; -1 — по числу ядер.
+    :param chunk_size: Количество документов в одной части. По умолчанию корпус
+        делится примерно на 4 * n_jobs частей.
+    :return: Кортеж (тексты для TF-IDF, тексты для BERT).
+    """
+    if n_jobs < 0:
+        n_jobs = os.cpu_count() or 1
+    if n_jobs <= 1 or len(texts) < 2:
+        return [preprocessor.preprocess_tf_idf(text) for text in texts], [preprocessor.preprocess_bert(text) for text in texts]
+
+    chunk_size = chunk_size or max(1, -(-len(texts) // (4 * n_jobs)))
+    chunks = [texts[i:i + chunk_size] for i in range(0, len(texts), chunk_size)]
+    tfidf_texts, bert_texts = [], []
+    with ProcessPoolExecutor(max_workers=n_jobs, initializer=_init_worker, initargs=(preprocessor,)) as executor:
+        for chunk_tfidf, chunk_bert, new_lemmas in executor.map(_preprocess_chunk, chunks):
+            tfidf_texts.extend(chunk_tfidf)
+            bert_texts.extend(chunk_bert)
+            for token, lemma in new_lemmas.items():
+                if len(preprocessor.lemmas) >= preprocessor.max_lemmas:
+                    break
+                preprocessor.lemmas.setdefault(token, lemma)
+    return tfidf_texts, bert_texts
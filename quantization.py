@@ -0,0 +1,232 @@
+import numpy as np
+from typing import Optional, Tuple
+from ranking import top_k
+from vector_store import normalize_rows
+
+
+class ScalarQuantizer:
+    """
+    Скалярное квантование в int8: каждое измерение масштабируется своим
+    коэффициентом так, чтобы максимум по модулю переходил в 127.
+    Сжатие — в 4 раза относительно float32.
+    """
+
+    def __init__(self) -> None:
+        """Инициализация квантизатора."""
+        self.scales = None
+
+    def fit(self, vectors: np.ndarray) -> 'ScalarQuantizer':
+        """
+        Подбор масштабов по измерениям.
+
+        :param vectors: Матрица векторов (n, dim).
+        :return: Обученный квантизатор.
+        """
+        max_abs = np.abs(vectors).max(axis=0).astype(np.float32)
+        max_abs[max_abs == 0] = 1.0
+        self.scales = max_abs / 127
+        return self
+
+    def encode(self, vectors: np.ndarray) -> np.ndarray:
+        """
+        Кодирование векторов в int8.
+
+        :param vectors: Матрица векторов (n, dim).
+        :return: Коды int8 (n, dim).
+        """
+        return np.clip(np.rint(vectors / self.scales), -127, 127).astype(np.int8)
+
+    def scores(self, codes: np.ndarray, query: np.ndarray, batch_size: int = 4096) -> np.ndarray:
+        """
+        Приближённые скалярные произведения запроса со всеми закодированными векторами.
+
+        :param codes: Коды int8 (n, dim).
+        :param query: Вектор запроса (dim,).
+        :param batch_size: Размер блока, ограничивающий временную память.
+        :return: Оценки (n,).
+        """
+        scaled_query = (query * self.scales).astype(np.float32)
+        return np.concatenate([
+            codes[i:i + batch_size].astype(np.float32) @ scaled_query
+            for i in range(0, codes.shape[0], batch_size)
+        ]) if codes.shape[0] else np.empty(0, dtype=np.float32)
+
+
+class ProductQuantizer:
+    """
+    Продуктовое квантование: вектор делится на n_subspaces подвекторов, каждый
+    заменяется номером ближайшего из 256 центроидов своего подпространства (1 байт).
+    Оценка запроса считается асимметрично: по таблице скалярных произведений
+    запроса с центроидами (ADC), без декодирования векторов.
+    """
+
+    def __init__(self, n_subspaces: int = 96, n_iter: int = 20, max_train_points: int = 65536, seed: int = 0) -> None:
+        """
+        Инициализация параметров квантизатора.
+
+        :param n_subspaces: Количество подпространств (должно делить размерность).
+        :param n_iter: Количество итераций k-means.
+        :param max_train_points: Максимальный размер обучающей выборки.
+        :param seed: Зерно генератора случайных чисел.
+        """
+        self.n_subspaces = n_subspaces
+        self.n_centroids = 256
+        self.n_iter = n_iter
+        self.max_train_points = max_train_points
+        self.seed = seed
+        self.codebooks = None
+
+    def fit(self, vectors: np.ndarray) -> 'ProductQuantizer':
+        """
+        Обучение кодовых книг k-means в каждом подпространстве.
+
+        :param vectors: Матрица векторов (n, dim).
+        :return: Обученный квантизатор.
+        """
+        n, dim = vectors.shape
+        if dim % self.n_subspaces:
+            raise ValueError(f"Размерность {dim} не делится на количество подпространств {self.n_subspaces}")
+        rng = np.random.default_rng(self.seed)
+        sample = np.asarray(vectors[np.sort(rng.choice(n, min(n, self.max_train_points), replace=False))], dtype=np.float32)
+        sub_dim = dim // self.n_subspaces
+
+        self.codebooks = np.empty((self.n_subspaces, self.n_centroids, sub_dim), dtype=np.float32)
+        for m in range(self.n_subspaces):
+            self.codebooks[m] = self._kmeans(sample[:, m * sub_dim:(m + 1) * sub_dim], rng)
+        return self
+
+    def _kmeans(self, data: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+        """
+        K-means (евклидово расстояние) для одного подпространства.
+
+        :param data: Подвекторы обучающей выборки.
+        :param rng: Генератор случайных чисел.
+        :return: Центроиды (n_centroids, sub_dim).
+        """
+        k = self.n_centroids
+        centroids = data[rng.choice(data.shape[0], k, replace=data.shape[0] < k)].copy()
+        for _ in range(self.n_iter):
+            assignment = self._nearest(data, centroids)
+            counts = np.bincount(assignment, minlength=k)
+            sums = np.stack([np.bincount(assignment, weights=data[:, d], minlength=k) for d in range(data.shape[1])], axis=1)
+            filled = counts > 0
+            centroids[filled] = sums[filled] / counts[filled, None]
+            centroids[~filled] = data[rng.choice(data.shape[0], int((~filled).sum()))]
+        return centroids
+
+    @staticmethod
+    def _nearest(data: np.ndarray, centroids: np.ndarray) -> np.ndarray:
+        """
+        Номер ближайшего центроида для каждого подвектора.
+
+        :param data: Подвекторы.
+        :param centroids: Центроиды.
+        :return: Массив номеров центроидов.
+        """
+        distances = (centroids ** 2).sum(axis=1) - 2 * data @ centroids.T
+        return np.argmin(distances, axis=1)
+
+    def encode(self, vectors: np.ndarray, batch_size: int = 65536) -> np.ndarray:
+        """
+        Кодирование векторов номерами центроидов.
+
+        :param vectors: Матрица векторов (n, dim).
+        :param batch_size: Размер блока, ограничивающий временную память.
+        :return: Коды uint8 (n, n_subspaces), хранятся по столбцам (order='F'),
+            чтобы коды одного подпространства лежали в памяти подряд.
+        """
+        sub_dim = self.codebooks.shape[2]
+        codes = np.empty((vectors.shape[0], self.n_subspaces), dtype=np.uint8, order='F')
+        for i in range(0, vectors.shape[0], batch_size):
+            block = np.asarray(vectors[i:i + batch_size], dtype=np.float32)
+            for m in range(self.n_subspaces):
+                codes[i:i + batch_size, m] = self._nearest(block[:, m * sub_dim:(m + 1) * sub_dim], self.codebooks[m])
+        return codes
+
+    def distance_table(self, query: np.ndarray) -> np.ndarray:
+        """
+        Таблица скалярных произведений подвекторов запроса с центроидами.
+
+        :param query: Вектор запроса (dim,).
+        :return: Таблица (n_subspaces, 256).
+        """
+        sub_queries = np.asarray(query, dtype=np.float32).reshape(self.n_subspaces, -1)
+        return np.einsum('mkd,md->mk', self.codebooks, sub_queries)
+
+    def scores(self, codes: np.ndarray, query: np.ndarray) -> np.ndarray:
+        """
+        Асимметричные оценки запроса со всеми закодированными векторами.
+
+        :param codes: Коды uint8 (n, n_subspaces).
+        :param query: Вектор запроса (dim,).
+        :return: Оценки (n,).
+        """
+        table = self.distance_table(query)
+        scores = np.zeros(codes.shape[0], dtype=np.float32)
+        for m in range(self.n_subspaces):
+            scores += np.take(table[m], codes[:, m])
+        return scores
+
+
+class QuantizedIndex:
+    """
+    Сжатый индекс эмбеддингов для поиска по косинусной близости в условиях
+    ограниченной памяти: в памяти держатся только коды, а точные float32-векторы
+    (например, отображённый в память bert_index.npy) нужны лишь для
+    необязательного переранжирования короткого списка кандидатов.
+    """
+
+    STORAGES = ('int8', 'pq')
+
+    def __init__(self, storage: str = 'int8', n_subspaces: int = 96) -> None:
+        """
+        Инициализация индекса.
+
+        :param storage: Формат хранения: 'int8' (скалярное квантование) или 'pq' (продуктовое).
+        :param n_subspaces: Количество подпространств для 'pq'.
+        """
+        if storage not in self.STORAGES:
+            raise ValueError(f"Неизвестный формат хранения: {storage}")
+        self.storage = storage
+        self.quantizer = ScalarQuantizer() if storage == 'int8' else ProductQuantizer(n_subspaces=n_subspaces)
+        self.codes = None
+
+    @property
+    def nbytes(self) -> int:
+        """Объём памяти, занимаемый кодами и параметрами квантизатора."""
+        params = self.quantizer.scales if self.storage == 'int8' else self.quantizer.codebooks
+        return self.codes.nbytes + params.nbytes
+
+    def fit(self, vectors: np.ndarray) -> 'QuantizedIndex':
+        """
+        Обучение квантизатора и кодирование L2-нормализованных векторов.
+
+        :param vectors: Матрица эмбеддингов (n, dim).
+        :return: Построенный индекс.
+        """
+        data = normalize_rows(vectors)
+        self.codes = self.quantizer.fit(data).encode(data)
+        return self
+
+    def search(self, query: np.ndarray, top_n: int = 5, rerank_vectors: Optional[np.ndarray] = None,
+               rerank_factor: int = 4) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Поиск top_n документов по приближённым оценкам.
+
+        :param query: Вектор запроса (dim,).
+        :param top_n: Количество результатов для возврата.
+        :param rerank_vectors: Нормализованные float32-векторы корпуса. Если заданы,
+            top_n * rerank_factor кандидатов переранжируются по точной близости.
+        :param rerank_factor: Во сколько раз короткий список больше top_n.
+        :return: Кортеж (номера документов, оценки).
+        """
+        query = normalize_rows(np.asarray(query).reshape(1, -1))[0]
+        approximate = self.quantizer.scores(self.codes, query)
+        if rerank_vectors is None:
+            best = top_k(approximate, top_n)
+            return best, approximate[best]
+
+        shortlist = np.sort(top_k(approximate, top_n * rerank_factor))
+        exact = np.asarray(rerank_vectors[shortlist], dtype=np.float32) @ query
+        best = top_k(exact, top_n)
+        return shortlist[best], exact[best]
@@ -0,0 +1,37 @@
+import numpy as np
+
+
+def top_k(scores: np.ndarray, k: int) -> np.ndarray:
+    """
+    Выбор индексов k документов с наибольшими оценками.
+
+    Вместо полной сортировки всего корпуса (O(N log N)) используется частичный
+    отбор через np.argpartition (O(N)), после чего сортируются только k победителей.
+    Порядок детерминирован: по убыванию оценки, при равенстве оценок — по
+    возрастанию индекса документа. Значения NaN считаются наименьшими.
+
+    :param scores: Одномерный массив оценок документов.
+    :param k: Количество возвращаемых индексов.
+    :return: Массив индексов длиной min(k, len(scores)).
+    """
+    scores = np.asarray(scores).ravel()
+    n = scores.shape[0]
+    k = min(int(k), n)
+    if k <= 0:
+        return np.empty(0, dtype=np.intp)
+
+    if np.isnan(scores).any():
+        scores = np.where(np.isnan(scores), -np.inf, scores)
+
+    if k < n:
+        # Значение k-го по величине элемента: всё, что строго больше, гарантированно
+        # попадает в ответ, а среди равных порогу берём документы с меньшими индексами
+        threshold = np.partition(scores, n - k)[n - k]
+        above = np.flatnonzero(scores > threshold)
+        ties = np.flatnonzero(scores == threshold)[:k - above.shape[0]]
+        candidates = np.concatenate([above, ties])
+    else:
+        candidates = np.arange(n)
+
+    order = np.lexsort((candidates, -scores[candidates]))
+    return candidates[order]
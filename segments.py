@@ -0,0 +1,186 @@
+import numpy as np
+from scipy import sparse
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional, Tuple
+from ranking import top_k
+
+# Векторы, которые остаются верными после слияния: модель BERT при слиянии не меняется,
+# а словарь TF-IDF и статистики BM25 пересчитываются
+STABLE_VECTORS = ('bert',)
+
+
+class DeltaDocument:
+    """
+    Документ дельта-сегмента: поля для выдачи, предобработанные тексты и векторы
+    по методам поиска, которые вычисляются при первой необходимости.
+    """
+
+    __slots__ = ('id', 'fields', 'processed_tfidf', 'processed_bert', 'vectors')
+
+    def __init__(self, fields: Dict[str, object], processed_tfidf: str, processed_bert: str,
+                 vectors: Optional[Dict[str, object]] = None) -> None:
+        """
+        :param fields: Поля документа: 'id', 'Category', 'Text', 'Link' и, возможно, другие колонки корпуса.
+        :param processed_tfidf: Текст, предобработанный для TF-IDF и BM25.
+        :param processed_bert: Текст, предобработанный для BERT.
+        :param vectors: Уже вычисленные векторы по методам.
+        """
+        self.id = int(fields['id'])
+        self.fields = fields
+        self.processed_tfidf = processed_tfidf
+        self.processed_bert = processed_bert
+        self.vectors = dict(vectors or {})
+
+    def result(self) -> Tuple[int, str, str, str]:
+        """Кортеж результата поиска (id документа, категория, текст, ссылка)."""
+        return self.id, self.fields.get('Category', ''), self.fields.get('Text', ''), self.fields.get('Link', '')
+
+    def rebased(self) -> 'DeltaDocument':
+        """Копия документа для сегмента поверх нового основного индекса: без векторов, зависящих от него."""
+        vectors = {method: vector for method, vector in self.vectors.items() if method in STABLE_VECTORS}
+        return DeltaDocument(self.fields, self.processed_tfidf, self.processed_bert, vectors)
+
+
+class DeltaSegment:
+    """
+    Неизменяемый снимок изменений поверх основного индекса: новые и обновлённые
+    документы и надгробия — id документов основного индекса, которые удалены или
+    заменены документами сегмента. Каждое изменение создаёт новый сегмент со
+    следующим номером поколения, поэтому поиск, взявший сегмент в начале, видит
+    согласованное состояние до конца.
+
+    Номера документов сегмента при поиске продолжают нумерацию основного индекса:
+    документ j сегмента имеет номер n_base + j.
+    """
+
+    def __init__(self, generation: int = 0, documents: Tuple[DeltaDocument, ...] = (),
+                 deleted_ids: FrozenSet[int] = frozenset(), deleted_positions: Optional[np.ndarray] = None) -> None:
+        """
+        :param generation: Номер поколения; входит в ключ кэша результатов.
+        :param documents: Документы сегмента.
+        :param deleted_ids: Id удалённых или заменённых документов основного индекса.
+        :param deleted_positions: Номера этих документов в основном индексе.
+        """
+        self.generation = generation
+        self.documents = tuple(documents)
+        self.deleted_ids = frozenset(deleted_ids)
+        self.deleted_positions = (np.asarray(deleted_positions, dtype=np.int64) if deleted_positions is not None
+                                  else np.empty(0, dtype=np.int64))
+        self._by_id = {doc.id: doc for doc in self.documents}
+        self._matrices: Dict[str, object] = {}
+
+    @property
+    def empty(self) -> bool:
+        """Нет ни новых документов, ни надгробий: поиск идёт только по основному индексу."""
+        return not self.documents and not self.deleted_ids
+
+    @property
+    def size(self) -> int:
+        """Количество изменений, накопленных в сегменте."""
+        return len(self.documents) + len(self.deleted_ids)
+
+    def find(self, doc_id: int) -> Optional[DeltaDocument]:
+        """
+        Документ сегмента по id.
+
+        :param doc_id: Id документа.
+        :return: Документ или None.
+        """
+        return self._by_id.get(int(doc_id))
+
+    def changed(self, remove_ids: Iterable[int] = (), add: Iterable[DeltaDocument] = (),
+                deleted_ids: Optional[FrozenSet[int]] = None,
+                deleted_positions: Optional[np.ndarray] = None) -> 'DeltaSegment':
+        """
+        Новый сегмент следующего поколения с изменениями.
+
+        :param remove_ids: Id документов, убираемых из сегмента.
+        :param add: Добавляемые документы.
+        :param deleted_ids: Новый набор надгробий; None — прежний.
+        :param deleted_positions: Номера надгробий в основном индексе (вместе с deleted_ids).
+        :return: Сегмент.
+        """
+        remove_ids = {int(doc_id) for doc_id in remove_ids}
+        documents = tuple(doc for doc in self.documents if doc.id not in remove_ids) + tuple(add)
+        if deleted_ids is None:
+            deleted_ids, deleted_positions = self.deleted_ids, self.deleted_positions
+        return DeltaSegment(self.generation + 1, documents, deleted_ids, deleted_positions)
+
+    def matrix(self, method: str) -> object:
+        """
+        Векторы всех документов сегмента одной матрицей (разреженной для TF-IDF и BM25,
+        плотной для BERT). Векторы должны быть вычислены заранее.
+
+        :param method: Метод поиска.
+        :return: Матрица (len(documents), размерность).
+        """
+        matrix = self._matrices.get(method)
+        if matrix is None:
+            vectors = [doc.vectors[method] for doc in self.documents]
+            if method == 'bert':
+                matrix = np.vstack(vectors).astype(np.float32)
+            else:
+                matrix = sparse.vstack(vectors, format='csr')
+            self._matrices[method] = matrix
+        return matrix
+
+    def rebase(self, merged: 'DeltaSegment', base_ids: np.ndarray) -> 'DeltaSegment':
+        """
+        Перенос изменений, сделанных после снимка merged, поверх нового основного
+        индекса, в который merged уже влит.
+
+        :param merged: Снимок сегмента, по которому построен новый основной индекс.
+        :param base_ids: Id документов нового основного индекса по номерам.
+        :return: Сегмент следующего поколения.
+        """
+        merged_documents = {doc.id: doc for doc in merged.documents}
+        documents = [doc.rebased() for doc in self.documents if merged_documents.get(doc.id) is not doc]
+
+        # Надгробия нужны для изменённых после снимка документов, которые есть в новом основном индексе,
+        # в том числе для документов снимка, удалённых из сегмента после него
+        touched = set(self.deleted_ids) | {doc.id for doc in self.documents} | set(merged_documents)
+        pending = [doc_id for doc_id in touched
+                   if doc_id not in merged_documents or self.find(doc_id) is not merged_documents[doc_id]]
+        positions = np.flatnonzero(np.isin(base_ids, pending))
+        deleted_ids = frozenset(int(doc_id) for doc_id in base_ids[positions])
+        return DeltaSegment(self.generation + 1, documents, deleted_ids, positions)
+
+
+def merge_rankings(base_ids: np.ndarray, base_scores: np.ndarray, segment: DeltaSegment,
+                   delta_scores: np.ndarray, n_base: int, top_n: int) -> np.ndarray:
+    """
+    Объединение результатов основного индекса и дельта-сегмента.
+
+    Документы основного индекса с надгробиями отбрасываются, поэтому base_ids должны
+    быть получены с запасом: top_n + len(segment.deleted_positions) результатов.
+
+    :param base_ids: Номера документов основного индекса в порядке убывания оценки.
+    :param base_scores: Их оценки.
+    :param segment: Дельта-сегмент.
+    :param delta_scores: Оценки всех документов сегмента.
+    :param n_base: Количество документов в основном индексе.
+    :param top_n: Количество результатов.
+    :return: Номера документов (n_base + j для документов сегмента) в порядке убывания оценки.
+    """
+    keep = ~np.isin(base_ids, segment.deleted_positions)
+    ids = np.concatenate([np.asarray(base_ids, dtype=np.int64)[keep],
+                          n_base + np.arange(len(segment.documents), dtype=np.int64)])
+    scores = np.concatenate([np.asarray(base_scores, dtype=np.float64)[keep],
+                             np.asarray(delta_scores, dtype=np.float64).ravel()])
+    # При равных оценках документы основного индекса идут раньше, как и документы с меньшими номерами
+    return ids[top_k(scores, top_n)]
+
+
+def delta_results(top_indices: Iterable[int], segment: DeltaSegment, n_base: int,
+                  gather: Callable[[List[int]], List[Tuple[int, str, str, str]]]) -> List[Tuple[int, str, str, str]]:
+    """
+    Сборка результатов поиска по номерам из основного индекса и дельта-сегмента.
+
+    :param top_indices: Номера документов.
+    :param segment: Дельта-сегмент.
+    :param n_base: Количество документов в основном индексе.
+    :param gather: Выборка полей документов основного индекса по номерам.
+    :return: Список кортежей (id документа, категория, текст, ссылка) в порядке номеров.
+    """
+    top_indices = [int(i) for i in top_indices]
+    base = iter(gather([i for i in top_indices if i < n_base]))
+    return [next(base) if i < n_base else segment.documents[i - n_base].result() for i in top_indices]
@@ -0,0 +1,92 @@
+"""
+Проверка хранилища эмбеддингов при дописывании из нескольких хранилищ
+(и процессов) в один каталог.
+
+Запуск из корня проекта:
+    python -m pytest test_embedding_store.py
+"""
+import multiprocessing
+import os
+import tempfile
+import numpy as np
+from embedding_store import EmbeddingStore
+
+DIM = 8
+
+
+def make_batch(prefix: str, count: int):
+    """Ключи и векторы, однозначно зависящие от префикса и номера."""
+    keys = [EmbeddingStore.key(f'{prefix} {i}', 'model', 512) for i in range(count)]
+    vectors = np.array([np.frombuffer(key[:DIM * 4], dtype=np.float32) for key in keys])
+    return keys, np.nan_to_num(vectors)
+
+
+def append_batches(directory: str, prefix: str, batches: int, size: int) -> None:
+    """Дописывание пачек из отдельного хранилища (выполняется в дочернем процессе)."""
+    store = EmbeddingStore(directory)
+    keys, vectors = make_batch(prefix, batches * size)
+    for start in range(0, len(keys), size):
+        store.put_many(keys[start:start + size], vectors[start:start + size])
+
+
+def check_all(directory: str, prefixes, count: int) -> None:
+    """Все ключи находятся свежим хранилищем с верными векторами."""
+    fresh = EmbeddingStore(directory)
+    for prefix in prefixes:
+        keys, vectors = make_batch(prefix, count)
+        found_vectors, found = fresh.get_many(keys)
+        assert found.all(), f"{prefix}: не найдено {int((~found).sum())} ключей"
+        assert np.array_equal(found_vectors, vectors)
+
+
+def test_two_stores_same_directory() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        first, second = EmbeddingStore(directory), EmbeddingStore(directory)
+        keys_a, vectors_a = make_batch('a', 30)
+        keys_b, vectors_b = make_batch('b', 30)
+        for start in range(0, 30, 10):
+            # Второе хранилище не видело записей первого до своего дописывания
+            first.put_many(keys_a[start:start + 10], vectors_a[start:start + 10])
+            second.put_many(keys_b[start:start + 10], vectors_b[start:start + 10])
+        # Повтор чужих ключей не дописывается
+        second.put_many(keys_a, vectors_a)
+        assert os.path.getsize(first.path) == 60 * first.record_dtype.itemsize
+        check_all(directory, ['a', 'b'], 30)
+
+
+def test_two_processes_same_directory() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        # Каталог и размерность создаются заранее, как при работающем сервере
+        EmbeddingStore(directory).put_many(*make_batch('init', 1))
+        workers = [multiprocessing.Process(target=append_batches, args=(directory, prefix, 50, 20))
+                   for prefix in ('a', 'b')]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+            assert worker.exitcode == 0
+        check_all(directory, ['init'], 1)
+        check_all(directory, ['a', 'b'], 1000)
+        store = EmbeddingStore(directory)
+        assert os.path.getsize(store.path) == 2001 * store.record_dtype.itemsize
+
+
+def test_torn_tail_of_other_store() -> None:
+    with tempfile.TemporaryDirectory() as directory:
+        first, second = EmbeddingStore(directory), EmbeddingStore(directory)
+        first.put_many(*make_batch('a', 5))
+        second.put_many(*make_batch('b', 5))
+        # Незавершённая запись после сбоя другого процесса
+        with open(first.path, 'ab') as f:
+            f.write(b'\0' * 7)
+        # Первое хранилище не видело записей второго: они не должны обрезаться
+        first.put_many(*make_batch('c', 5))
+        assert os.path.getsize(first.path) == 15 * first.record_dtype.itemsize
+        check_all(directory, ['a', 'b', 'c'], 5)
+
+
+if __name__ == '__main__':
+    test_two_stores_same_directory()
+    test_two_processes_same_directory()
+    test_torn_tail_of_other_store()
+    print("ok")
@@ -0,0 +1,59 @@
+import os
+import json
+import numpy as np
+from typing import Dict, Tuple
+from atomic_io import replacing, save_npy
+
+
+def normalize_rows(vectors: np.ndarray) -> np.ndarray:
+    """
+    L2-нормализация строк матрицы в float32.
+
+    :param vectors: Матрица векторов (n, dim).
+    :return: Нормализованная матрица float32; нулевые строки остаются нулевыми.
+    """
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    norms[norms == 0] = 1.0
+    return vectors / norms
+
+
+def metadata_path(npy_file: str) -> str:
+    """Путь к JSON-заголовку рядом с файлом .npy."""
+    return os.path.splitext(npy_file)[0] + '.json'
+
+
+def save_embedding_matrix(npy_file: str, matrix: np.ndarray, **metadata) -> None:
+    """
+    Сохранение матрицы эмбеддингов одним непрерывным файлом .npy с JSON-заголовком.
+
+    :param npy_file: Путь к файлу .npy.
+    :param matrix: Матрица эмбеддингов (n, dim).
+    :param metadata: Дополнительные поля заголовка (модель, формат и т.п.).
+    """
+    matrix = np.ascontiguousarray(matrix)
+    # Файл заменяется атомарно: прежняя матрица может быть открыта через mmap
+    save_npy(npy_file, matrix)
+    header = {'count': int(matrix.shape[0]), 'dim': int(matrix.shape[1]), 'dtype': str(matrix.dtype)}
+    header.update(metadata)
+    with replacing(metadata_path(npy_file), 'w', encoding='utf-8') as f:
+        json.dump(header, f, ensure_ascii=False, indent=2)
+
+
+def load_embedding_matrix(npy_file: str, mmap: bool = True) -> Tuple[np.ndarray, Dict]:
+    """
+    Загрузка матрицы эмбеддингов, по умолчанию через отображение файла в память:
+    страницы файла разделяются между процессами-воркерами, а не копируются в каждый.
+
+    :param npy_file: Путь к файлу .npy.
+    :param mmap: Открывать ли файл в режиме np.load(mmap_mode='r').
+    :return: Кортеж (матрица, заголовок).
+    """
+    matrix = np.load(npy_file, mmap_mode='r' if mmap else None)
+    header: Dict = {}
+    if os.path.exists(metadata_path(npy_file)):
+        with open(metadata_path(npy_file), encoding='utf-8') as f:
+            header = json.load(f)
+        if header.get('count') != matrix.shape[0] or header.get('dim') != matrix.shape[1]:
+            raise ValueError(f"Заголовок {metadata_path(npy_file)} не соответствует файлу {npy_file}")
+    return matrix, header